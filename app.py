@@ -1,7 +1,25 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import os
+import sqlite3
 from datetime import datetime
+from types import MappingProxyType
+
+from artefatos import CacheArtefatos
+from cache import CachePlanilha
+from fila_exportacao import CONCLUIDO, ERRO, EXECUTANDO, PENDENTE, FilaExportacao
+from historico import Historico, caminho_historico
+from indice import IndiceRoadmap
+from loader import ARQUIVO_PADRAO, COLUNA_UNIDADE, SQUAD_COLS
+from maturidade import NIVEIS
+from render import blocos_niveis, blocos_roadmap, cards_roadmap
+from status import Status, matriz_status
+
+# Os dados da planilha são compartilhados entre sessões; com Copy-on-Write
+# uma alteração feita por uma página copia a coluna em vez de mexer no cache
+pd.set_option('mode.copy_on_write', True)
 
 # Configuração da página
 st.set_page_config(
@@ -121,480 +139,695 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Planilha, diretório ou padrão glob (uma planilha por unidade, consolidadas)
+ORIGEM_DADOS = os.environ.get('TMMI_PLANILHAS', ARQUIVO_PADRAO)
+
 # Carregar dados
-@st.cache_data
+@st.cache_resource
+def cache_planilha():
+    """Cache de versões da planilha compartilhado por todas as sessões"""
+    try:
+        historico = Historico(caminho_historico(ORIGEM_DADOS))
+    except sqlite3.Error:
+        # Sem permissão de escrita: o dashboard funciona sem histórico
+        historico = None
+    return CachePlanilha(max_versoes=3, historico=historico)
+
 def load_data():
-    file_path = 'Framework_-_TMMi-TAG__1_.xlsx'
-    
+    """Versão atual da planilha (compartilhada por todas as sessões) ou None em caso de erro"""
     try:
-        # Visão Institucional
-        df_inst = pd.read_excel(file_path, sheet_name='TMMi - Visão Institucional', skiprows=2)
-        df_inst.columns = ['Col0', 'Nível TMMi', 'Área de Processo', 'Status Institucional', 'Observação']
-        df_inst['Nível TMMi'] = df_inst['Nível TMMi'].ffill()
-        df_inst = df_inst[df_inst['Área de Processo'].notna()].drop('Col0', axis=1)
-        
-        # Visão Squads
-        df_squads = pd.read_excel(file_path, sheet_name='TMMi - Visão Squads', skiprows=3)
-        
-        # Renomear colunas Unnamed
-        rename_map = {}
-        squad_names = ['ID', 'Trimestre', 'Fase', 'Nível e Área', 'Envolvidos', 'Status', 
-                       'Ativos', 'Demonstrações', 'Operações', 'Plataforma', 'Interop', 'Negotiation', 'Consent']
-        
-        for i, col in enumerate(df_squads.columns):
-            if i < len(squad_names):
-                rename_map[col] = squad_names[i]
-        
-        df_squads = df_squads.rename(columns=rename_map)
-        df_squads = df_squads.dropna(how='all')
-        
-        # Roadmap
-        df_roadmap = pd.read_excel(file_path, sheet_name='ANUAL - Roadmap por Squads')
-        
-        return {
-            'institucional': df_inst,
-            'squads': df_squads,
-            'roadmap': df_roadmap
-        }
+        return cache_planilha().carregar(ORIGEM_DADOS)
     except Exception as e:
         st.error(f"Erro ao carregar dados: {e}")
         return None
 
-def calcular_metricas(df):
-    total = len(df)
-    adotado = len(df[df['Status Institucional'] == 'Adotado'])
-    desenvolvendo = len(df[df['Status Institucional'] == 'Desenvolvendo'])
-    em_adocao = len(df[df['Status Institucional'] == 'Em Adoção'])
-    nao_iniciado = len(df[df['Status Institucional'] == 'Não Iniciado'])
-    
-    score = (adotado * 3 + em_adocao * 2 + desenvolvendo * 1.5) / total if total > 0 else 0
-    score_5 = score / 3 * 5
-    
-    return {
-        'total': total,
-        'adotado': adotado,
-        'desenvolvendo': desenvolvendo,
-        'em_adocao': em_adocao,
-        'nao_iniciado': nao_iniciado,
-        'score_3': score,
-        'score_5': score_5
-    }
+# CSS por código de Status; a última posição atende o código -1 (sem status)
+CSS_STATUS = np.array([
+    'background-color: #f8d7da; color: #721c24; font-weight: bold;',  # Não Iniciado
+    'background-color: #fff3cd; color: #856404; font-weight: bold;',  # Planejado
+    'background-color: #ffe5b4; color: #856404; font-weight: bold;',  # Desenvolvendo
+    'background-color: #d1ecf1; color: #0c5460; font-weight: bold;',  # Em Adoção
+    'background-color: #d4edda; color: #155724; font-weight: bold;',  # Adotado
+    ''
+])
+
+# Cores do mapa de calor, na mesma ordem dos códigos de Status
+CORES_STATUS = ['#f8d7da', '#fff3cd', '#ffe5b4', '#d1ecf1', '#d4edda']
+
+# Acima deste número de linhas a página abre no modo rápido
+LIMITE_STYLER = 300
+
+@st.cache_resource(max_entries=3)
+def obter_blocos_niveis(versao, _relatorio):
+    """HTML dos níveis (Áreas por Nível), gerado uma vez por versão"""
+    return MappingProxyType(blocos_niveis(_relatorio, NIVEIS))
+
+@st.cache_resource(max_entries=3)
+def obter_cards_roadmap(versao, _relatorio):
+    """HTML de cada entrega do roadmap, gerado uma vez por versão"""
+    return cards_roadmap(_relatorio)
+
+@st.cache_resource(max_entries=3)
+def obter_blocos_roadmap(versao, _relatorio):
+    """HTML dos trimestres do roadmap, gerado uma vez por versão"""
+    return MappingProxyType(blocos_roadmap(_relatorio, obter_cards_roadmap(versao, _relatorio)))
+
+@st.cache_resource(max_entries=3)
+def obter_indice_roadmap(versao, _relatorio):
+    """Índice de facetas do roadmap, construído uma vez por versão"""
+    return IndiceRoadmap(_relatorio.roadmap)
+
+@st.cache_resource(max_entries=3)
+def obter_codigos_squads(versao, _df_squads):
+    """Matriz de códigos de status dos squads, calculada uma vez por versão (somente leitura)"""
+    colunas = [col for col in SQUAD_COLS if col in _df_squads.columns]
+    matriz = matriz_status(_df_squads, colunas)
+    matriz.flags.writeable = False
+    return colunas, matriz
+
+# Template do Plotly por tema do Streamlit
+TEMPLATES_PLOTLY = {'dark': 'plotly_dark'}
+
+def tema_atual():
+    """Tema base configurado no Streamlit ('light', 'dark' ou vazio)"""
+    return st.get_option('theme.base') or ''
 
-def calcular_nivel_completo(df, nivel):
-    df_nivel = df[df['Nível TMMi'] == nivel]
-    if len(df_nivel) == 0:
-        return 0, 0, 0, 0, 0
+@st.cache_resource(max_entries=6)
+def obter_figura_niveis(versao, tema, _relatorio):
+    """Gráfico 'Maturidade por Nível', construído e validado uma vez por versão e tema"""
+    # CORRIGIDO: Mostrar TODOS os status
+    df_niveis = pd.DataFrame([
+        {
+            'Nível': nivel.nome.replace('Nível ', 'N'),
+            'Adotado': nivel.adotado,
+            'Em Adoção': nivel.em_adocao,
+            'Desenvolvendo': nivel.desenvolvendo,
+            'Não Iniciado': nivel.nao_iniciado
+        }
+        for nivel in _relatorio.niveis if nivel.nome in NIVEIS
+    ])
+    
+    fig = go.Figure()
+    
+    # Adotado (verde)
+    fig.add_trace(go.Bar(
+        name='Adotado',
+        x=df_niveis['Nível'],
+        y=df_niveis['Adotado'],
+        marker_color='#28a745',
+        text=df_niveis['Adotado'],
+        textposition='auto'
+    ))
+    
+    # Em Adoção (azul)
+    fig.add_trace(go.Bar(
+        name='Em Adoção',
+        x=df_niveis['Nível'],
+        y=df_niveis['Em Adoção'],
+        marker_color='#17a2b8',
+        text=df_niveis['Em Adoção'],
+        textposition='auto'
+    ))
+    
+    # Desenvolvendo (amarelo)
+    fig.add_trace(go.Bar(
+        name='Desenvolvendo',
+        x=df_niveis['Nível'],
+        y=df_niveis['Desenvolvendo'],
+        marker_color='#ffc107',
+        text=df_niveis['Desenvolvendo'],
+        textposition='auto'
+    ))
+    
+    # Não Iniciado (cinza)
+    fig.add_trace(go.Bar(
+        name='Não Iniciado',
+        x=df_niveis['Nível'],
+        y=df_niveis['Não Iniciado'],
+        marker_color='#dc3545',
+        text=df_niveis['Não Iniciado'],
+        textposition='auto'
+    ))
+    
+    fig.update_layout(
+        template=TEMPLATES_PLOTLY.get(tema, 'plotly'),
+        barmode='stack',
+        height=400,
+        showlegend=True,
+        xaxis_title="Nível TMMi",
+        yaxis_title="Número de Áreas"
+    )
+    return fig
+
+@st.cache_resource(max_entries=6)
+def obter_figura_status(versao, tema, _relatorio):
+    """Gráfico 'Distribuição de Status', construído e validado uma vez por versão e tema"""
+    score = _relatorio.score
+    
+    labels = ['Adotado', 'Em Adoção', 'Desenvolvendo', 'Não Iniciado']
+    values = [score.adotado, score.em_adocao, score.desenvolvendo, score.nao_iniciado]
+    colors = ['#28a745', '#17a2b8', '#ffc107', '#dc3545']
+    
+    fig = go.Figure(data=[go.Pie(
+        labels=labels,
+        values=values,
+        hole=.4,
+        marker_colors=colors,
+        textinfo='label+percent',
+        textfont_size=14
+    )])
     
-    total = len(df_nivel)
-    adotado = len(df_nivel[df_nivel['Status Institucional'] == 'Adotado'])
-    desenvolvendo = len(df_nivel[df_nivel['Status Institucional'] == 'Desenvolvendo'])
-    em_adocao = len(df_nivel[df_nivel['Status Institucional'] == 'Em Adoção'])
-    nao_iniciado = len(df_nivel[df_nivel['Status Institucional'] == 'Não Iniciado'])
+    fig.update_layout(template=TEMPLATES_PLOTLY.get(tema, 'plotly'), height=400)
+    return fig
+
+@st.cache_resource(max_entries=6)
+def obter_figura_evolucao(versao, tema):
+    """Evolução do score ao longo das versões registradas (None com menos de duas)"""
+    historico = cache_planilha().historico
+    if historico is None:
+        return None
+    
+    evolucao = historico.evolucao('score_5', planilha=os.path.basename(os.path.abspath(ORIGEM_DADOS)))
+    if len(evolucao) < 2:
+        return None
+    
+    fig = go.Figure(go.Scatter(
+        x=pd.to_datetime(evolucao['data_referencia']),
+        y=evolucao['valor'],
+        mode='lines+markers',
+        line=dict(color='#667eea', width=3),
+        hovertemplate='%{x|%d/%m/%Y}: %{y:.2f}<extra></extra>'
+    ))
     
-    percentual = (adotado / total * 100) if total > 0 else 0
-    return adotado, desenvolvendo, em_adocao, nao_iniciado, percentual
+    fig.update_layout(
+        template=TEMPLATES_PLOTLY.get(tema, 'plotly'),
+        yaxis=dict(title='Score (0-5)', range=[0, 5]),
+        height=300
+    )
+    return fig
 
-def estilizar_squads_df(df):
+def estilizar_squads_df(df, colunas, codigos_squads):
     """Aplica cores nas células baseado no status"""
     
-    # Colunas de squads (últimas 7)
-    squad_cols = ['Ativos', 'Demonstrações', 'Operações', 'Plataforma', 'Interop', 'Negotiation', 'Consent']
+    css = pd.DataFrame(CSS_STATUS[codigos_squads], index=df.index, columns=colunas)
     
-    def color_status(val):
-        val_str = str(val).strip().upper()
-        
-        if 'ADOTADO' in val_str or 'ADOTADA' in val_str:
-            return 'background-color: #d4edda; color: #155724; font-weight: bold;'
-        elif 'PLANEJADO' in val_str or 'PLANEJADA' in val_str:
-            return 'background-color: #fff3cd; color: #856404; font-weight: bold;'
-        elif 'DESENVOLVENDO' in val_str:
-            return 'background-color: #ffe5b4; color: #856404; font-weight: bold;'
-        elif 'ADOÇÃO' in val_str or 'EM ADOÇÃO' in val_str:
-            return 'background-color: #d1ecf1; color: #0c5460; font-weight: bold;'
-        elif 'NÃO INICIADO' in val_str or 'NAO INICIADO' in val_str:
-            return 'background-color: #f8d7da; color: #721c24; font-weight: bold;'
+    # Aplicar estilo apenas nas colunas de squads, de uma vez só
+    styled_df = df.style.apply(lambda _: css, axis=None, subset=colunas)
+    
+    return styled_df
+
+def mapa_calor_squads(df, colunas, codigos_squads):
+    """Mapa de calor dos status (modo rápido, sem Styler por célula)"""
+    
+    z = np.where(codigos_squads >= 0, codigos_squads, np.nan)
+    rotulos = np.array([status.rotulo for status in Status] + [''], dtype=object)[codigos_squads]
+    
+    n = len(CORES_STATUS)
+    colorscale = []
+    for codigo, cor in enumerate(CORES_STATUS):
+        colorscale += [[codigo / n, cor], [(codigo + 1) / n, cor]]
+    
+    eixo_y = df['ID'].astype(str).tolist() if 'ID' in df.columns else list(range(len(df)))
+    
+    fig = go.Figure(go.Heatmap(
+        z=z,
+        x=colunas,
+        y=eixo_y,
+        text=rotulos,
+        texttemplate='%{text}',
+        hovertemplate='%{y} · %{x}: %{text}<extra></extra>',
+        colorscale=colorscale,
+        zmin=-0.5,
+        zmax=n - 0.5,
+        showscale=False,
+        xgap=2,
+        ygap=2
+    ))
+    fig.update_layout(height=max(400, 28 * len(df)), yaxis_autorange='reversed')
+    
+    return fig
+
+@st.cache_resource(max_entries=6)
+def obter_mapa_calor(versao, tema, _df, _colunas, _codigos_squads):
+    """Mapa de calor dos squads, construído e validado uma vez por versão e tema"""
+    fig = mapa_calor_squads(_df, _colunas, _codigos_squads)
+    fig.update_layout(template=TEMPLATES_PLOTLY.get(tema, 'plotly'))
+    return fig
+
+# Artefato -> (rótulo do botão, extensão, MIME)
+EXPORTACOES = {
+    'pdf': ("📄 PDF", 'pdf', 'application/pdf'),
+    'ppt': ("📊 PPT", 'pptx', 'application/vnd.openxmlformats-officedocument.presentationml.presentation'),
+}
+
+# Intervalo entre consultas à fila enquanto há exportação em andamento
+INTERVALO_EXPORTACAO = 0.5
+
+@st.cache_resource
+def fila_exportacao():
+    """Fila de exportações compartilhada pelas sessões (no máximo 2 ao mesmo tempo)"""
+    return FilaExportacao(max_workers=2, cache=CacheArtefatos())
+
+def situacoes_exportacao(versao):
+    """Situação dos trabalhos pedidos nesta sessão para a versão (os de outras versões são descartados)"""
+    fila = fila_exportacao()
+    trabalhos = st.session_state.setdefault('exportacoes', {})
+    situacoes = {}
+    
+    for tipo in list(trabalhos):
+        situacao = fila.estado(trabalhos[tipo])
+        if situacao is None or situacao['versao'] != versao.chave:
+            del trabalhos[tipo]
         else:
-            return ''
+            situacoes[tipo] = situacao
+    return situacoes
+
+def mostrar_exportacoes(situacoes):
+    """Download, erro ou andamento de cada exportação; retorna True se alguma ainda não terminou"""
+    fila = fila_exportacao()
+    em_andamento = False
     
-    # Aplicar estilo apenas nas colunas de squads
-    styled_df = df.style.applymap(color_status, subset=squad_cols)
+    for tipo, situacao in situacoes.items():
+        _, extensao, mime = EXPORTACOES[tipo]
+        if situacao['estado'] == CONCLUIDO:
+            st.download_button(
+                f"⬇️ Baixar {extensao.upper()} ({situacao['segundos']:.1f}s)",
+                data=fila.resultado(situacao['id']),
+                file_name=f"Framework_TMMi_{datetime.now().strftime('%Y-%m-%d')}.{extensao}",
+                mime=mime,
+                key=f'baixar_{tipo}',
+                use_container_width=True
+            )
+        elif situacao['estado'] == ERRO:
+            st.error(f"Erro ao gerar {extensao.upper()}: {situacao['erro']}")
+        else:
+            st.caption(f"⏳ Gerando {extensao.upper()} ({situacao['estado']})...")
+            em_andamento = True
+    return em_andamento
+
+@st.fragment(run_every=INTERVALO_EXPORTACAO)
+def andamento_exportacao(versao):
+    """
+    Acompanha as exportações pendentes, consultando a fila a cada INTERVALO_EXPORTACAO
+
+    Só é desenhado enquanto há trabalho pendente, e só ele é reexecutado
+    pelo temporizador; quando tudo termina, uma única execução completa
+    troca o acompanhamento pelos botões de download.
+    """
+    if not mostrar_exportacoes(situacoes_exportacao(versao)):
+        st.rerun()
+
+@st.fragment
+def painel_exportacao(versao):
+    """
+    Botões da barra lateral: pede o arquivo à fila e oferece o download
+
+    A geração roda fora da execução do script; enquanto algum trabalho não
+    termina, a situação é consultada por andamento_exportacao.
+    """
+    fila = fila_exportacao()
+    trabalhos = st.session_state.setdefault('exportacoes', {})
     
-    return styled_df
+    for tipo, (rotulo, _, _) in EXPORTACOES.items():
+        if st.button(rotulo, key=f'botao_{tipo}', use_container_width=True):
+            trabalhos[tipo] = fila.solicitar(versao.chave, tipo, versao.relatorio)
+    
+    situacoes = situacoes_exportacao(versao)
+    if any(situacao['estado'] in (PENDENTE, EXECUTANDO) for situacao in situacoes.values()):
+        andamento_exportacao(versao)
+    else:
+        mostrar_exportacoes(situacoes)
+    
+    uso = fila.cache.estatisticas()
+    if uso['acertos'] + uso['falhas']:
+        st.caption(
+            f"💾 Cache: {uso['artefatos']} arquivo(s), {uso['taxa_acerto']:.0%} dos pedidos "
+            "atendidos sem gerar de novo"
+        )
 
-try:
-    data = load_data()
+# ================== VISÃO EXECUTIVA ==================
+@st.fragment
+def pagina_executiva(versao, relatorio):
+    """Visão Executiva: score, métricas, gráficos e destaques por nível"""
+    metricas = relatorio.score
+    # Aba institucional vazia: percentuais zerados em vez de divisão por zero
+    divisor = metricas.total or 1
+    nivel2 = relatorio.nivel('Nível 2')
+    nivel3 = relatorio.nivel('Nível 3')
     
-    if data is None:
-        st.stop()
+    st.markdown(f"""
+    <div class="hero-box">
+        <h1 style="margin: 0; font-size: 2.5rem;">🎉 TAG IMF: NÍVEL 2 DO TMMi ALCANÇADO!</h1>
+        <p style="font-size: 1.3rem; margin: 1rem 0;">
+            <strong>{nivel2.percentual:.0f}%</strong> das áreas do Nível 2 (Gerenciado) adotadas<br/>
+            Caminhando para Nível 3: <strong>{nivel3.percentual:.0f}%</strong> já iniciado
+        </p>
+        <h2 style="font-size: 2rem; margin-top: 1rem;">Score: {metricas.score_5:.1f}/5.0</h2>
+        <p style="font-size: 1.1rem;">✅ Saímos do improviso para o processo gerenciado!</p>
+    </div>
+    """, unsafe_allow_html=True)
     
-    df_inst = data['institucional']
-    df_squads = data['squads']
-    metricas = calcular_metricas(df_inst)
+    # Métricas em cards
+    col1, col2, col3, col4 = st.columns(4)
     
-    # Header
-    st.markdown('<div class="main-header">🎯  QA Accelerate - TAG IMF</div>', unsafe_allow_html=True)
-    st.markdown('<div class="subtitle"><strong>De Subjetivo para Objetivo</strong> | <strong>De Percepção para Evidência</strong></div>', unsafe_allow_html=True)
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">{metricas.total}</div>
+            <div class="metric-label">Áreas Mapeadas</div>
+        </div>
+        """, unsafe_allow_html=True)
     
-    # Sidebar
-    st.sidebar.title("📊 Navegação")
-    pagina = st.sidebar.radio(
-        "Escolha a visualização:",
-        [
-            "🏠 Visão Executiva",
-            "📋 Áreas por Nível",
-            "👥 Visão por Squads",
-            "🗓️ Roadmap 2026",
-            "💡 Por que TMMi?"
-        ]
-    )
+    with col2:
+        st.markdown(f"""
+        <div class="metric-card" style="border-color: #28a745;">
+            <div class="metric-value" style="color: #28a745;">{metricas.adotado}</div>
+            <div class="metric-label">Adotado ({metricas.adotado/divisor*100:.0f}%)</div>
+        </div>
+        """, unsafe_allow_html=True)
     
-    # ================== VISÃO EXECUTIVA ==================
-    if pagina == "🏠 Visão Executiva":
-        
-        nivel2_adotado, nivel2_desenv, nivel2_em_adocao, nivel2_nao_init, nivel2_perc = calcular_nivel_completo(df_inst, 'Nível 2')
-        nivel3_adotado, nivel3_desenv, nivel3_em_adocao, nivel3_nao_init, nivel3_perc = calcular_nivel_completo(df_inst, 'Nível 3')
-        
+    with col3:
         st.markdown(f"""
-        <div class="hero-box">
-            <h1 style="margin: 0; font-size: 2.5rem;">🎉 TAG IMF: NÍVEL 2 DO TMMi ALCANÇADO!</h1>
-            <p style="font-size: 1.3rem; margin: 1rem 0;">
-                <strong>{nivel2_perc:.0f}%</strong> das áreas do Nível 2 (Gerenciado) adotadas<br/>
-                Caminhando para Nível 3: <strong>{nivel3_perc:.0f}%</strong> já iniciado
-            </p>
-            <h2 style="font-size: 2rem; margin-top: 1rem;">Score: {metricas['score_5']:.1f}/5.0</h2>
-            <p style="font-size: 1.1rem;">✅ Saímos do improviso para o processo gerenciado!</p>
+        <div class="metric-card" style="border-color: #17a2b8;">
+            <div class="metric-value" style="color: #17a2b8;">{metricas.em_adocao}</div>
+            <div class="metric-label">Em Adoção ({metricas.em_adocao/divisor*100:.0f}%)</div>
         </div>
         """, unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(f"""
+        <div class="metric-card" style="border-color: #ffc107;">
+            <div class="metric-value" style="color: #ffc107;">{metricas.desenvolvendo}</div>
+            <div class="metric-label">Desenvolvendo ({metricas.desenvolvendo/divisor*100:.0f}%)</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Gráficos
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📊 Maturidade por Nível")
         
-        # Métricas em cards
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{metricas['total']}</div>
-                <div class="metric-label">Áreas Mapeadas</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div class="metric-card" style="border-color: #28a745;">
-                <div class="metric-value" style="color: #28a745;">{metricas['adotado']}</div>
-                <div class="metric-label">Adotado ({metricas['adotado']/metricas['total']*100:.0f}%)</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-            <div class="metric-card" style="border-color: #17a2b8;">
-                <div class="metric-value" style="color: #17a2b8;">{metricas['em_adocao']}</div>
-                <div class="metric-label">Em Adoção ({metricas['em_adocao']/metricas['total']*100:.0f}%)</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            st.markdown(f"""
-            <div class="metric-card" style="border-color: #ffc107;">
-                <div class="metric-value" style="color: #ffc107;">{metricas['desenvolvendo']}</div>
-                <div class="metric-label">Desenvolvendo ({metricas['desenvolvendo']/metricas['total']*100:.0f}%)</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # Gráficos
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("📊 Maturidade por Nível")
-            
-            # CORRIGIDO: Mostrar TODOS os status
-            niveis_data = []
-            for nivel in ['Nível 2', 'Nível 3', 'Nível 4', 'Nível 5']:
-                adot, desenv, em_adoc, nao_init, perc = calcular_nivel_completo(df_inst, nivel)
-                niveis_data.append({
-                    'Nível': nivel.replace('Nível ', 'N'),
-                    'Adotado': adot,
-                    'Em Adoção': em_adoc,
-                    'Desenvolvendo': desenv,
-                    'Não Iniciado': nao_init
-                })
-            
-            df_niveis = pd.DataFrame(niveis_data)
-            
-            fig = go.Figure()
-            
-            # Adotado (verde)
-            fig.add_trace(go.Bar(
-                name='Adotado',
-                x=df_niveis['Nível'],
-                y=df_niveis['Adotado'],
-                marker_color='#28a745',
-                text=df_niveis['Adotado'],
-                textposition='auto'
-            ))
-            
-            # Em Adoção (azul)
-            fig.add_trace(go.Bar(
-                name='Em Adoção',
-                x=df_niveis['Nível'],
-                y=df_niveis['Em Adoção'],
-                marker_color='#17a2b8',
-                text=df_niveis['Em Adoção'],
-                textposition='auto'
-            ))
-            
-            # Desenvolvendo (amarelo)
-            fig.add_trace(go.Bar(
-                name='Desenvolvendo',
-                x=df_niveis['Nível'],
-                y=df_niveis['Desenvolvendo'],
-                marker_color='#ffc107',
-                text=df_niveis['Desenvolvendo'],
-                textposition='auto'
-            ))
-            
-            # Não Iniciado (cinza)
-            fig.add_trace(go.Bar(
-                name='Não Iniciado',
-                x=df_niveis['Nível'],
-                y=df_niveis['Não Iniciado'],
-                marker_color='#dc3545',
-                text=df_niveis['Não Iniciado'],
-                textposition='auto'
-            ))
-            
-            fig.update_layout(
-                barmode='stack',
-                height=400,
-                showlegend=True,
-                xaxis_title="Nível TMMi",
-                yaxis_title="Número de Áreas"
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.subheader("🎯 Distribuição de Status")
-            
-            labels = ['Adotado', 'Em Adoção', 'Desenvolvendo', 'Não Iniciado']
-            values = [metricas['adotado'], metricas['em_adocao'], metricas['desenvolvendo'], metricas['nao_iniciado']]
-            colors = ['#28a745', '#17a2b8', '#ffc107', '#dc3545']
-            
-            fig = go.Figure(data=[go.Pie(
-                labels=labels,
-                values=values,
-                hole=.4,
-                marker_colors=colors,
-                textinfo='label+percent',
-                textfont_size=14
-            )])
-            
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # Destaques por nível
-        st.markdown("---")
-        st.subheader("📈 Destaques por Nível")
-        
-        col1, col2 = st.columns(2)
+        fig = obter_figura_niveis(versao, tema_atual(), relatorio)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("🎯 Distribuição de Status")
         
-        with col1:
-            nivel2_total = nivel2_adotado + nivel2_desenv + nivel2_em_adocao + nivel2_nao_init
-            st.markdown(f"""
-            ### ✅ Nível 2 - Gerenciado
-            **{nivel2_adotado}/{nivel2_total} áreas adotadas ({nivel2_perc:.0f}%)**
-            
-            **Áreas Adotadas:**
-            """)
-            
-            nivel2_areas = df_inst[df_inst['Nível TMMi'] == 'Nível 2']
-            for idx, row in nivel2_areas.iterrows():
-                if row['Status Institucional'] == 'Adotado':
-                    st.markdown(f"- ✅ {row['Área de Processo']}")
-            
-            st.markdown("**Falta apenas:**")
-            for idx, row in nivel2_areas.iterrows():
-                if row['Status Institucional'] != 'Adotado':
-                    st.markdown(f"- 🔄 {row['Área de Processo']} ({row['Status Institucional']})")
+        fig = obter_figura_status(versao, tema_atual(), relatorio)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    fig = obter_figura_evolucao(versao, tema_atual())
+    if fig is not None:
+        st.subheader("📈 Evolução do Score")
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Destaques por nível
+    st.markdown("---")
+    st.subheader("📈 Destaques por Nível")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown(f"""
+        ### ✅ Nível 2 - Gerenciado
+        **{nivel2.adotado}/{nivel2.total} áreas adotadas ({nivel2.percentual:.0f}%)**
         
-        with col2:
-            nivel3_total = nivel3_adotado + nivel3_desenv + nivel3_em_adocao + nivel3_nao_init
-            st.markdown(f"""
-            ### 🔄 Nível 3 - Definido
-            **{nivel3_adotado}/{nivel3_total} áreas adotadas ({nivel3_perc:.0f}%)**
-            
-            **Em Progresso:**
-            """)
-            
-            nivel3_areas = df_inst[df_inst['Nível TMMi'] == 'Nível 3']
-            for idx, row in nivel3_areas.iterrows():
-                status = row['Status Institucional']
-                emoji = "✅" if status == "Adotado" else \
-                        "📊" if status == "Em Adoção" else \
-                        "🔄" if status == "Desenvolvendo" else "⏸️"
-                st.markdown(f"- {emoji} {row['Área de Processo']} ({status})")
-    
-    # ================== ÁREAS POR NÍVEL ==================
-    elif pagina == "📋 Áreas por Nível":
-        st.header("📋 Áreas de Processo por Nível TMMi")
+        **Áreas Adotadas:**
+        """)
         
-        for nivel in ['Nível 2', 'Nível 3', 'Nível 4', 'Nível 5']:
-            df_nivel = df_inst[df_inst['Nível TMMi'] == nivel]
-            
-            if len(df_nivel) > 0:
-                adot, desenv, em_adoc, nao_init, perc = calcular_nivel_completo(df_inst, nivel)
-                total = adot + desenv + em_adoc + nao_init
-                
-                st.markdown(f"""
-                <div class="nivel-header">
-                    {nivel} - {adot}/{total} adotadas ({perc:.0f}%)
-                </div>
-                """, unsafe_allow_html=True)
-                
-                for idx, row in df_nivel.iterrows():
-                    area = row['Área de Processo']
-                    status = row['Status Institucional']
-                    obs = row['Observação'] if pd.notna(row['Observação']) else 'N/A'
-                    
-                    status_class = "status-adotado" if status == "Adotado" else \
-                                   "status-desenvolvendo" if status == "Desenvolvendo" else \
-                                   "status-em-adocao" if status == "Em Adoção" else \
-                                   "status-nao-iniciado"
-                    
-                    emoji = "✅" if status == "Adotado" else \
-                            "🔄" if status == "Desenvolvendo" else \
-                            "📊" if status == "Em Adoção" else "⏸️"
-                    
-                    st.markdown(f"""
-                    <div class="area-box">
-                        <strong>{emoji} {area}</strong>
-                        <span class="{status_class}" style="float: right;">{status}</span>
-                        <br/>
-                        <small style="color: #666; margin-top: 0.5rem; display: block;">{obs}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-    
-    # ================== VISÃO POR SQUADS ==================
-    elif pagina == "👥 Visão por Squads":
-        st.header("👥 Status das Melhorias por Squad")
-        st.markdown("**Acompanhamento detalhado das iniciativas por equipe**")
+        nivel2_areas = relatorio.areas_do_nivel('Nível 2')
+        for area in nivel2_areas:
+            if area.status == 'Adotado':
+                st.markdown(f"- ✅ {area.rotulo}")
         
-        squad_cols = ['Ativos', 'Demonstrações', 'Operações', 'Plataforma', 'Interop', 'Negotiation', 'Consent']
+        st.markdown("**Falta apenas:**")
+        for area in nivel2_areas:
+            if area.status != 'Adotado':
+                st.markdown(f"- 🔄 {area.rotulo} ({area.status})")
+    
+    with col2:
+        st.markdown(f"""
+        ### 🔄 Nível 3 - Definido
+        **{nivel3.adotado}/{nivel3.total} áreas adotadas ({nivel3.percentual:.0f}%)**
         
-        st.info(f"📊 **Squads mapeados:** {', '.join(squad_cols)}")
+        **Em Progresso:**
+        """)
         
+        for area in relatorio.areas_do_nivel('Nível 3'):
+            status = area.status
+            emoji = "✅" if status == "Adotado" else \
+                    "📊" if status == "Em Adoção" else \
+                    "🔄" if status == "Desenvolvendo" else "⏸️"
+            st.markdown(f"- {emoji} {area.rotulo} ({status})")
+
+# ================== ÁREAS POR NÍVEL ==================
+@st.fragment
+def pagina_areas(versao, relatorio):
+    """Áreas por Nível: um bloco HTML por nível"""
+    st.header("📋 Áreas de Processo por Nível TMMi")
+    
+    # Um elemento por nível, com cabeçalho e todos os cards
+    for bloco in obter_blocos_niveis(versao, relatorio).values():
+        st.markdown(bloco, unsafe_allow_html=True)
+
+# ================== VISÃO POR SQUADS ==================
+@st.fragment
+def pagina_squads(versao, df_squads):
+    """Visão por Squads: tabela colorida ou mapa de calor dos status"""
+    st.header("👥 Status das Melhorias por Squad")
+    st.markdown("**Acompanhamento detalhado das iniciativas por equipe**")
+    
+    st.info(f"📊 **Squads mapeados:** {', '.join(SQUAD_COLS)}")
+    
+    colunas, codigos_squads = obter_codigos_squads(versao, df_squads)
+    
+    modo_rapido = st.toggle(
+        "⚡ Modo rápido (mapa de calor)",
+        value=len(df_squads) > LIMITE_STYLER,
+        help="Desenha um mapa de calor dos status em vez da tabela colorida célula a célula"
+    )
+    
+    if modo_rapido:
+        fig = obter_mapa_calor(versao, tema_atual(), df_squads, colunas, codigos_squads)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
         # Aplicar cores
-        styled_df = estilizar_squads_df(df_squads)
+        styled_df = estilizar_squads_df(df_squads, colunas, codigos_squads)
         
         st.dataframe(styled_df, use_container_width=True, height=600)
-        
+    
+    st.markdown("""
+    **Legenda:**
+    - 🟢 **Verde**: Adotado
+    - 🔵 **Azul**: Em Adoção
+    - 🟡 **Amarelo**: Planejado
+    - 🟠 **Laranja**: Desenvolvendo
+    - 🔴 **Vermelho**: Não Iniciado
+    """)
+
+# ================== ROADMAP ==================
+@st.fragment
+def pagina_roadmap(versao, relatorio):
+    """Roadmap 2026: filtros por faceta sobre os cards já renderizados"""
+    st.header("🗓️ Roadmap Estratégico 2026")
+    st.markdown("**Planejamento transparente de evolução**")
+    
+    indice = obter_indice_roadmap(versao, relatorio)
+    cards = obter_cards_roadmap(versao, relatorio)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        trimestres_sel = st.multiselect("Trimestre:", indice.valores('trimestre'), placeholder="Todos")
+    with col2:
+        squads_sel = st.multiselect("Squad:", indice.valores('squad'), placeholder="Todos")
+    with col3:
+        niveis_sel = st.multiselect("Nível:", indice.valores('nivel'), placeholder="Todos")
+    with col4:
+        status_sel = st.multiselect("Status:", indice.valores('status'), placeholder="Todos")
+    
+    if trimestres_sel or squads_sel or niveis_sel or status_sel:
+        # Interseção dos bitmaps do índice; os cards já estão renderizados
+        posicoes = indice.filtrar(
+            trimestre=trimestres_sel,
+            squad=squads_sel,
+            nivel=niveis_sel,
+            status=status_sel
+        )
+        st.caption(f"{len(posicoes)} entrega(s) encontrada(s)")
+        st.markdown(''.join(cards[pos] for pos in posicoes), unsafe_allow_html=True)
+    else:
+        # Um elemento por trimestre, com todos os cards já renderizados
+        for bloco in obter_blocos_roadmap(versao, relatorio).values():
+            st.markdown(bloco, unsafe_allow_html=True)
+
+# ================== POR QUE TMMi? ==================
+def pagina_por_que():
+    """Por que TMMi?: conteúdo estático, não depende da planilha"""
+    st.header("💡 Por que estruturar o Framework TMMi na TAG?")
+    
+    st.markdown("""
+    <div class="hero-box">
+        <h2 style="margin-top: 0;">🎯 O Problema que Resolvemos</h2>
+        <p style="font-size: 1.3rem;">
+        <strong>ANTES:</strong> Qualidade era percepção.<br/>
+        <strong>AGORA:</strong> Qualidade é evidência.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
         st.markdown("""
-        **Legenda:**
-        - 🟢 **Verde**: Adotado
-        - 🔵 **Azul**: Em Adoção
-        - 🟡 **Amarelo**: Planejado
-        - 🟠 **Laranja**: Desenvolvendo
-        - 🔴 **Vermelho**: Não Iniciado
+        ### ❌ ANTES (Sem Framework)
+        
+        - Visão subjetiva, varia por squad
+        - Avaliação baseada em percepção
+        - Sem critério claro de priorização
+        - Automação pontual, sem direção
+        - Reativo: "apaga incêndio"
         """)
     
-    # ================== ROADMAP ==================
-    elif pagina == "🗓️ Roadmap 2026":
-        st.header("🗓️ Roadmap Estratégico 2026")
-        st.markdown("**Planejamento transparente de evolução**")
-        
-        df_roadmap = data['roadmap']
-        
-        if 'Trimestre' in df_roadmap.columns:
-            trimestres = ['Todos'] + sorted(df_roadmap['Trimestre'].dropna().unique().tolist())
-            trimestre_sel = st.selectbox("Filtrar por Trimestre:", trimestres)
-            
-            if trimestre_sel != 'Todos':
-                df_filtrado = df_roadmap[df_roadmap['Trimestre'] == trimestre_sel]
-            else:
-                df_filtrado = df_roadmap
-        else:
-            df_filtrado = df_roadmap
-        
-        for idx, row in df_filtrado.iterrows():
-            if pd.isna(row.get('ID Melhoria')):
-                continue
-                
-            id_melhoria = row.get('ID Melhoria', 'N/A')
-            entrega = row.get('Entrega', 'N/A')
-            tmmi_area = row.get('TMMi (Nível – Área)', 'N/A')
-            status = row.get('Status Geral', 'Planejado')
-            responsavel = row.get('Responsável', 'N/A')
-            
-            status_class = "status-adotado" if 'Adotado' in str(status) else \
-                          "status-desenvolvendo" if 'Desenvolvendo' in str(status) else \
-                          "status-em-adocao" if 'Adoção' in str(status) else \
-                          "status-nao-iniciado"
-            
-            st.markdown(f"""
-            <div class="area-box">
-                <strong>{id_melhoria}</strong>: {entrega}
-                <span class="{status_class}" style="float: right;">{status}</span>
-                <br/>
-                <small style="color: #666;"><strong>TMMi:</strong> {tmmi_area}</small><br/>
-                <small style="color: #666;"><strong>Responsável:</strong> {responsavel}</small>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    # ================== POR QUE TMMi? ==================
-    elif pagina == "💡 Por que TMMi?":
-        st.header("💡 Por que estruturar o Framework TMMi na TAG?")
-        
+    with col2:
         st.markdown("""
-        <div class="hero-box">
-            <h2 style="margin-top: 0;">🎯 O Problema que Resolvemos</h2>
-            <p style="font-size: 1.3rem;">
-            <strong>ANTES:</strong> Qualidade era percepção.<br/>
-            <strong>AGORA:</strong> Qualidade é evidência.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("""
-            ### ❌ ANTES (Sem Framework)
-            
-            - Visão subjetiva, varia por squad
-            - Avaliação baseada em percepção
-            - Sem critério claro de priorização
-            - Automação pontual, sem direção
-            - Reativo: "apaga incêndio"
-            """)
-        
-        with col2:
-            st.markdown("""
-            ### ✅ AGORA (Com Framework)
-            
-            - Linguagem comum, níveis objetivos
-            - Score numérico baseado em evidências
-            - Roadmap transparente, foco em impacto
-            - Automação direcionada por risco
-            - Prevenção estruturada
-            """)
+        ### ✅ AGORA (Com Framework)
         
-        st.markdown("---")
+        - Linguagem comum, níveis objetivos
+        - Score numérico baseado em evidências
+        - Roadmap transparente, foco em impacto
+        - Automação direcionada por risco
+        - Prevenção estruturada
+        """)
+    
+    st.markdown("---")
+    
+    st.markdown("""
+    ### 📊 Ganhos Diretos para a TAG
+    
+    - ✅ **Menos ruído:** QA, Dev, Produto e Gestão falam a mesma língua
+    - ✅ **Avaliação justa:** Baseada em evidências, não em percepção
+    - ✅ **Foco certo:** Priorização clara do que evolui primeiro
+    - ✅ **Crescimento sustentável:** Práticas escaláveis
+    - ✅ **Menos dependência:** Processo sustenta qualidade
+    - ✅ **Automação inteligente:** ROI mensurável
+    - ✅ **Menos incidentes:** Prevenção ao invés de reação
+    - ✅ **Decisão baseada em dados:** Indicadores comparáveis
+    - ✅ **Clareza para liderança:** Evolução em níveis claros
+    - ✅ **Alinhamento estratégico:** Qualidade = crescimento
+    """)
+
+# Páginas da navegação: função e o que cada uma precisa da planilha
+# ('relatorio' = modelo do relatório, 'squads' = DataFrame da Visão Squads)
+PAGINAS = {
+    "🏠 Visão Executiva": (pagina_executiva, ('relatorio',)),
+    "📋 Áreas por Nível": (pagina_areas, ('relatorio',)),
+    "👥 Visão por Squads": (pagina_squads, ('squads',)),
+    "🗓️ Roadmap 2026": (pagina_roadmap, ('relatorio',)),
+    "💡 Por que TMMi?": (pagina_por_que, ()),
+}
+
+def argumentos_pagina(versao, necessidades):
+    """
+    Monta só o que a página declarou precisar
+
+    Args:
+        versao: VersaoPlanilha atual (None se a carga falhou)
+        necessidades: Itens declarados em PAGINAS
+
+    Returns:
+        dict: Argumentos da função da página
+    """
+    if not necessidades:
+        return {}
+    
+    if versao is None:
+        st.stop()
+    
+    # Relatório e visões dos dados em cache (sem cópia), compartilhados por todas as sessões
+    argumentos = {'versao': versao.chave}
+    if 'relatorio' in necessidades:
+        argumentos['relatorio'] = versao.relatorio
+    if 'squads' in necessidades:
+        argumentos['df_squads'] = versao.visoes()['squads']
+    return argumentos
+
+# Nome das abas comparadas no painel de mudanças
+NOMES_ABAS = {
+    'institucional': 'Visão Institucional',
+    'squads': 'Visão Squads',
+    'roadmap': 'Roadmap',
+}
+
+# Linhas listadas por aba no painel de mudanças
+LIMITE_MUDANCAS = 10
+
+def painel_mudancas(mudancas):
+    """O que mudou na planilha desde a carga anterior"""
+    if mudancas is None:
+        st.caption("Primeira carga da planilha neste servidor.")
+        return
+    
+    alteradas = {aba: mudanca for aba, mudanca in mudancas.items() if mudanca is None or not mudanca.vazia}
+    if not alteradas:
+        st.caption("Nenhuma linha mudou desde a carga anterior.")
+        return
+    
+    for aba, mudanca in alteradas.items():
+        st.markdown(f"**{NOMES_ABAS[aba]}**")
+        if mudanca is None:
+            st.caption("Estrutura da aba mudou; recalculada por completo.")
+            continue
+        
+        st.caption(
+            f"{len(mudanca.incluidas)} incluída(s) | {len(mudanca.removidas)} removida(s) | "
+            f"{len(mudanca.alteradas)} alterada(s)"
+        )
+        linhas = [f"- ➕ {chave}" for chave in mudanca.incluidas]
+        linhas += [f"- ➖ {chave}" for chave in mudanca.removidas]
+        linhas += [f"- ✏️ {chave} ({', '.join(colunas)})" for chave, colunas in mudanca.alteradas]
+        st.markdown('\n'.join(linhas[:LIMITE_MUDANCAS]))
+        if len(linhas) > LIMITE_MUDANCAS:
+            st.caption(f"... e mais {len(linhas) - LIMITE_MUDANCAS}")
+
+try:
+    # Header
+    st.markdown('<div class="main-header">🎯  QA Accelerate - TAG IMF</div>', unsafe_allow_html=True)
+    st.markdown('<div class="subtitle"><strong>De Subjetivo para Objetivo</strong> | <strong>De Percepção para Evidência</strong></div>', unsafe_allow_html=True)
+    
+    # Sidebar
+    st.sidebar.title("📊 Navegação")
+    pagina = st.sidebar.radio(
+        "Escolha a visualização:",
+        list(PAGINAS)
+    )
+    
+    with st.sidebar.expander("⚙️ Cache de dados"):
+        stats = cache_planilha().estatisticas()
+        st.caption(
+            f"Hits: {stats['hits']} | Misses: {stats['misses']} | "
+            f"Abas recarregadas: {stats['abas_recarregadas']} | Versões: {stats['versoes']}"
+        )
+    
+    # A versão em cache alimenta a barra lateral (exportação e mudanças) em
+    # todas as páginas; só a página escolhida é renderizada, e widgets dentro
+    # dela (fragmento) reexecutam apenas a própria página
+    versao = load_data()
+    funcao, necessidades = PAGINAS[pagina]
+    funcao(**argumentos_pagina(versao, necessidades))
+    
+    if versao is not None:
+        df_inst = versao.dados['institucional']
+        if COLUNA_UNIDADE in df_inst.columns:
+            st.sidebar.caption(f"🏢 Unidades consolidadas: {', '.join(df_inst[COLUNA_UNIDADE].cat.categories)}")
         
-        st.markdown("""
-        ### 📊 Ganhos Diretos para a TAG
+        with st.sidebar.expander("📤 Exportar relatórios"):
+            painel_exportacao(versao)
         
-        - ✅ **Menos ruído:** QA, Dev, Produto e Gestão falam a mesma língua
-        - ✅ **Avaliação justa:** Baseada em evidências, não em percepção
-        - ✅ **Foco certo:** Priorização clara do que evolui primeiro
-        - ✅ **Crescimento sustentável:** Práticas escaláveis
-        - ✅ **Menos dependência:** Processo sustenta qualidade
-        - ✅ **Automação inteligente:** ROI mensurável
-        - ✅ **Menos incidentes:** Prevenção ao invés de reação
-        - ✅ **Decisão baseada em dados:** Indicadores comparáveis
-        - ✅ **Clareza para liderança:** Evolução em níveis claros
-        - ✅ **Alinhamento estratégico:** Qualidade = crescimento
-        """)
+        with st.sidebar.expander("🆕 O que mudou"):
+            painel_mudancas(versao.mudancas)
     
     # Footer
     st.markdown("---")
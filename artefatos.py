@@ -0,0 +1,209 @@
+"""
+Cache em disco dos relatórios exportados do Framework TMMi
+Guarda cada PDF/PowerPoint gerado sob uma chave derivada do conteúdo do
+relatório, do tipo de artefato e da versão do modelo de layout, para que
+pedidos iguais devolvam o arquivo pronto em vez de refazer o documento
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from datetime import date
+
+from estilos import TEMA_PADRAO
+from snapshot import DIRETORIO_CACHE
+
+
+DIRETORIO_ARTEFATOS = os.path.join(DIRETORIO_CACHE, 'exportacoes')
+
+# Espaço máximo em disco ocupado pelos artefatos (em bytes)
+MAX_BYTES = 200 * 1024 * 1024
+
+
+def hash_relatorio(relatorio):
+    """
+    Hash SHA-256 do conteúdo de um Relatorio
+
+    O modelo é imutável e só contém textos, números e tuplas, então sua
+    representação textual é estável e identifica o conteúdo.
+
+    Args:
+        relatorio: Relatorio a identificar
+
+    Returns:
+        str: Hash em hexadecimal
+    """
+    return hashlib.sha256(repr(relatorio).encode()).hexdigest()
+
+
+def chave_artefato(relatorio, tipo, versao_modelo, escopo=None, dia=None, tema=TEMA_PADRAO):
+    """
+    Chave de um artefato exportado
+
+    Inclui o escopo e o dia, que aparecem no subtítulo do documento: o mesmo
+    relatório exportado em outro dia gera um artefato novo.
+
+    Args:
+        relatorio: Relatorio exportado
+        tipo: 'pdf' ou 'ppt'
+        versao_modelo: Versão do layout dos relatórios (exporter.VERSAO_MODELO)
+        escopo: Recorte exibido no subtítulo (opcional)
+        dia: Data do documento (padrão: hoje)
+        tema: Tema das cores do documento (ver estilos.TEMAS)
+
+    Returns:
+        str: Chave em hexadecimal
+    """
+    dia = dia or date.today()
+    partes = (hash_relatorio(relatorio), tipo, str(versao_modelo), escopo or '', dia.isoformat(), tema)
+    return hashlib.sha256('\n'.join(partes).encode()).hexdigest()
+
+
+class CacheArtefatos:
+    """
+    Artefatos exportados em disco, com descarte LRU por tamanho
+
+    O uso de um artefato atualiza a data de modificação do arquivo, que serve
+    de ordem de uso: ao passar de max_bytes, os menos usados recentemente são
+    removidos. Vários processos podem compartilhar o mesmo diretório.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_ARTEFATOS, max_bytes=MAX_BYTES):
+        """
+        Inicializa o cache
+
+        Args:
+            diretorio: Diretório dos artefatos (criado na primeira gravação)
+            max_bytes: Espaço máximo ocupado pelos artefatos
+        """
+        self.diretorio = diretorio
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._contagem = dict.fromkeys(('acertos', 'falhas', 'gravacoes', 'descartes'), 0)
+
+    def __reduce__(self):
+        # Processos de trabalho recebem o mesmo diretório, com estatísticas próprias
+        return CacheArtefatos, (self.diretorio, self.max_bytes)
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave)
+
+    def _contar(self, evento, quantidade=1):
+        with self._lock:
+            self._contagem[evento] += quantidade
+
+    def obter(self, chave):
+        """
+        Conteúdo de um artefato guardado
+
+        Args:
+            chave: Chave do artefato (ver chave_artefato)
+
+        Returns:
+            bytes | None: Conteúdo, ou None se o artefato não estiver no cache
+        """
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'rb') as f:
+                conteudo = f.read()
+            os.utime(caminho)
+        except OSError:
+            self._contar('falhas')
+            return None
+
+        self._contar('acertos')
+        return conteudo
+
+    def guardar(self, chave, conteudo):
+        """
+        Guarda um artefato e descarta os menos usados se passar do limite
+
+        A gravação é feita em um arquivo temporário renomeado ao final, para que
+        leitores concorrentes nunca vejam um artefato pela metade. Falhas de
+        escrita (ex.: disco somente leitura) são ignoradas.
+
+        Args:
+            chave: Chave do artefato (ver chave_artefato)
+            conteudo: Bytes do artefato
+        """
+        if len(conteudo) > self.max_bytes:
+            return
+
+        temporario = None
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            descritor, temporario = tempfile.mkstemp(dir=self.diretorio, prefix=f'.{chave}.', suffix='.tmp')
+            with os.fdopen(descritor, 'wb') as f:
+                f.write(conteudo)
+            os.replace(temporario, self._caminho(chave))
+        except OSError:
+            if temporario is not None and os.path.exists(temporario):
+                os.remove(temporario)
+            return
+
+        self._contar('gravacoes')
+        self._descartar()
+
+    def _artefatos(self):
+        """(data de uso, tamanho, caminho) de cada artefato guardado"""
+        artefatos = []
+        try:
+            entradas = list(os.scandir(self.diretorio))
+        except OSError:
+            return artefatos
+
+        for entrada in entradas:
+            if entrada.name.startswith('.'):
+                continue
+            try:
+                info = entrada.stat()
+            except OSError:
+                continue
+            artefatos.append((info.st_mtime, info.st_size, entrada.path))
+        return artefatos
+
+    def _descartar(self):
+        """Remove os artefatos menos usados até caber em max_bytes"""
+        artefatos = sorted(self._artefatos())
+        total = sum(tamanho for _, tamanho, _ in artefatos)
+
+        descartados = 0
+        for _, tamanho, caminho in artefatos:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(caminho)
+            except OSError:
+                continue
+            total -= tamanho
+            descartados += 1
+
+        if descartados:
+            self._contar('descartes', descartados)
+
+    def limpar(self):
+        """Remove todos os artefatos guardados"""
+        for _, _, caminho in self._artefatos():
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+
+    def estatisticas(self):
+        """
+        Uso do cache desde a criação deste objeto
+
+        Returns:
+            dict: acertos, falhas, gravacoes, descartes, taxa_acerto (0 a 1),
+                artefatos e bytes ocupados em disco
+        """
+        with self._lock:
+            contagem = dict(self._contagem)
+
+        artefatos = self._artefatos()
+        consultas = contagem['acertos'] + contagem['falhas']
+        contagem['taxa_acerto'] = contagem['acertos'] / consultas if consultas else 0.0
+        contagem['artefatos'] = len(artefatos)
+        contagem['bytes'] = sum(tamanho for _, tamanho, _ in artefatos)
+        return contagem
@@ -0,0 +1,110 @@
+"""
+Benchmark da exportação do Framework TMMi
+Mede o custo de preparar um exportador (estilos e tabelas) e o de gerar
+cada artefato, para acompanhar o efeito das otimizações em lotes grandes
+
+Uso:
+    python benchmark_exportacao.py
+    python benchmark_exportacao.py unidades/ --repeticoes 200
+    python benchmark_exportacao.py --escala 10 40 160 --repeticoes 3
+"""
+
+import argparse
+import dataclasses
+import statistics
+import sys
+import time
+
+from reportlab.platypus import TableStyle
+
+import estilos
+from exporter import TMMiExporter
+from exportar_lote import _carregar
+from loader import ARQUIVO_PADRAO
+from relatorio import montar_relatorio
+
+
+def medir(funcao, repeticoes):
+    """
+    Executa a função várias vezes
+
+    Args:
+        funcao: Função sem argumentos
+        repeticoes: Quantidade de execuções
+
+    Returns:
+        dict: 'media' e 'mediana' em milissegundos
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return {'media': statistics.fmean(tempos), 'mediana': statistics.median(tempos)}
+
+
+def _preparo_sem_registro():
+    """Preparo feito a cada exportador antes do registro de estilos (referência)"""
+    cores = estilos.TEMAS[estilos.TEMA_PADRAO]
+    estilos.estilos_paragrafo.__wrapped__()
+    TableStyle(estilos._comandos_tabela(cores, fundo_corpo=True))
+    TableStyle(estilos._comandos_tabela(cores, fundo_corpo=False))
+
+
+def ampliar(relatorio, fator):
+    """Relatório com as áreas e o roadmap repetidos fator vezes (tabelas longas)"""
+    return dataclasses.replace(relatorio, areas=relatorio.areas * fator, roadmap=relatorio.roadmap * fator)
+
+
+def executar(origem, repeticoes, escalas=()):
+    """
+    Roda os cenários do benchmark
+
+    Args:
+        origem: Planilha, diretório ou padrão glob
+        repeticoes: Execuções por cenário
+        escalas: Fatores de ampliação das tabelas para medir o PDF e o
+            PowerPoint com muitas linhas (ex.: (10, 40, 160))
+
+    Returns:
+        dict: Cenário -> {'media', 'mediana'} em milissegundos
+    """
+    relatorio = montar_relatorio(_carregar(origem))
+    exporter = TMMiExporter({}, relatorio=relatorio)
+
+    resultados = {
+        'preparo (sem registro)': medir(_preparo_sem_registro, repeticoes),
+        'preparo (TMMiExporter)': medir(lambda: TMMiExporter({}, relatorio=relatorio), repeticoes),
+        'pdf': medir(exporter.export_to_pdf_bytes, repeticoes),
+        'ppt': medir(exporter.export_to_powerpoint_bytes, repeticoes),
+    }
+
+    for fator in escalas:
+        ampliado = TMMiExporter({}, relatorio=ampliar(relatorio, fator))
+        linhas = len(ampliado.relatorio.roadmap)
+        resultados[f'pdf ({linhas} entregas)'] = medir(ampliado.export_to_pdf_bytes, repeticoes)
+        resultados[f'ppt ({len(ampliado.relatorio.areas)} áreas)'] = medir(
+            ampliado.export_to_powerpoint_bytes, repeticoes
+        )
+
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark da exportação TMMi')
+    parser.add_argument('origem', nargs='?', default=ARQUIVO_PADRAO,
+                        help='Planilha, diretório ou padrão glob (uma planilha por unidade)')
+    parser.add_argument('--repeticoes', type=int, default=50, help='Execuções por cenário')
+    parser.add_argument('--escala', nargs='*', type=int, default=[],
+                        help='Fatores de ampliação das tabelas do PDF e do PPT (ex.: 10 40 160)')
+    args = parser.parse_args(argv)
+
+    print(f"⏱️  {args.repeticoes} execução(ões) por cenário, dados de {args.origem}")
+    for cenario, tempos in executar(args.origem, args.repeticoes, args.escala).items():
+        print(f"   {cenario:<26} média {tempos['media']:8.3f} ms   mediana {tempos['mediana']:8.3f} ms")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Cache em memória das versões carregadas da planilha do Framework TMMi
+Detecta troca do arquivo por mtime e hash do conteúdo e recarrega apenas
+as abas que mudaram
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+import snapshot
+from diferencas import comparar_dados
+from loader import (
+    ABAS, assinaturas_abas, eh_consolidado, hash_consolidado, listar_planilhas,
+    load_workbook_data, load_workbooks_data,
+)
+from relatorio import atualizar_relatorio, montar_relatorio
+
+
+logger = logging.getLogger(__name__)
+
+
+class VersaoPlanilha:
+    """
+    Uma versão carregada da planilha (identificada pelo hash do conteúdo)
+
+    Os DataFrames são compartilhados por todas as sessões do processo e não
+    devem ser alterados: o dicionário é somente leitura e quem consome os
+    dados recebe visões (ver visoes).
+    """
+
+    def __init__(self, file_path, digest, assinaturas, dados, anterior=None):
+        self.file_path = file_path
+        self.digest = digest
+        self.assinaturas = assinaturas
+        self.dados = MappingProxyType(dict(dados))
+        # Linhas que mudaram desde a carga anterior do mesmo arquivo (None na primeira)
+        self.mudancas = comparar_dados(anterior.dados, self.dados) if anterior is not None else None
+        # Montado já na carga: a versão não guarda referência à anterior,
+        # que pode sair do cache sem ficar presa a esta
+        self.relatorio = self._montar_relatorio(anterior)
+
+    @property
+    def chave(self):
+        """Identificador curto da versão, usado para memoizar cálculos derivados"""
+        return self.digest[:16]
+
+    def _montar_relatorio(self, anterior):
+        """
+        Relatorio da versão
+
+        Com uma carga anterior, só as partes afetadas pelas mudanças são
+        recalculadas (ver relatorio.atualizar_relatorio); se a montagem
+        incremental falhar, o erro é registrado no log e o relatório é montado
+        por completo.
+        """
+        if anterior is not None:
+            try:
+                return atualizar_relatorio(anterior.relatorio, self.dados, self.mudancas)
+            except Exception:
+                # A montagem completa é a referência: um erro no caminho
+                # incremental não pode derrubar a carga da planilha
+                logger.exception('Falha na montagem incremental do relatório de %s; montando por completo', self.file_path)
+        return montar_relatorio(self.dados)
+
+    def visoes(self):
+        """
+        Visões rasas dos DataFrames, sem copiar os dados
+
+        Cada visão compartilha os buffers com a versão em cache. Com o
+        Copy-on-Write do pandas ativo (mode.copy_on_write), uma alteração na
+        visão copia apenas a coluna afetada e nunca chega aos dados
+        compartilhados.
+
+        Returns:
+            MappingProxyType: Chave da aba -> DataFrame (somente leitura)
+        """
+        return MappingProxyType({chave: df.copy(deep=False) for chave, df in self.dados.items()})
+
+
+class CachePlanilha:
+    """
+    Cache limitado de versões da planilha
+
+    A cada carga compara mtime e tamanho do arquivo com a última leitura;
+    se mudaram, calcula o hash do conteúdo. Um hash novo recarrega só as abas
+    cujo XML mudou, reaproveitando as demais da versão anterior.
+    """
+
+    def __init__(self, max_versoes=3, historico=None):
+        """
+        Inicializa o cache
+
+        Args:
+            max_versoes: Quantidade de versões mantidas em memória
+            historico: Historico onde cada nova versão é registrada (opcional)
+        """
+        self.max_versoes = max_versoes
+        self.historico = historico
+        self._versoes = OrderedDict()
+        self._ultima_leitura = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'abas_recarregadas': 0}
+
+    def carregar(self, file_path):
+        """
+        Retorna a versão atual da planilha, recarregando o que for necessário
+
+        Um diretório ou padrão glob gera uma versão consolidada das planilhas
+        (coluna 'Unidade'), identificada pelo conjunto dos arquivos; cada
+        planilha mantém seu snapshot, então só as novas ou alteradas são lidas.
+
+        Args:
+            file_path: Caminho da planilha .xlsx, diretório ou padrão glob
+
+        Returns:
+            VersaoPlanilha: Versão correspondente ao conteúdo atual do(s) arquivo(s)
+        """
+        file_path = os.path.abspath(file_path)
+        consolidado = eh_consolidado(file_path)
+
+        with self._lock:
+            arquivos = listar_planilhas(file_path)
+            marca = tuple(
+                (arquivo, stat.st_mtime_ns, stat.st_size)
+                for arquivo, stat in ((arquivo, os.stat(arquivo)) for arquivo in arquivos)
+            )
+
+            ultima = self._ultima_leitura.get(file_path)
+            if ultima and ultima[0] == marca and ultima[1] in self._versoes:
+                return self._hit(ultima[1])
+
+            digest = hash_consolidado(arquivos) if consolidado else snapshot.hash_arquivo(file_path)
+            self._ultima_leitura[file_path] = (marca, digest)
+
+            if digest in self._versoes:
+                return self._hit(digest)
+
+            self._stats['misses'] += 1
+            anterior = self._versao_anterior(file_path)
+            if consolidado:
+                dados = load_workbooks_data(file_path)
+                versao = VersaoPlanilha(file_path, digest, {}, dados, anterior)
+            else:
+                versao = self._carregar_versao(file_path, digest, anterior)
+            self._registrar(versao)
+
+            self._versoes[digest] = versao
+            while len(self._versoes) > self.max_versoes:
+                self._versoes.popitem(last=False)
+
+            return versao
+
+    def estatisticas(self):
+        """
+        Contadores do cache
+
+        Returns:
+            dict: hits, misses, abas recarregadas e versões em memória
+        """
+        with self._lock:
+            return dict(self._stats, versoes=len(self._versoes))
+
+    def _hit(self, digest):
+        self._stats['hits'] += 1
+        self._versoes.move_to_end(digest)
+        return self._versoes[digest]
+
+    def _versao_anterior(self, file_path):
+        """Versão mais recente em memória do mesmo arquivo"""
+        for versao in reversed(self._versoes.values()):
+            if versao.file_path == file_path:
+                return versao
+        return None
+
+    def _registrar(self, versao):
+        """Grava a versão no histórico; falhas no banco não impedem a carga"""
+        if self.historico is None:
+            return
+        try:
+            self.historico.registrar(versao.file_path, versao.digest, versao.dados, versao.relatorio)
+        except sqlite3.Error:
+            pass
+
+    def _carregar_versao(self, file_path, digest, anterior):
+        assinaturas = assinaturas_abas(file_path)
+
+        dados = snapshot.ler_snapshot(file_path, digest, ABAS)
+        if dados is not None:
+            return VersaoPlanilha(file_path, digest, assinaturas, dados, anterior)
+
+        if anterior is None:
+            alteradas = set(ABAS)
+        else:
+            alteradas = {
+                chave for chave in ABAS
+                if assinaturas[chave] != anterior.assinaturas.get(chave)
+            }
+
+        lidas = load_workbook_data(file_path, chaves=alteradas, usar_snapshot=False)
+        dados = {
+            chave: lidas[chave] if chave in alteradas else anterior.dados[chave]
+            for chave in ABAS
+        }
+        self._stats['abas_recarregadas'] += sum(1 for chave in alteradas if assinaturas[chave])
+
+        snapshot.salvar_snapshot(file_path, digest, dados)
+        return VersaoPlanilha(file_path, digest, assinaturas, dados, anterior)
@@ -0,0 +1,138 @@
+"""
+Diferenças entre duas cargas da planilha do Framework TMMi
+Compara as abas linha a linha por chaves estáveis e indica as linhas
+incluídas, removidas e alteradas, para recalcular só o que foi afetado
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import pandas as pd
+
+from loader import COLUNA_UNIDADE
+
+
+# Aba -> coluna que identifica a linha
+CHAVES_ABAS = {
+    'institucional': 'Área de Processo',
+    'squads': 'ID',
+    'roadmap': 'ID Melhoria',
+}
+
+
+@dataclass(frozen=True, slots=True)
+class MudancasAba:
+    """Linhas de uma aba que mudaram entre duas cargas"""
+    incluidas: tuple
+    removidas: tuple
+    alteradas: tuple
+
+    @property
+    def vazia(self):
+        """True se a aba não mudou"""
+        return not (self.incluidas or self.removidas or self.alteradas)
+
+    def chaves(self):
+        """Todas as chaves afetadas (incluídas, removidas e alteradas)"""
+        return self.incluidas + self.removidas + tuple(chave for chave, _ in self.alteradas)
+
+    def colunas(self):
+        """Colunas alteradas em alguma linha existente nas duas cargas"""
+        return {coluna for _, colunas in self.alteradas for coluna in colunas}
+
+
+SEM_MUDANCAS = MudancasAba((), (), ())
+
+
+def chaves_linhas(df, coluna_chave):
+    """
+    Chave estável de cada linha da aba, na ordem das linhas
+
+    Linhas sem chave são identificadas pela posição ('#<linha>'); chaves
+    repetidas são numeradas a partir da segunda ocorrência ('chave #2'), para
+    que uma linha duplicada apareça como incluída. Em dados consolidados a
+    chave é prefixada pela unidade ('Unidade · chave').
+
+    Args:
+        df: DataFrame da aba
+        coluna_chave: Coluna que identifica as linhas (ex.: 'ID Melhoria')
+
+    Returns:
+        pd.Series: Chaves em texto, no índice do DataFrame
+    """
+    chaves = df[coluna_chave].astype(object)
+    sem_chave = chaves.isna().to_numpy()
+    chaves = chaves.astype(str).str.strip()
+    chaves[sem_chave] = [f'#{posicao}' for posicao in range(len(df)) if sem_chave[posicao]]
+    if COLUNA_UNIDADE in df.columns:
+        chaves = df[COLUNA_UNIDADE].astype(str) + ' · ' + chaves
+
+    ocorrencia = chaves.groupby(chaves, sort=False).cumcount().to_numpy()
+    repetidas = ocorrencia > 0
+    chaves[repetidas] = chaves[repetidas] + [f' #{n + 1}' for n in ocorrencia[repetidas]]
+    return chaves
+
+
+def _indexar(df, coluna_chave):
+    """Indexa a aba pelas chaves das linhas, com valores comparáveis (object, vazio = None)"""
+    indexado = df.astype(object).set_index(pd.Index(chaves_linhas(df, coluna_chave), name=coluna_chave))
+    return indexado.where(indexado.notna(), None)
+
+
+def comparar_aba(antes, depois, coluna_chave):
+    """
+    Compara duas versões de uma aba pela coluna chave
+
+    Args:
+        antes: DataFrame da carga anterior
+        depois: DataFrame da carga atual
+        coluna_chave: Coluna que identifica as linhas (ex.: 'ID Melhoria')
+
+    Returns:
+        MudancasAba | None: Linhas incluídas, removidas e alteradas (com as
+            colunas alteradas), ou None se a chave não existir em alguma das
+            versões (a aba deve ser tratada como toda alterada)
+    """
+    if antes is depois or (antes.empty and depois.empty):
+        return SEM_MUDANCAS
+    if coluna_chave not in antes.columns or coluna_chave not in depois.columns:
+        return None
+
+    a = _indexar(antes, coluna_chave)
+    b = _indexar(depois, coluna_chave)
+
+    incluidas = tuple(b.index[~b.index.isin(a.index)])
+    removidas = tuple(a.index[~a.index.isin(b.index)])
+
+    comuns = b.index[b.index.isin(a.index)]
+    colunas = a.columns.union(b.columns, sort=False)
+    x = a.loc[comuns].reindex(columns=colunas)
+    y = b.loc[comuns].reindex(columns=colunas)
+
+    diferentes = ((x != y) & ~(x.isna() & y.isna())).to_numpy()
+    alteradas = tuple(
+        (chave, tuple(colunas[linha]))
+        for chave, linha in zip(comuns, diferentes) if linha.any()
+    )
+
+    return MudancasAba(incluidas, removidas, alteradas)
+
+
+def comparar_dados(antes, depois):
+    """
+    Compara as abas com chave de duas cargas da planilha
+
+    Abas que são o mesmo objeto nas duas cargas (reaproveitadas pelo cache)
+    não são percorridas.
+
+    Args:
+        antes: Dicionário de DataFrames da carga anterior (formato do loader)
+        depois: Dicionário de DataFrames da carga atual
+
+    Returns:
+        MappingProxyType: Aba -> MudancasAba (None quando não comparável)
+    """
+    return MappingProxyType({
+        aba: comparar_aba(antes.get(aba, pd.DataFrame()), depois.get(aba, pd.DataFrame()), coluna)
+        for aba, coluna in CHAVES_ABAS.items()
+    })
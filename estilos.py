@@ -0,0 +1,125 @@
+"""
+Estilos compartilhados dos relatórios do Framework TMMi
+Monta uma única vez por processo (e por tema) a folha de estilos de
+parágrafo e os estilos das tabelas do PDF, reaproveitados por todos os
+exportadores em vez de recriados a cada TMMiExporter
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import TableStyle
+
+
+@dataclass(frozen=True, slots=True)
+class Tema:
+    """Cores dos relatórios exportados (hexadecimal '#rrggbb')"""
+    primaria: str
+    titulo_secao: str
+    corpo_tabela: str
+    zebra: str
+
+
+TEMAS = MappingProxyType({
+    'padrao': Tema(
+        primaria='#1f77b4',
+        titulo_secao='#333333',
+        corpo_tabela='#f5f5dc',
+        zebra='#d3d3d3',
+    ),
+})
+
+TEMA_PADRAO = 'padrao'
+
+
+@lru_cache(maxsize=None)
+def estilos_paragrafo(tema=TEMA_PADRAO):
+    """
+    Folha de estilos de parágrafo do PDF, com CustomTitle, CustomHeading e CustomBody
+
+    Os estilos são compartilhados por todos os exportadores do processo e
+    não devem ser alterados.
+
+    Args:
+        tema: Nome do tema (ver TEMAS)
+
+    Returns:
+        MappingProxyType: Nome do estilo -> ParagraphStyle
+    """
+    cores = TEMAS[tema]
+    folha = getSampleStyleSheet()
+
+    # Título principal
+    folha.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=folha['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor(cores.primaria),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+
+    # Subtítulo
+    folha.add(ParagraphStyle(
+        name='CustomHeading',
+        parent=folha['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor(cores.titulo_secao),
+        spaceAfter=12,
+        spaceBefore=12,
+        fontName='Helvetica-Bold'
+    ))
+
+    # Texto normal
+    folha.add(ParagraphStyle(
+        name='CustomBody',
+        parent=folha['Normal'],
+        fontSize=10,
+        spaceAfter=6,
+        fontName='Helvetica'
+    ))
+
+    return MappingProxyType(dict(folha.byName))
+
+
+def _comandos_tabela(cores, fundo_corpo):
+    """Comandos comuns das tabelas: cabeçalho destacado, grade e linhas zebradas"""
+    comandos = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(cores.primaria)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ]
+    if fundo_corpo:
+        comandos.append(('BACKGROUND', (0, 1), (-1, -1), colors.HexColor(cores.corpo_tabela)))
+    comandos += [
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor(cores.zebra)]),
+    ]
+    return comandos
+
+
+@lru_cache(maxsize=None)
+def estilos_tabela(tema=TEMA_PADRAO):
+    """
+    Estilos das tabelas do PDF, compilados uma vez por tema
+
+    Args:
+        tema: Nome do tema (ver TEMAS)
+
+    Returns:
+        MappingProxyType: 'institucional' e 'roadmap' -> TableStyle
+    """
+    cores = TEMAS[tema]
+    return MappingProxyType({
+        'institucional': TableStyle(_comandos_tabela(cores, fundo_corpo=True)),
+        'roadmap': TableStyle(_comandos_tabela(cores, fundo_corpo=False)),
+    })
@@ -8,28 +8,23 @@ Exemplos práticos de como usar o exportador para gerar relatórios
 # ============================================================================
 
 from exporter import export_framework
-import pandas as pd
+from loader import load_workbook_data
 
 def exemplo_basico():
     """Exemplo mais simples - exporta tudo"""
     
-    # Carregar dados da planilha
+    # Carregar dados da planilha (todas as abas, abrindo o arquivo uma vez)
     file_path = 'Framework_-_TMMi-TAG.xlsx'
     
-    data = {
-        'institucional': pd.read_excel(file_path, 'TMMi - Visão Institucional', header=2),
-        'squads': pd.read_excel(file_path, 'TMMi - Visão Squads', header=2),
-        'roadmap': pd.read_excel(file_path, 'Roadmap Trimestral', header=1),
-        'score': pd.read_excel(file_path, 'Score TMMi', header=2),
-        'mapa': pd.read_excel(file_path, 'Mapa do TMMi', header=2),
-        'criterios': pd.read_excel(file_path, 'Critérios TMMi', header=0)
-    }
+    data = load_workbook_data(file_path)
     
-    # Exportar PDF e PowerPoint
+    # Exportar PDF e PowerPoint (cada um em um processo, ao mesmo tempo)
     results = export_framework(data, export_pdf=True, export_ppt=True)
     
-    print(f"✅ PDF gerado: {results['pdf']}")
-    print(f"✅ PowerPoint gerado: {results['ppt']}")
+    tempos = results['tempos']
+    print(f"✅ PDF gerado: {results['pdf']} ({tempos['pdf']:.1f}s)")
+    print(f"✅ PowerPoint gerado: {results['ppt']} ({tempos['ppt']:.1f}s)")
+    print(f"⏱️ Tempo total: {tempos['total']:.1f}s")
 
 
 # ============================================================================
@@ -40,18 +35,12 @@ def exemplo_so_pdf():
     """Gera apenas relatório PDF"""
     
     from exporter import TMMiExporter
-    import pandas as pd
+    from loader import load_workbook_data
     
     file_path = 'Framework_-_TMMi-TAG.xlsx'
     
-    data = {
-        'institucional': pd.read_excel(file_path, 'TMMi - Visão Institucional', header=2),
-        'roadmap': pd.read_excel(file_path, 'Roadmap Trimestral', header=1),
-        'mapa': pd.read_excel(file_path, 'Mapa do TMMi', header=2),
-        'squads': pd.DataFrame(),  # Pode deixar vazio se não precisar
-        'score': pd.DataFrame(),
-        'criterios': pd.DataFrame()
-    }
+    # Abas não listadas voltam como DataFrames vazios
+    data = load_workbook_data(file_path, chaves=['institucional', 'roadmap', 'mapa'])
     
     exporter = TMMiExporter(data)
     pdf_path = exporter.export_to_pdf('relatorio_mensal.pdf')
@@ -67,18 +56,11 @@ def exemplo_so_ppt():
     """Gera apenas apresentação PowerPoint"""
     
     from exporter import TMMiExporter
-    import pandas as pd
+    from loader import load_workbook_data
     
     file_path = 'Framework_-_TMMi-TAG.xlsx'
     
-    data = {
-        'institucional': pd.read_excel(file_path, 'TMMi - Visão Institucional', header=2),
-        'roadmap': pd.read_excel(file_path, 'Roadmap Trimestral', header=1),
-        'squads': pd.DataFrame(),
-        'score': pd.DataFrame(),
-        'mapa': pd.DataFrame(),
-        'criterios': pd.DataFrame()
-    }
+    data = load_workbook_data(file_path, chaves=['institucional', 'roadmap'])
     
     exporter = TMMiExporter(data)
     ppt_path = exporter.export_to_powerpoint('apresentacao_executiva.pptx')
@@ -94,20 +76,13 @@ def exemplo_nomes_customizados():
     """Exporta com nomes de arquivo personalizados"""
     
     from exporter import TMMiExporter
-    import pandas as pd
+    from loader import load_workbook_data
     from datetime import datetime
     
     file_path = 'Framework_-_TMMi-TAG.xlsx'
     
     # Carregar dados
-    data = {
-        'institucional': pd.read_excel(file_path, 'TMMi - Visão Institucional', header=2),
-        'roadmap': pd.read_excel(file_path, 'Roadmap Trimestral', header=1),
-        'mapa': pd.read_excel(file_path, 'Mapa do TMMi', header=2),
-        'squads': pd.DataFrame(),
-        'score': pd.DataFrame(),
-        'criterios': pd.DataFrame()
-    }
+    data = load_workbook_data(file_path, chaves=['institucional', 'roadmap', 'mapa'])
     
     # Gerar nomes com data
     hoje = datetime.now().strftime('%Y-%m-%d')
@@ -130,10 +105,13 @@ def gerar_relatorio_semanal():
     """
     Script para gerar relatórios semanais automaticamente
     Pode ser agendado com cron (Linux/Mac) ou Task Scheduler (Windows)
+    
+    Para um relatório por squad, unidade ou trimestre, use o exportar_lote.py:
+        python exportar_lote.py --por geral squad --sufixo 2026-W04 --saida relatorios_semanais
     """
     
     from exporter import export_framework
-    import pandas as pd
+    from loader import load_workbook_data
     from datetime import datetime
     import os
     
@@ -152,14 +130,7 @@ def gerar_relatorio_semanal():
     
     try:
         # Carregar dados
-        data = {
-            'institucional': pd.read_excel(file_path, 'TMMi - Visão Institucional', header=2),
-            'squads': pd.read_excel(file_path, 'TMMi - Visão Squads', header=2),
-            'roadmap': pd.read_excel(file_path, 'Roadmap Trimestral', header=1),
-            'score': pd.read_excel(file_path, 'Score TMMi', header=2),
-            'mapa': pd.read_excel(file_path, 'Mapa do TMMi', header=2),
-            'criterios': pd.read_excel(file_path, 'Critérios TMMi', header=0)
-        }
+        data = load_workbook_data(file_path)
         
         # Exportar com nomes da semana
         from exporter import TMMiExporter
@@ -281,33 +252,57 @@ WINDOWS - Task Scheduler:
 # EXEMPLO 8: Comparar relatórios de diferentes períodos
 # ============================================================================
 
-def comparar_periodos():
+def comparar_periodos(data_anterior=None, data_atual=None):
     """
-    Compara métricas entre dois períodos
+    Compara métricas entre dois períodos usando o histórico de versões
+    
+    Cada versão nova da planilha carregada pelo dashboard (ou registrada
+    abaixo) fica gravada no histórico; a comparação não reabre planilhas antigas.
+    
+    Args:
+        data_anterior: Data do período anterior (ex.: '2026-01-31'); None = penúltima versão
+        data_atual: Data do período atual; None = versão mais recente
     """
     
-    import pandas as pd
+    from historico import Historico, caminho_historico
+    from snapshot import hash_arquivo
+    import os
+    
+    file_path = 'Framework_-_TMMi-TAG.xlsx'
+    planilha = os.path.basename(file_path)
+    
+    # Registrar a versão atual da planilha (ignorado se já estiver no histórico)
+    historico = Historico(caminho_historico(file_path))
+    historico.registrar(file_path, hash_arquivo(file_path), load_workbook_data(file_path))
+    
+    versoes = historico.versoes(planilha)['id'].tolist()
+    versao_a = historico.versao_em(data_anterior, planilha) if data_anterior else \
+        (versoes[-2] if len(versoes) > 1 else None)
+    versao_b = historico.versao_em(data_atual, planilha) if data_atual else versoes[-1]
+    
+    if versao_a is None or versao_b is None:
+        print("⚠️ O histórico ainda não tem versões suficientes para comparar")
+        return
     
-    # Carregar relatório atual
-    data_atual = {
-        'institucional': pd.read_excel('Framework_-_TMMi-TAG.xlsx', 'TMMi - Visão Institucional', header=2),
-    }
+    diferencas = historico.comparar(versao_a, versao_b)
     
-    # Carregar relatório anterior (você precisa ter salvo antes)
-    # data_anterior = {
-    #     'institucional': pd.read_excel('Framework_-_TMMi-TAG_JAN.xlsx', 'TMMi - Visão Institucional', header=2),
-    # }
+    print("📊 Métricas gerais (antes → depois):")
+    metricas = diferencas['metricas']
+    for _, linha in metricas[metricas['escopo'] == 'Geral'].iterrows():
+        print(f"   {linha['metrica']}: {linha['antes']:.2f} → {linha['depois']:.2f} ({linha['variacao']:+.2f})")
     
-    # Comparar
-    df_atual = data_atual['institucional']
-    # df_anterior = data_anterior['institucional']
+    print("\n🔄 Áreas com status alterado:")
+    for _, linha in diferencas['areas'].iterrows():
+        area = f"{linha['unidade']} · {linha['area']}" if linha['unidade'] else linha['area']
+        print(f"   {area}: {linha['antes'] or '-'} → {linha['depois'] or '-'}")
     
-    print("📊 Métricas Atuais:")
-    print(f"Total de áreas: {len(df_atual)}")
-    print(f"Adotado: {len(df_atual[df_atual['Status Institucional'] == 'Adotado'])}")
-    print(f"Desenvolvendo: {len(df_atual[df_atual['Status Institucional'] == 'Desenvolvendo'])}")
+    print(f"\n👥 Mudanças nos squads: {len(diferencas['squads'])}")
+    print(f"🗓️ Mudanças no roadmap: {len(diferencas['roadmap'])}")
     
-    # Para comparação completa, você precisaria ter salvado versões anteriores
+    # Série para gráficos de evolução
+    print("\n📈 Evolução do score (0-5):")
+    for _, linha in historico.evolucao('score_5', planilha=planilha).iterrows():
+        print(f"   {linha['data_referencia'][:10]}: {linha['valor']:.2f}")
 
 
 # ============================================================================
@@ -325,9 +320,10 @@ if __name__ == '__main__':
     print("3. Exportar apenas PowerPoint")
     print("4. Exportar com nomes personalizados")
     print("5. Gerar relatório semanal (automático)")
+    print("6. Comparar períodos (histórico)")
     print()
     
-    escolha = input("Digite o número do exemplo (1-5): ").strip()
+    escolha = input("Digite o número do exemplo (1-6): ").strip()
     
     if escolha == '1':
         exemplo_basico()
@@ -339,5 +335,7 @@ if __name__ == '__main__':
         exemplo_nomes_customizados()
     elif escolha == '5':
         gerar_relatorio_semanal()
+    elif escolha == '6':
+        comparar_periodos()
     else:
         print("❌ Opção inválida!")
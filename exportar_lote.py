@@ -0,0 +1,213 @@
+"""
+Exportação em lote do Framework TMMi
+Carrega os dados uma única vez e gera PDF e PowerPoint por squad, por
+unidade e por trimestre em um conjunto limitado de processos
+
+Uso:
+    python exportar_lote.py unidades/ --por squad unidade --saida relatorios
+    python exportar_lote.py Framework_-_TMMi-TAG.xlsx --por squad --formatos pdf
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from artefatos import CacheArtefatos
+from exporter import METODOS_EXPORTACAO, TMMiExporter
+from loader import (
+    ARQUIVO_PADRAO, COLUNA_UNIDADE, SQUAD_COLS, eh_consolidado, load_workbook_data,
+    load_workbooks_data,
+)
+from relatorio import montar_relatorio, relatorio_do_squad, relatorio_do_trimestre
+
+
+DIMENSOES = ('geral', 'squad', 'unidade', 'trimestre')
+
+EXTENSOES = {
+    'pdf': '.pdf',
+    'ppt': '.pptx',
+}
+
+
+def _slug(texto):
+    """Texto seguro para nome de arquivo (sem acentos e espaços)"""
+    decomposto = unicodedata.normalize('NFKD', str(texto))
+    sem_acento = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return '_'.join(sem_acento.split()).replace('/', '-')
+
+
+def _carregar(origem):
+    """Dados da origem (planilha única ou consolidada) carregados uma vez"""
+    if eh_consolidado(origem):
+        return load_workbooks_data(origem)
+    return load_workbook_data(origem)
+
+
+def recortes(data, dimensoes):
+    """
+    Relatórios a exportar, um por recorte pedido
+
+    Args:
+        data: Dicionário com os dataframes carregados (formato do loader)
+        dimensoes: Dimensões do lote (ver DIMENSOES)
+
+    Returns:
+        list: Tuplas (dimensão, valor, escopo exibido, Relatorio)
+    """
+    geral = montar_relatorio(data)
+    lista = []
+
+    if 'geral' in dimensoes:
+        lista.append(('geral', 'organizacao', None, geral))
+
+    if 'squad' in dimensoes:
+        for squad in SQUAD_COLS:
+            lista.append(('squad', squad, f'Squad {squad}', relatorio_do_squad(geral, squad)))
+
+    if 'unidade' in dimensoes:
+        df_inst = data['institucional']
+        if COLUNA_UNIDADE in df_inst.columns:
+            for unidade in df_inst[COLUNA_UNIDADE].cat.categories:
+                # Sem a coluna 'Unidade': o relatório da unidade é como o de uma planilha única
+                dados_unidade = {
+                    chave: df[df[COLUNA_UNIDADE] == unidade].drop(columns=COLUNA_UNIDADE)
+                    if COLUNA_UNIDADE in df.columns else df
+                    for chave, df in data.items()
+                }
+                lista.append(('unidade', unidade, f'Unidade {unidade}', montar_relatorio(dados_unidade)))
+
+    if 'trimestre' in dimensoes:
+        trimestres = sorted({item.trimestre for item in geral.roadmap if item.trimestre})
+        for trimestre in trimestres:
+            lista.append(('trimestre', trimestre, trimestre, relatorio_do_trimestre(geral, trimestre)))
+
+    return lista
+
+
+def _executar_trabalho(tipo, entrada, escopo, destino, cache):
+    """
+    Gera um artefato e o move para o destino só quando estiver completo
+
+    Args:
+        tipo: 'pdf' ou 'ppt'
+        entrada: Relatorio serializado com pickle
+        escopo: Recorte exibido no subtítulo
+        destino: Caminho final do arquivo
+        cache: CacheArtefatos (ou None)
+
+    Returns:
+        float: Segundos gastos
+    """
+    inicio = time.perf_counter()
+    pasta, nome = os.path.split(destino)
+    descritor, temporario = tempfile.mkstemp(dir=pasta, prefix=f'.{nome}.', suffix='.tmp')
+    os.close(descritor)
+
+    try:
+        exporter = TMMiExporter({}, relatorio=pickle.loads(entrada), escopo=escopo, cache=cache)
+        getattr(exporter, METODOS_EXPORTACAO[tipo])(temporario)
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+    return time.perf_counter() - inicio
+
+
+def exportar_lote(origem, saida, dimensoes=('squad',), formatos=('pdf', 'ppt'), processos=None, sufixo=None,
+                  cache=None):
+    """
+    Exporta um relatório por recorte e formato
+
+    Args:
+        origem: Planilha, diretório ou padrão glob (uma planilha por unidade)
+        saida: Diretório dos arquivos gerados
+        dimensoes: Dimensões do lote (ver DIMENSOES)
+        formatos: 'pdf' e/ou 'ppt'
+        processos: Limite de processos (padrão: número de CPUs)
+        sufixo: Sufixo dos nomes de arquivo (padrão: data de hoje, AAAA-MM-DD)
+        cache: CacheArtefatos; recortes já exportados hoje são apenas copiados
+
+    Returns:
+        dict: 'arquivos' (destino -> segundos), 'erros' (destino -> mensagem),
+            'carga' e 'total' em segundos
+    """
+    inicio = time.perf_counter()
+    sufixo = sufixo or datetime.now().strftime('%Y-%m-%d')
+    os.makedirs(saida, exist_ok=True)
+
+    data = _carregar(origem)
+    lista = recortes(data, dimensoes)
+    carga = time.perf_counter() - inicio
+
+    trabalhos = []
+    for dimensao, valor, escopo, relatorio in lista:
+        # Cada relatório é serializado uma vez e compartilhado pelos seus formatos
+        entrada = pickle.dumps(relatorio)
+        for tipo in formatos:
+            nome = f'TMMi_{dimensao}_{_slug(valor)}_{sufixo}{EXTENSOES[tipo]}'
+            trabalhos.append((tipo, entrada, escopo, os.path.join(saida, nome), cache))
+
+    arquivos = {}
+    erros = {}
+    processos = min(len(trabalhos), processos or os.cpu_count() or 1) if trabalhos else 1
+
+    # spawn: o fork de um processo com threads (servidor do Streamlit) pode travar
+    with ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context('spawn')) as pool:
+        futuros = {pool.submit(_executar_trabalho, *trabalho): trabalho[3] for trabalho in trabalhos}
+        for futuro in as_completed(futuros):
+            destino = futuros[futuro]
+            try:
+                arquivos[destino] = futuro.result()
+            except Exception as e:
+                erros[destino] = str(e)
+
+    return {
+        'arquivos': arquivos,
+        'erros': erros,
+        'carga': carga,
+        'total': time.perf_counter() - inicio,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Exporta relatórios TMMi por squad, unidade e trimestre')
+    parser.add_argument('origem', nargs='?', default=ARQUIVO_PADRAO,
+                        help='Planilha, diretório ou padrão glob (uma planilha por unidade)')
+    parser.add_argument('--saida', default='relatorios', help='Diretório dos arquivos gerados')
+    parser.add_argument('--por', nargs='+', choices=DIMENSOES, default=['squad'],
+                        help="Recortes a exportar (padrão: squad; 'unidade' requer diretório ou glob)")
+    parser.add_argument('--formatos', nargs='+', choices=sorted(EXTENSOES), default=['pdf', 'ppt'])
+    parser.add_argument('--processos', type=int, default=None, help='Limite de processos (padrão: CPUs)')
+    parser.add_argument('--sufixo', default=None, help='Sufixo dos nomes (padrão: data de hoje)')
+    parser.add_argument('--sem-cache', action='store_true', help='Gera tudo de novo, sem o cache de artefatos')
+    args = parser.parse_args(argv)
+
+    cache = None if args.sem_cache else CacheArtefatos()
+    resultado = exportar_lote(
+        args.origem, args.saida, args.por, args.formatos, args.processos, args.sufixo, cache
+    )
+
+    print(f"📂 Dados de {args.origem} carregados em {resultado['carga']:.2f}s")
+    for destino, segundos in sorted(resultado['arquivos'].items()):
+        print(f"   ✅ {segundos:6.2f}s  {destino}")
+    for destino, erro in sorted(resultado['erros'].items()):
+        print(f"   ❌ {destino}: {erro}")
+
+    gerados = len(resultado['arquivos'])
+    total = resultado['total']
+    print(f"📊 {gerados} relatório(s) em {total:.2f}s ({gerados / total:.1f} relatórios/s)")
+
+    return 1 if resultado['erros'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,446 +4,712 @@ Gera relatórios em PDF e apresentações em PowerPoint
 """
 
 import pandas as pd
-from datetime import datetime
+from datetime import date
 from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.platypus import SimpleDocTemplate, LongTable, Paragraph, Spacer, PageBreak
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
 import io
+import os
+import re
+from functools import lru_cache
+from itertools import islice
+from xml.sax.saxutils import escape
+import multiprocessing
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from artefatos import chave_artefato
+from estilos import TEMA_PADRAO, estilos_paragrafo, estilos_tabela
+from loader import eh_consolidado, load_workbook_data, load_workbooks_data
+from relatorio import com_unidade, montar_relatorio
+from status import Status, normalizar_status
+
+
+# Incrementar quando o layout do PDF ou do PowerPoint mudar, invalidando
+# os artefatos guardados em cache
+VERSAO_MODELO = 4
+
+# Linhas por tabela do PDF: tabelas longas viram blocos independentes, cada
+# um quebrado entre páginas com o cabeçalho repetido (par, para manter a
+# alternância de cores das linhas entre blocos)
+LINHAS_POR_BLOCO = 200
+
+
+def _truncar(serie, limite=None, reticencias=False):
+    """
+    Textos de uma coluna prontos para a tabela do PDF (vazio = '')
+    
+    Args:
+        serie: pd.Series com os valores da coluna
+        limite: Quantidade máxima de caracteres (None = sem corte)
+        reticencias: Se True, textos cortados terminam em '...'
+    
+    Returns:
+        list: Textos da coluna
+    """
+    textos = serie.fillna('').astype(str)
+    if limite is not None:
+        cortados = textos.str.slice(0, limite)
+        if reticencias:
+            cortados = cortados.where(textos.str.len() <= limite, cortados + '...')
+        textos = cortados
+    return textos.tolist()
+
+
+def _tabela_em_blocos(cabecalho, colunas, larguras, estilo, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Tabela do PDF em blocos de até linhas_por_bloco linhas
+    
+    Cada bloco é uma LongTable com o cabeçalho repetido a cada página; o
+    layout de cada bloco não depende do tamanho da tabela inteira, então o
+    tempo cresce de forma linear com a quantidade de linhas.
+    
+    Args:
+        cabecalho: Títulos das colunas
+        colunas: Listas de textos, uma por coluna (ver _truncar)
+        larguras: Largura de cada coluna
+        estilo: TableStyle aplicado a cada bloco
+        linhas_por_bloco: Linhas de dados por bloco
+    
+    Yields:
+        LongTable: Um bloco da tabela
+    """
+    linhas = zip(*colunas)
+    while True:
+        bloco = list(islice(linhas, linhas_por_bloco))
+        if not bloco:
+            return
+        tabela = LongTable([cabecalho, *bloco], colWidths=larguras, repeatRows=1)
+        tabela.setStyle(estilo)
+        yield tabela
+
+
+# Linhas de dados por slide nas tabelas do PowerPoint (o restante vai para
+# slides de continuação)
+LINHAS_POR_SLIDE = 14
+
+COR_CABECALHO_PPT = '1F77B4'
+
+# Fundo da célula de status nas tabelas do PowerPoint
+CORES_STATUS_PPT = {
+    Status.ADOTADO: 'D4EDDA',
+    Status.DESENVOLVENDO: 'FFF3CD',
+    Status.EM_ADOCAO: 'E2E3E5',
+}
+
+
+# Caracteres de controle não aceitos em XML
+_CONTROLE_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _texto_xml(texto):
+    """Texto pronto para entrar no XML da célula"""
+    return escape(_CONTROLE_XML.sub('', texto))
+
+
+@lru_cache(maxsize=None)
+def _modelo_celula_pptx(tamanho, negrito=False, cor_texto=None, fundo=None):
+    """
+    XML de uma célula de tabela (a:tc) com a formatação pronta
+    
+    Returns:
+        tuple: (início, fim); a célula é início + _texto_xml(texto) + fim
+    """
+    preenchimento_texto = f'<a:solidFill><a:srgbClr val="{cor_texto}"/></a:solidFill>' if cor_texto else ''
+    preenchimento_celula = f'<a:solidFill><a:srgbClr val="{fundo}"/></a:solidFill>' if fundo else ''
+    inicio = (
+        '<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p><a:r>'
+        f'<a:rPr lang="pt-BR" sz="{tamanho * 100}" b="{int(negrito)}" dirty="0">{preenchimento_texto}</a:rPr>'
+        '<a:t>'
+    )
+    fim = f'</a:t></a:r></a:p></a:txBody><a:tcPr>{preenchimento_celula}</a:tcPr></a:tc>'
+    return inicio, fim
+
+
+def _tabela_pptx_em_slides(prs, titulo, cabecalho, linhas, left, top, width, height,
+                           tamanho_cabecalho=12, tamanho_corpo=11, linhas_por_slide=LINHAS_POR_SLIDE):
+    """
+    Tabela do PowerPoint dividida em slides de até linhas_por_slide linhas
+    
+    As linhas de cada slide são montadas como XML a partir de modelos de
+    célula já formatados e inseridas de uma vez, sem formatar célula a
+    célula pelo python-pptx. Os slides de continuação repetem o cabeçalho
+    e numeram o título ('Título (2/3)').
+    
+    Args:
+        prs: Presentation
+        titulo: Título dos slides
+        cabecalho: Títulos das colunas
+        linhas: Linhas da tabela; cada célula é (texto, cor de fundo hex ou None)
+        left, top, width, height: Posição e tamanho da tabela em um slide cheio
+        tamanho_cabecalho: Fonte do cabeçalho (pt)
+        tamanho_corpo: Fonte das linhas (pt)
+        linhas_por_slide: Linhas de dados por slide
+    
+    Returns:
+        list: Slides criados
+    """
+    blocos = [linhas[inicio:inicio + linhas_por_slide] for inicio in range(0, len(linhas), linhas_por_slide)]
+    blocos = blocos or [[]]
+    altura_linha = int(height / (linhas_por_slide + 1))
+    
+    modelo_cabecalho = _modelo_celula_pptx(tamanho_cabecalho, True, 'FFFFFF', COR_CABECALHO_PPT)
+    xml_cabecalho = f'<a:tr h="{altura_linha}">' + ''.join(
+        modelo_cabecalho[0] + _texto_xml(texto) + modelo_cabecalho[1] for texto in cabecalho
+    ) + '</a:tr>'
+    
+    slides = []
+    for numero, bloco in enumerate(blocos, 1):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = titulo if len(blocos) == 1 else f"{titulo} ({numero}/{len(blocos)})"
+        
+        # Só a estrutura (colunas e tamanho) vem do python-pptx; as linhas são substituídas
+        tabela = slide.shapes.add_table(
+            1, len(cabecalho), left, top, width, altura_linha * (len(bloco) + 1)
+        ).table._tbl
+        for tr in tabela.tr_lst:
+            tabela.remove(tr)
+        
+        partes = [f'<a:tbl {nsdecls("a")}>', xml_cabecalho]
+        for linha in bloco:
+            partes.append(f'<a:tr h="{altura_linha}">')
+            for texto, fundo in linha:
+                inicio, fim = _modelo_celula_pptx(tamanho_corpo, fundo=fundo)
+                partes.append(inicio + _texto_xml(texto) + fim)
+            partes.append('</a:tr>')
+        partes.append('</a:tbl>')
+        tabela.extend(parse_xml(''.join(partes)).findall(qn('a:tr')))
+        
+        slides.append(slide)
+    
+    return slides
+
+
+# Cartões da visão geral: (rótulo, atributo do Score, left, top em polegadas)
+CARTOES_METRICAS = (
+    ("Total de Áreas", 'total', 1, 2),
+    ("Adotado", 'adotado', 3.5, 2),
+    ("Desenvolvendo", 'desenvolvendo', 6, 2),
+    ("Em Adoção", 'em_adocao', 1, 4.5),
+)
+
+
+@lru_cache(maxsize=1)
+def _modelo_pptx():
+    """
+    Apresentação base, montada uma vez por processo
+    
+    Contém o tamanho dos slides, o slide de título, a visão geral com os
+    cartões de métricas e os próximos passos; os textos que dependem dos
+    dados (subtítulo e valores dos cartões) ficam vazios, já formatados,
+    em formas nomeadas ('subtitulo', 'valor_<atributo>').
+    
+    Returns:
+        bytes: Pacote .pptx do modelo (cada exportação abre uma cópia)
+    """
+    prs = Presentation()
+    prs.slide_width = Inches(10)
+    prs.slide_height = Inches(7.5)
+    
+    # ===== SLIDE 1: TÍTULO =====
+    slide_title = prs.slides.add_slide(prs.slide_layouts[6])  # Blank layout
+    
+    # Título
+    title_box = slide_title.shapes.add_textbox(Inches(1), Inches(2.5), Inches(8), Inches(1))
+    title_frame = title_box.text_frame
+    title_frame.text = "Framework TMMi"
+    title_para = title_frame.paragraphs[0]
+    title_para.font.size = Pt(54)
+    title_para.font.bold = True
+    title_para.font.color.rgb = RGBColor(31, 119, 180)
+    title_para.alignment = PP_ALIGN.CENTER
+    
+    # Subtítulo
+    subtitle_box = slide_title.shapes.add_textbox(Inches(1), Inches(3.8), Inches(8), Inches(0.8))
+    subtitle_box.name = 'subtitulo'
+    subtitle_frame = subtitle_box.text_frame
+    subtitle_para = subtitle_frame.paragraphs[0]
+    subtitle_para.font.size = Pt(28)
+    subtitle_para.font.color.rgb = RGBColor(100, 100, 100)
+    subtitle_para.alignment = PP_ALIGN.CENTER
+    
+    # ===== SLIDE 2: VISÃO GERAL =====
+    slide_overview = prs.slides.add_slide(prs.slide_layouts[1])  # Title and Content
+    
+    title = slide_overview.shapes.title
+    title.text = "Visão Geral do TMMi"
+    
+    # Criar caixas de métricas
+    for metric_name, atributo, left, top in CARTOES_METRICAS:
+        # Box de fundo
+        box = slide_overview.shapes.add_shape(
+            1,  # Rectangle
+            Inches(left), Inches(top),
+            Inches(2), Inches(1.2)
+        )
+        box.fill.solid()
+        box.fill.fore_color.rgb = RGBColor(227, 242, 253)
+        box.line.color.rgb = RGBColor(31, 119, 180)
+        
+        # Valor
+        value_box = slide_overview.shapes.add_textbox(
+            Inches(left), Inches(top + 0.1),
+            Inches(2), Inches(0.6)
+        )
+        value_box.name = f'valor_{atributo}'
+        value_frame = value_box.text_frame
+        value_para = value_frame.paragraphs[0]
+        value_para.font.size = Pt(36)
+        value_para.font.bold = True
+        value_para.font.color.rgb = RGBColor(31, 119, 180)
+        value_para.alignment = PP_ALIGN.CENTER
+        
+        # Nome da métrica
+        name_box = slide_overview.shapes.add_textbox(
+            Inches(left), Inches(top + 0.7),
+            Inches(2), Inches(0.4)
+        )
+        name_frame = name_box.text_frame
+        name_frame.text = metric_name
+        name_para = name_frame.paragraphs[0]
+        name_para.font.size = Pt(14)
+        name_para.alignment = PP_ALIGN.CENTER
+    
+    # ===== ÚLTIMO SLIDE: PRÓXIMOS PASSOS =====
+    slide_next = prs.slides.add_slide(prs.slide_layouts[1])
+    
+    title = slide_next.shapes.title
+    title.text = "Próximos Passos"
+    
+    content_box = slide_next.placeholders[1]
+    tf = content_box.text_frame
+    tf.clear()
+    
+    next_steps = [
+        "Consolidar adoção das áreas em desenvolvimento",
+        "Avançar para Nível 3 do TMMi",
+        "Expandir automação de testes",
+        "Fortalecer governança de qualidade",
+        "Medir resultados e ajustar estratégia"
+    ]
+    
+    for step in next_steps:
+        p = tf.add_paragraph()
+        p.text = step
+        p.level = 0
+        p.font.size = Pt(20)
+    
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+# Flowables mantidos à frente do que o build já consumiu
+JANELA_HISTORIA = 16
+
+
+class _HistoriaSobDemanda(list):
+    """
+    História do PDF abastecida aos poucos por um gerador
+    
+    O SimpleDocTemplate.build consome a lista pela frente (len, [0], del) e
+    devolve à frente os pedaços de um flowable quebrado entre páginas. A
+    lista guarda só uma janela de flowables ainda não desenhados e puxa o
+    gerador conforme é consumida; os já desenhados deixam de ser referenciados.
+    """
+    
+    def __init__(self, gerador, janela=JANELA_HISTORIA):
+        super().__init__()
+        self._gerador = gerador
+        self._janela = janela
+    
+    def _abastecer(self, minimo):
+        while self._gerador is not None and list.__len__(self) < minimo:
+            try:
+                self.append(next(self._gerador))
+            except StopIteration:
+                self._gerador = None
+    
+    def __len__(self):
+        self._abastecer(self._janela)
+        return list.__len__(self)
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, int) and indice >= 0:
+            self._abastecer(indice + 1)
+        return list.__getitem__(self, indice)
 
 
 class TMMiExporter:
     """Classe para exportar dados do TMMi para PDF e PowerPoint"""
     
-    def __init__(self, data_dict):
+    def __init__(self, data_dict, relatorio=None, escopo=None, cache=None, tema=TEMA_PADRAO, dia=None):
         """
         Inicializa o exportador
         
         Args:
             data_dict: Dicionário com os dataframes carregados
+            relatorio: Relatorio já montado (evita recalcular a partir dos dataframes)
+            escopo: Recorte exibido no subtítulo (ex.: 'Squad Ativos'); None = organização
+            cache: CacheArtefatos que guarda e devolve os artefatos já gerados (opcional)
+            tema: Tema das cores do PDF (ver estilos.TEMAS)
+            dia: Data impressa no documento e usada na chave do cache (padrão: hoje)
         """
         self.data = data_dict
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-    
-    def _setup_custom_styles(self):
-        """Configura estilos customizados"""
-        # Título principal
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1f77b4'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Subtítulo
-        self.styles.add(ParagraphStyle(
-            name='CustomHeading',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#333333'),
-            spaceAfter=12,
-            spaceBefore=12,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Texto normal
-        self.styles.add(ParagraphStyle(
-            name='CustomBody',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            spaceAfter=6,
-            fontName='Helvetica'
-        ))
+        self.escopo = escopo
+        self.cache = cache
+        self.relatorio = relatorio if relatorio is not None else montar_relatorio(data_dict)
+        self.tema = tema
+        self.dia = dia or date.today()
+        # Estilos montados uma vez por processo e compartilhados (somente leitura)
+        self.styles = estilos_paragrafo(tema)
+        self.estilos_tabela = estilos_tabela(tema)
+    
+    def _exportar(self, tipo, output_path, gerar):
+        """
+        Gera o artefato, ou copia o guardado no cache para um pedido igual
+        
+        Args:
+            tipo: 'pdf' ou 'ppt'
+            output_path: Caminho do arquivo de saída ou buffer binário
+            gerar: Método que monta o documento em output_path
+        
+        Returns:
+            str | IO: Caminho do arquivo gerado (ou o próprio buffer)
+        """
+        if self.cache is None:
+            gerar(output_path)
+            return output_path
+        
+        chave = chave_artefato(self.relatorio, tipo, VERSAO_MODELO, self.escopo, self.dia, self.tema)
+        conteudo = self.cache.obter(chave)
+        if conteudo is None:
+            buffer = io.BytesIO()
+            gerar(buffer)
+            conteudo = buffer.getvalue()
+            self.cache.guardar(chave, conteudo)
+        
+        if isinstance(output_path, (str, os.PathLike)):
+            with open(output_path, 'wb') as f:
+                f.write(conteudo)
+        else:
+            output_path.write(conteudo)
+        return output_path
     
     def export_to_pdf(self, output_path='/mnt/user-data/outputs/Framework_TMMi_Relatorio.pdf'):
         """
         Exporta relatório completo em PDF
         
         Args:
-            output_path: Caminho do arquivo de saída
+            output_path: Caminho do arquivo de saída ou buffer binário (ex.: io.BytesIO)
         
         Returns:
-            str: Caminho do arquivo gerado
+            str | IO: Caminho do arquivo gerado (ou o próprio buffer)
         """
-        doc = SimpleDocTemplate(output_path, pagesize=A4)
-        story = []
+        return self._exportar('pdf', output_path, self._gerar_pdf)
+    
+    def _gerar_pdf(self, output_path):
+        """
+        Monta o PDF em output_path
         
+        As seções são geradas sob demanda: o build recebe os flowables aos
+        poucos, conforme as páginas são compostas, e os já desenhados são
+        descartados, então a memória não cresce com o tamanho do relatório.
+        """
+        doc = SimpleDocTemplate(output_path, pagesize=A4)
+        doc.build(_HistoriaSobDemanda(self._historia_pdf()))
+    
+    def _historia_pdf(self):
+        """Flowables do PDF, seção por seção"""
+        yield from self._secao_titulo()
+        yield from self._secao_institucional()
+        yield PageBreak()
+        yield from self._secao_roadmap()
+        yield PageBreak()
+        yield from self._secao_mapa()
+    
+    def _secao_titulo(self):
+        """Título e subtítulo (com o escopo e a data)"""
         # Título
-        title = Paragraph("Framework TMMi - TAG IMF", self.styles['CustomTitle'])
-        story.append(title)
+        yield Paragraph("Framework TMMi - TAG IMF", self.styles['CustomTitle'])
         
-        subtitle = Paragraph(
-            f"Relatório Executivo - {datetime.now().strftime('%d/%m/%Y')}",
+        recorte = f" - {self.escopo}" if self.escopo else ""
+        yield Paragraph(
+            f"Relatório Executivo{recorte} - {self.dia.strftime('%d/%m/%Y')}",
             self.styles['CustomBody']
         )
-        story.append(subtitle)
-        story.append(Spacer(1, 0.3*inch))
-        
+        yield Spacer(1, 0.3*inch)
+    
+    def _secao_institucional(self):
+        """Métricas gerais e tabela de status das áreas"""
         # ===== VISÃO INSTITUCIONAL =====
-        story.append(Paragraph("Visão Institucional", self.styles['CustomHeading']))
-        
-        df_inst = self.data['institucional']
+        yield Paragraph("Visão Institucional", self.styles['CustomHeading'])
         
-        # Estatísticas gerais
-        total_areas = len(df_inst)
-        adotado = len(df_inst[df_inst['Status Institucional'] == 'Adotado'])
-        desenvolvendo = len(df_inst[df_inst['Status Institucional'] == 'Desenvolvendo'])
+        score = self.relatorio.score
+        total_areas = score.total
+        divisor = total_areas or 1
         
         stats_text = f"""
         <b>Áreas de Processo Mapeadas:</b> {total_areas}<br/>
-        <b>Adotado:</b> {adotado} ({(adotado/total_areas*100):.0f}%)<br/>
-        <b>Desenvolvendo:</b> {desenvolvendo} ({(desenvolvendo/total_areas*100):.0f}%)
+        <b>Adotado:</b> {score.adotado} ({(score.adotado/divisor*100):.0f}%)<br/>
+        <b>Desenvolvendo:</b> {score.desenvolvendo} ({(score.desenvolvendo/divisor*100):.0f}%)
         """
-        story.append(Paragraph(stats_text, self.styles['CustomBody']))
-        story.append(Spacer(1, 0.2*inch))
+        yield Paragraph(stats_text, self.styles['CustomBody'])
+        yield Spacer(1, 0.2*inch)
         
         # Tabela de status por nível
-        data_table = [['Nível', 'Área de Processo', 'Status', 'Observação']]
-        
-        for idx, row in df_inst.iterrows():
-            nivel = str(row.get('Nível TMMi', ''))
-            area = str(row.get('Área de Processo', ''))
-            status = str(row.get('Status Institucional', ''))
-            obs = str(row.get('Observação', ''))[:50] + '...' if len(str(row.get('Observação', ''))) > 50 else str(row.get('Observação', ''))
-            
-            if area and area != 'nan':
-                data_table.append([nivel, area, status, obs])
-        
-        if len(data_table) > 1:
-            table = Table(data_table, colWidths=[0.8*inch, 2*inch, 1.2*inch, 2*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-            ]))
-            story.append(table)
-        
-        story.append(PageBreak())
-        
+        areas = self.relatorio.areas
+        if areas:
+            colunas = pd.DataFrame(
+                [(area.nivel, area.rotulo, area.status, area.observacao) for area in areas],
+                columns=['nivel', 'nome', 'status', 'observacao']
+            )
+            yield from _tabela_em_blocos(
+                ['Nível', 'Área de Processo', 'Status', 'Observação'],
+                [
+                    _truncar(colunas['nivel']),
+                    _truncar(colunas['nome']),
+                    _truncar(colunas['status']),
+                    _truncar(colunas['observacao'], 50, reticencias=True),
+                ],
+                [0.8*inch, 2*inch, 1.2*inch, 2*inch],
+                self.estilos_tabela['institucional']
+            )
+    
+    def _secao_roadmap(self):
+        """Roadmap trimestral em tabela"""
         # ===== ROADMAP TRIMESTRAL =====
-        story.append(Paragraph("Roadmap Trimestral", self.styles['CustomHeading']))
-        
-        df_roadmap = self.data['roadmap']
-        
-        if not df_roadmap.empty:
-            roadmap_table = [['Trimestre', 'Fase', 'Entrega', 'Status']]
-            
-            for idx, row in df_roadmap.iterrows():
-                tri = str(row.get('Trimestre', ''))[:15]
-                fase = str(row.get('Fase', ''))[:20]
-                entrega = str(row.get('Entrega', ''))[:50] + '...' if len(str(row.get('Entrega', ''))) > 50 else str(row.get('Entrega', ''))
-                status = str(row.get('Status', ''))
-                
-                if entrega and entrega != 'nan':
-                    roadmap_table.append([tri, fase, entrega, status])
-            
-            if len(roadmap_table) > 1:
-                table = Table(roadmap_table, colWidths=[1*inch, 1.3*inch, 3*inch, 1*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-                ]))
-                story.append(table)
-        
-        story.append(PageBreak())
+        yield Paragraph("Roadmap Trimestral", self.styles['CustomHeading'])
         
+        entregas = [item for item in self.relatorio.roadmap if item.entrega]
+        if entregas:
+            colunas = pd.DataFrame(
+                [(item.trimestre, item.fase, com_unidade(item.entrega, item.unidade), item.status) for item in entregas],
+                columns=['trimestre', 'fase', 'entrega', 'status']
+            )
+            yield from _tabela_em_blocos(
+                ['Trimestre', 'Fase', 'Entrega', 'Status'],
+                [
+                    _truncar(colunas['trimestre'], 15),
+                    _truncar(colunas['fase'], 20),
+                    _truncar(colunas['entrega'], 50, reticencias=True),
+                    _truncar(colunas['status']),
+                ],
+                [1*inch, 1.3*inch, 3*inch, 1*inch],
+                self.estilos_tabela['roadmap']
+            )
+    
+    def _secao_mapa(self):
+        """Descrição das áreas, agrupadas por nível"""
         # ===== MAPA DO TMMi =====
-        story.append(Paragraph("Mapa do TMMi", self.styles['CustomHeading']))
+        yield Paragraph("Mapa do TMMi", self.styles['CustomHeading'])
         
-        df_mapa = self.data['mapa']
+        niveis_mapa = sorted({item.nivel for item in self.relatorio.mapa})
         
-        if not df_mapa.empty and 'Nível' in df_mapa.columns:
-            niveis = df_mapa['Nível'].dropna().unique()
+        for nivel in niveis_mapa:
+            yield Paragraph(f"<b>Nível {nivel}</b>", self.styles['CustomBody'])
+            yield Spacer(1, 0.1*inch)
             
-            for nivel in sorted(niveis):
-                df_nivel = df_mapa[df_mapa['Nível'] == nivel]
+            for item in self.relatorio.mapa:
+                if item.nivel != nivel:
+                    continue
                 
-                story.append(Paragraph(f"<b>Nível {nivel}</b>", self.styles['CustomBody']))
-                story.append(Spacer(1, 0.1*inch))
+                descricao = item.descricao or ''
+                descricao = descricao[:200] + '...' if len(descricao) > 200 else descricao
                 
-                for idx, row in df_nivel.iterrows():
-                    area = row.get('Área de Processo', 'N/A')
-                    descricao = str(row.get('Descrição', ''))[:200] + '...' if len(str(row.get('Descrição', ''))) > 200 else str(row.get('Descrição', ''))
-                    
-                    if area != 'N/A' and str(area) != 'nan':
-                        story.append(Paragraph(f"• <b>{area}</b>", self.styles['CustomBody']))
-                        if descricao and descricao != 'nan':
-                            story.append(Paragraph(f"  {descricao}", self.styles['CustomBody']))
-                        story.append(Spacer(1, 0.1*inch))
-                
-                story.append(Spacer(1, 0.2*inch))
-        
-        # Gerar PDF
-        doc.build(story)
-        return output_path
+                yield Paragraph(f"• <b>{item.area}</b>", self.styles['CustomBody'])
+                if descricao:
+                    yield Paragraph(f"  {descricao}", self.styles['CustomBody'])
+                yield Spacer(1, 0.1*inch)
+            
+            yield Spacer(1, 0.2*inch)
     
     def export_to_powerpoint(self, output_path='/mnt/user-data/outputs/Framework_TMMi_Apresentacao.pptx'):
         """
         Exporta apresentação executiva em PowerPoint
         
         Args:
-            output_path: Caminho do arquivo de saída
+            output_path: Caminho do arquivo de saída ou buffer binário (ex.: io.BytesIO)
         
         Returns:
-            str: Caminho do arquivo gerado
+            str | IO: Caminho do arquivo gerado (ou o próprio buffer)
         """
-        prs = Presentation()
-        prs.slide_width = Inches(10)
-        prs.slide_height = Inches(7.5)
+        return self._exportar('ppt', output_path, self._gerar_powerpoint)
+    
+    def _gerar_powerpoint(self, output_path):
+        """
+        Monta a apresentação em output_path
         
-        # ===== SLIDE 1: TÍTULO =====
-        slide_title = prs.slides.add_slide(prs.slide_layouts[6])  # Blank layout
+        Parte de uma cópia do modelo (ver _modelo_pptx) e só preenche o
+        subtítulo, os valores dos cartões e as tabelas.
+        """
+        prs = Presentation(io.BytesIO(_modelo_pptx()))
+        slide_title, slide_overview, slide_next = prs.slides
         
-        # Título
-        title_box = slide_title.shapes.add_textbox(Inches(1), Inches(2.5), Inches(8), Inches(1))
-        title_frame = title_box.text_frame
-        title_frame.text = "Framework TMMi"
-        title_para = title_frame.paragraphs[0]
-        title_para.font.size = Pt(54)
-        title_para.font.bold = True
-        title_para.font.color.rgb = RGBColor(31, 119, 180)
-        title_para.alignment = PP_ALIGN.CENTER
-        
-        # Subtítulo
-        subtitle_box = slide_title.shapes.add_textbox(Inches(1), Inches(3.8), Inches(8), Inches(0.8))
-        subtitle_frame = subtitle_box.text_frame
-        subtitle_frame.text = f"TAG IMF - {datetime.now().strftime('%B %Y')}"
-        subtitle_para = subtitle_frame.paragraphs[0]
-        subtitle_para.font.size = Pt(28)
-        subtitle_para.font.color.rgb = RGBColor(100, 100, 100)
-        subtitle_para.alignment = PP_ALIGN.CENTER
+        # ===== SLIDE 1: TÍTULO =====
+        formas = {shape.name: shape for shape in slide_title.shapes}
+        recorte = f" - {self.escopo}" if self.escopo else ""
+        formas['subtitulo'].text_frame.paragraphs[0].text = f"TAG IMF{recorte} - {self.dia.strftime('%B %Y')}"
         
         # ===== SLIDE 2: VISÃO GERAL =====
-        slide_overview = prs.slides.add_slide(prs.slide_layouts[1])  # Title and Content
-        
-        title = slide_overview.shapes.title
-        title.text = "Visão Geral do TMMi"
-        
-        df_inst = self.data['institucional']
-        total_areas = len(df_inst)
-        adotado = len(df_inst[df_inst['Status Institucional'] == 'Adotado'])
-        desenvolvendo = len(df_inst[df_inst['Status Institucional'] == 'Desenvolvendo'])
-        em_adocao = len(df_inst[df_inst['Status Institucional'] == 'Em Adoção'])
-        
-        # Criar caixas de métricas
-        metrics = [
-            ("Total de Áreas", total_areas, 1, 2),
-            ("Adotado", adotado, 3.5, 2),
-            ("Desenvolvendo", desenvolvendo, 6, 2),
-            ("Em Adoção", em_adocao, 1, 4.5)
-        ]
-        
-        for metric_name, metric_value, left, top in metrics:
-            # Box de fundo
-            box = slide_overview.shapes.add_shape(
-                1,  # Rectangle
-                Inches(left), Inches(top),
-                Inches(2), Inches(1.2)
-            )
-            box.fill.solid()
-            box.fill.fore_color.rgb = RGBColor(227, 242, 253)
-            box.line.color.rgb = RGBColor(31, 119, 180)
-            
-            # Valor
-            value_box = slide_overview.shapes.add_textbox(
-                Inches(left), Inches(top + 0.1),
-                Inches(2), Inches(0.6)
-            )
-            value_frame = value_box.text_frame
-            value_frame.text = str(metric_value)
-            value_para = value_frame.paragraphs[0]
-            value_para.font.size = Pt(36)
-            value_para.font.bold = True
-            value_para.font.color.rgb = RGBColor(31, 119, 180)
-            value_para.alignment = PP_ALIGN.CENTER
-            
-            # Nome da métrica
-            name_box = slide_overview.shapes.add_textbox(
-                Inches(left), Inches(top + 0.7),
-                Inches(2), Inches(0.4)
-            )
-            name_frame = name_box.text_frame
-            name_frame.text = metric_name
-            name_para = name_frame.paragraphs[0]
-            name_para.font.size = Pt(14)
-            name_para.alignment = PP_ALIGN.CENTER
+        formas = {shape.name: shape for shape in slide_overview.shapes}
+        score = self.relatorio.score
+        for _, atributo, _, _ in CARTOES_METRICAS:
+            formas[f'valor_{atributo}'].text_frame.paragraphs[0].text = str(getattr(score, atributo))
         
         # ===== SLIDE 3: STATUS POR NÍVEL =====
-        slide_status = prs.slides.add_slide(prs.slide_layouts[1])
-        
-        title = slide_status.shapes.title
-        title.text = "Status por Nível TMMi"
-        
-        # Tabela de status
-        rows = 1 + len(df_inst[df_inst['Área de Processo'].notna()])
-        cols = 3
-        
-        table = slide_status.shapes.add_table(rows, cols, Inches(1), Inches(2), Inches(8), Inches(4)).table
-        
-        # Cabeçalho
-        table.cell(0, 0).text = "Nível"
-        table.cell(0, 1).text = "Área de Processo"
-        table.cell(0, 2).text = "Status"
-        
-        # Formatar cabeçalho
-        for i in range(3):
-            cell = table.cell(0, i)
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = RGBColor(31, 119, 180)
-            para = cell.text_frame.paragraphs[0]
-            para.font.size = Pt(12)
-            para.font.bold = True
-            para.font.color.rgb = RGBColor(255, 255, 255)
-        
-        # Dados
-        row_idx = 1
-        for idx, row in df_inst.iterrows():
-            if pd.notna(row.get('Área de Processo')) and row_idx < rows:
-                table.cell(row_idx, 0).text = str(row.get('Nível TMMi', ''))
-                table.cell(row_idx, 1).text = str(row.get('Área de Processo', ''))
-                table.cell(row_idx, 2).text = str(row.get('Status Institucional', ''))
-                
-                # Colorir status
-                status = str(row.get('Status Institucional', '')).lower()
-                status_cell = table.cell(row_idx, 2)
-                status_cell.fill.solid()
-                
-                if 'adotado' in status:
-                    status_cell.fill.fore_color.rgb = RGBColor(212, 237, 218)
-                elif 'desenvolvendo' in status:
-                    status_cell.fill.fore_color.rgb = RGBColor(255, 243, 205)
-                elif 'adoção' in status or 'adocao' in status:
-                    status_cell.fill.fore_color.rgb = RGBColor(226, 227, 229)
-                
-                row_idx += 1
+        # Tabela de status, dividida em quantos slides forem necessários
+        areas = self.relatorio.areas
+        _tabela_pptx_em_slides(
+            prs, "Status por Nível TMMi",
+            ["Nível", "Área de Processo", "Status"],
+            [
+                [
+                    (area.nivel or '', None),
+                    (area.rotulo, None),
+                    (area.status or '', CORES_STATUS_PPT.get(normalizar_status(area.status))),
+                ]
+                for area in areas
+            ],
+            Inches(1), Inches(2), Inches(8), Inches(4),
+            tamanho_cabecalho=12, tamanho_corpo=11
+        )
         
         # ===== SLIDE 4: ROADMAP =====
-        slide_roadmap = prs.slides.add_slide(prs.slide_layouts[1])
-        
-        title = slide_roadmap.shapes.title
-        title.text = "Roadmap - Próximas Entregas"
+        # Filtrar TRI 1
+        itens_tri1 = [item for item in self.relatorio.roadmap if 'TRI 1' in (item.trimestre or '')]
+        
+        if itens_tri1:
+            _tabela_pptx_em_slides(
+                prs, "Roadmap - Próximas Entregas",
+                ["Fase", "Entrega", "Status"],
+                [
+                    [
+                        ((item.fase or '')[:30], None),
+                        ((com_unidade(item.entrega, item.unidade) or '')[:60], None),
+                        (item.status or '', None),
+                    ]
+                    for item in itens_tri1[:7]  # Limitar a 7 entregas
+                ],
+                Inches(0.5), Inches(2), Inches(9), Inches(4.5),
+                tamanho_cabecalho=11, tamanho_corpo=9, linhas_por_slide=7
+            )
+        else:
+            slide_roadmap = prs.slides.add_slide(prs.slide_layouts[1])
+            slide_roadmap.shapes.title.text = "Roadmap - Próximas Entregas"
         
-        df_roadmap = self.data['roadmap']
-        
-        if not df_roadmap.empty:
-            # Filtrar TRI 1
-            df_tri1 = df_roadmap[df_roadmap['Trimestre'].str.contains('TRI 1', na=False)]
-            
-            if not df_tri1.empty:
-                rows_roadmap = min(len(df_tri1) + 1, 8)  # Limitar a 7 entregas
-                cols_roadmap = 3
-                
-                table_roadmap = slide_roadmap.shapes.add_table(
-                    rows_roadmap, cols_roadmap,
-                    Inches(0.5), Inches(2),
-                    Inches(9), Inches(4.5)
-                ).table
-                
-                # Cabeçalho
-                table_roadmap.cell(0, 0).text = "Fase"
-                table_roadmap.cell(0, 1).text = "Entrega"
-                table_roadmap.cell(0, 2).text = "Status"
-                
-                for i in range(3):
-                    cell = table_roadmap.cell(0, i)
-                    cell.fill.solid()
-                    cell.fill.fore_color.rgb = RGBColor(31, 119, 180)
-                    para = cell.text_frame.paragraphs[0]
-                    para.font.size = Pt(11)
-                    para.font.bold = True
-                    para.font.color.rgb = RGBColor(255, 255, 255)
-                
-                # Dados
-                for idx, (_, row) in enumerate(df_tri1.head(7).iterrows(), 1):
-                    if idx < rows_roadmap:
-                        fase = str(row.get('Fase', ''))[:30]
-                        entrega = str(row.get('Entrega', ''))[:60]
-                        status = str(row.get('Status', ''))
-                        
-                        table_roadmap.cell(idx, 0).text = fase
-                        table_roadmap.cell(idx, 1).text = entrega
-                        table_roadmap.cell(idx, 2).text = status
-                        
-                        # Ajustar tamanho da fonte
-                        for col in range(3):
-                            cell = table_roadmap.cell(idx, col)
-                            para = cell.text_frame.paragraphs[0]
-                            para.font.size = Pt(9)
-        
-        # ===== SLIDE 5: PRÓXIMOS PASSOS =====
-        slide_next = prs.slides.add_slide(prs.slide_layouts[1])
-        
-        title = slide_next.shapes.title
-        title.text = "Próximos Passos"
-        
-        content_box = slide_next.placeholders[1]
-        tf = content_box.text_frame
-        tf.clear()
-        
-        next_steps = [
-            "Consolidar adoção das áreas em desenvolvimento",
-            "Avançar para Nível 3 do TMMi",
-            "Expandir automação de testes",
-            "Fortalecer governança de qualidade",
-            "Medir resultados e ajustar estratégia"
-        ]
-        
-        for step in next_steps:
-            p = tf.add_paragraph()
-            p.text = step
-            p.level = 0
-            p.font.size = Pt(20)
+        # ===== ÚLTIMO SLIDE: PRÓXIMOS PASSOS =====
+        # Vem do modelo logo após a visão geral; passa para o fim, depois das tabelas
+        lista_slides = prs.slides._sldIdLst
+        lista_slides.append(lista_slides[2])
         
         # Salvar apresentação
         prs.save(output_path)
-        return output_path
+    
+    def export_to_pdf_bytes(self):
+        """
+        Gera o PDF em memória, sem passar pelo disco
+        
+        Returns:
+            bytes: Conteúdo do PDF (pronto para st.download_button)
+        """
+        buffer = io.BytesIO()
+        self.export_to_pdf(buffer)
+        return buffer.getvalue()
+    
+    def export_to_powerpoint_bytes(self):
+        """
+        Gera a apresentação em memória, sem passar pelo disco
+        
+        Returns:
+            bytes: Conteúdo do .pptx (pronto para st.download_button)
+        """
+        buffer = io.BytesIO()
+        self.export_to_powerpoint(buffer)
+        return buffer.getvalue()
+
+
+# Artefato -> método do TMMiExporter que o gera
+METODOS_EXPORTACAO = {
+    'pdf': 'export_to_pdf',
+    'ppt': 'export_to_powerpoint',
+}
+
+
+def _exportar_artefato(tipo, entrada, cache=None):
+    """
+    Gera um artefato a partir do relatório serializado (executado no processo de trabalho)
+
+    Args:
+        tipo: 'pdf' ou 'ppt'
+        entrada: Relatorio serializado com pickle
+        cache: CacheArtefatos (opcional)
+
+    Returns:
+        tuple: (caminho do arquivo gerado, segundos gastos)
+    """
+    inicio = time.perf_counter()
+    exporter = TMMiExporter({}, relatorio=pickle.loads(entrada), cache=cache)
+    caminho = getattr(exporter, METODOS_EXPORTACAO[tipo])()
+    return caminho, time.perf_counter() - inicio
 
 
-def export_framework(data_dict, export_pdf=True, export_ppt=True):
+def export_framework(data_dict, export_pdf=True, export_ppt=True, relatorio=None, paralelo=None, cache=None):
     """
     Função helper para exportar o framework
     
+    Com PDF e PowerPoint pedidos, cada um é gerado em um processo próprio a
+    partir do mesmo relatório serializado uma única vez; o tempo total fica
+    próximo ao do artefato mais lento.
+    
     Args:
-        data_dict: Dicionário com os dados
+        data_dict: Dicionário com os dados, ou caminho de uma planilha, de um
+            diretório ou de um padrão glob (ex.: 'unidades/*.xlsx') com uma
+            planilha por unidade, exportadas de forma consolidada
         export_pdf: Se True, gera PDF
         export_ppt: Se True, gera PowerPoint
+        relatorio: Relatorio já montado (opcional)
+        paralelo: Gera os artefatos em processos separados (padrão: sim, quando
+            os dois são pedidos)
+        cache: CacheArtefatos; artefatos iguais já gerados são apenas copiados
     
     Returns:
-        dict: Caminhos dos arquivos gerados
+        dict: Caminhos dos arquivos gerados ('pdf', 'ppt') e 'tempos' em
+            segundos por artefato e 'total'
     """
-    exporter = TMMiExporter(data_dict)
-    results = {}
+    inicio = time.perf_counter()
+    
+    if isinstance(data_dict, (str, os.PathLike)):
+        data_dict = load_workbooks_data(data_dict) if eh_consolidado(data_dict) else load_workbook_data(data_dict)
     
-    if export_pdf:
-        pdf_path = exporter.export_to_pdf()
-        results['pdf'] = pdf_path
+    exporter = TMMiExporter(data_dict, relatorio=relatorio, cache=cache)
+    tipos = [tipo for tipo, pedido in (('pdf', export_pdf), ('ppt', export_ppt)) if pedido]
+    if paralelo is None:
+        paralelo = len(tipos) > 1
+    
+    results = {}
+    tempos = {}
     
-    if export_ppt:
-        ppt_path = exporter.export_to_powerpoint()
-        results['ppt'] = ppt_path
+    if paralelo and tipos:
+        entrada = pickle.dumps(exporter.relatorio)
+        # spawn: o fork de um processo com threads (servidor do Streamlit) pode travar
+        with ProcessPoolExecutor(max_workers=len(tipos), mp_context=multiprocessing.get_context('spawn')) as pool:
+            futuros = {tipo: pool.submit(_exportar_artefato, tipo, entrada, cache) for tipo in tipos}
+            for tipo, futuro in futuros.items():
+                results[tipo], tempos[tipo] = futuro.result()
+    else:
+        for tipo in tipos:
+            inicio_artefato = time.perf_counter()
+            results[tipo] = getattr(exporter, METODOS_EXPORTACAO[tipo])()
+            tempos[tipo] = time.perf_counter() - inicio_artefato
     
+    tempos['total'] = time.perf_counter() - inicio
+    results['tempos'] = tempos
     return results
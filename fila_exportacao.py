@@ -0,0 +1,193 @@
+"""
+Fila de exportações em segundo plano do Framework TMMi
+Gera PDF e PowerPoint em um conjunto limitado de processos, fora da
+execução do Streamlit, e junta pedidos iguais em um único trabalho;
+artefatos já guardados no cache em disco são devolvidos sem gerar nada
+"""
+
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date
+
+from artefatos import chave_artefato
+from exporter import VERSAO_MODELO, TMMiExporter
+
+
+# Artefato -> método do TMMiExporter que gera os bytes em memória
+METODOS_BYTES = {
+    'pdf': 'export_to_pdf_bytes',
+    'ppt': 'export_to_powerpoint_bytes',
+}
+
+PENDENTE = 'pendente'
+EXECUTANDO = 'executando'
+CONCLUIDO = 'concluido'
+ERRO = 'erro'
+
+
+def _gerar(tipo, relatorio, escopo, cache, dia):
+    """Gera o artefato no processo de trabalho; retorna (bytes, segundos)"""
+    inicio = time.perf_counter()
+    exporter = TMMiExporter({}, relatorio=relatorio, escopo=escopo, cache=cache, dia=dia)
+    conteudo = getattr(exporter, METODOS_BYTES[tipo])()
+    return conteudo, time.perf_counter() - inicio
+
+
+class Trabalho:
+    """Um pedido de exportação e o seu resultado"""
+
+    def __init__(self, id, versao, tipo, escopo, chave, futuro):
+        self.id = id
+        self.versao = versao
+        self.tipo = tipo
+        self.escopo = escopo
+        # Chave do artefato (ver artefatos.chave_artefato), que identifica o pedido
+        self.chave = chave
+        self.futuro = futuro
+        self.criado_em = time.time()
+
+    @property
+    def estado(self):
+        """pendente, executando, concluido ou erro"""
+        if not self.futuro.done():
+            return EXECUTANDO if self.futuro.running() else PENDENTE
+        return ERRO if self.futuro.exception() is not None else CONCLUIDO
+
+
+class FilaExportacao:
+    """
+    Serviço de exportação com processos limitados
+
+    Um pedido igual (mesmo relatório, artefato, escopo e dia) a outro ainda
+    pendente, em execução ou concluído devolve o trabalho existente; no dia
+    seguinte o documento, que traz a data, é gerado de novo. Os processos
+    são criados com 'spawn', seguro em servidores com threads.
+    """
+
+    def __init__(self, max_workers=2, max_trabalhos=20, cache=None):
+        """
+        Inicializa a fila
+
+        Args:
+            max_workers: Exportações simultâneas (processos)
+            max_trabalhos: Trabalhos finalizados mantidos em memória
+            cache: CacheArtefatos consultado antes de gerar e alimentado pelos
+                processos (opcional)
+        """
+        self.max_trabalhos = max_trabalhos
+        self.cache = cache
+        self._pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        self._trabalhos = OrderedDict()
+        self._por_pedido = {}
+        self._lock = threading.Lock()
+
+    def solicitar(self, versao, tipo, relatorio, escopo=None, dia=None):
+        """
+        Pede uma exportação, reaproveitando um pedido igual
+
+        Args:
+            versao: Identificador da versão dos dados (ex.: VersaoPlanilha.chave)
+            tipo: 'pdf' ou 'ppt'
+            relatorio: Relatorio a exportar
+            escopo: Recorte exibido no subtítulo (opcional)
+            dia: Data do documento (padrão: hoje)
+
+        Returns:
+            str: Id do trabalho
+        """
+        # O dia é fixado no pedido: o documento e a chave no cache usam a
+        # mesma data, mesmo que o processo só o gere depois da meia-noite
+        dia = dia or date.today()
+        pedido = chave_artefato(relatorio, tipo, VERSAO_MODELO, escopo, dia)
+
+        with self._lock:
+            trabalho = self._trabalhos.get(self._por_pedido.get(pedido))
+            if trabalho is not None and trabalho.estado != ERRO:
+                return trabalho.id
+
+            futuro = self._guardado(pedido)
+            if futuro is None:
+                futuro = self._pool.submit(_gerar, tipo, relatorio, escopo, self.cache, dia)
+            trabalho = Trabalho(uuid.uuid4().hex[:12], versao, tipo, escopo, pedido, futuro)
+            self._trabalhos[trabalho.id] = trabalho
+            self._por_pedido[pedido] = trabalho.id
+            self._descartar_antigos()
+
+            return trabalho.id
+
+    def _guardado(self, chave):
+        """Trabalho já concluído com o artefato do cache, ou None se não houver"""
+        if self.cache is None:
+            return None
+
+        conteudo = self.cache.obter(chave)
+        if conteudo is None:
+            return None
+
+        futuro = Future()
+        futuro.set_result((conteudo, 0.0))
+        return futuro
+
+    def estado(self, id_trabalho):
+        """
+        Situação de um trabalho
+
+        Args:
+            id_trabalho: Id devolvido por solicitar
+
+        Returns:
+            dict | None: id, versao, tipo, estado, segundos (da geração, quando
+                concluído) e erro; None se o trabalho não existir mais
+        """
+        with self._lock:
+            trabalho = self._trabalhos.get(id_trabalho)
+        if trabalho is None:
+            return None
+
+        estado = trabalho.estado
+        situacao = {
+            'id': trabalho.id,
+            'versao': trabalho.versao,
+            'tipo': trabalho.tipo,
+            'estado': estado,
+            'segundos': None,
+            'erro': None,
+        }
+        if estado == CONCLUIDO:
+            situacao['segundos'] = trabalho.futuro.result()[1]
+        elif estado == ERRO:
+            situacao['erro'] = str(trabalho.futuro.exception())
+        return situacao
+
+    def resultado(self, id_trabalho):
+        """Bytes do artefato, ou None se o trabalho não tiver sido concluído"""
+        with self._lock:
+            trabalho = self._trabalhos.get(id_trabalho)
+        if trabalho is None or trabalho.estado != CONCLUIDO:
+            return None
+        return trabalho.futuro.result()[0]
+
+    def estatisticas(self):
+        """Quantidade de trabalhos em memória por estado"""
+        with self._lock:
+            trabalhos = list(self._trabalhos.values())
+
+        contagem = dict.fromkeys((PENDENTE, EXECUTANDO, CONCLUIDO, ERRO), 0)
+        for trabalho in trabalhos:
+            contagem[trabalho.estado] += 1
+        return contagem
+
+    def _descartar_antigos(self):
+        """Mantém só os max_trabalhos trabalhos finalizados mais recentes"""
+        finalizados = [trabalho.id for trabalho in self._trabalhos.values() if trabalho.futuro.done()]
+        for id_trabalho in finalizados[:max(0, len(finalizados) - self.max_trabalhos)]:
+            trabalho = self._trabalhos.pop(id_trabalho)
+            if self._por_pedido.get(trabalho.chave) == id_trabalho:
+                del self._por_pedido[trabalho.chave]
@@ -0,0 +1,351 @@
+"""
+Histórico das versões da planilha do Framework TMMi
+Registra em SQLite (somente inclusão) o estado institucional, dos squads e
+do roadmap, além dos scores, a cada nova versão carregada; consultas de
+evolução e de comparação entre períodos não reprocessam planilhas antigas
+"""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import datetime
+
+import pandas as pd
+
+from loader import COLUNA_UNIDADE, SQUAD_COLS, listar_planilhas
+from relatorio import montar_relatorio
+
+
+ARQUIVO_HISTORICO = '.tmmi_historico.sqlite'
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS versoes (
+    id INTEGER PRIMARY KEY,
+    planilha TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    data_referencia TEXT NOT NULL,
+    registrado_em TEXT NOT NULL,
+    UNIQUE (planilha, digest)
+);
+CREATE INDEX IF NOT EXISTS idx_versoes_data ON versoes (planilha, data_referencia);
+
+CREATE TABLE IF NOT EXISTS metricas (
+    versao_id INTEGER NOT NULL REFERENCES versoes (id),
+    escopo TEXT NOT NULL,
+    metrica TEXT NOT NULL,
+    valor REAL NOT NULL,
+    PRIMARY KEY (versao_id, escopo, metrica)
+);
+CREATE INDEX IF NOT EXISTS idx_metricas_serie ON metricas (escopo, metrica, versao_id);
+
+CREATE TABLE IF NOT EXISTS areas (
+    versao_id INTEGER NOT NULL REFERENCES versoes (id),
+    unidade TEXT NOT NULL DEFAULT '',
+    area TEXT NOT NULL,
+    nivel TEXT,
+    status TEXT,
+    PRIMARY KEY (versao_id, unidade, area)
+);
+
+CREATE TABLE IF NOT EXISTS squads (
+    versao_id INTEGER NOT NULL REFERENCES versoes (id),
+    unidade TEXT NOT NULL DEFAULT '',
+    id_melhoria TEXT NOT NULL,
+    squad TEXT NOT NULL,
+    status TEXT,
+    PRIMARY KEY (versao_id, unidade, id_melhoria, squad)
+);
+
+CREATE TABLE IF NOT EXISTS roadmap (
+    versao_id INTEGER NOT NULL REFERENCES versoes (id),
+    unidade TEXT NOT NULL DEFAULT '',
+    id_melhoria TEXT NOT NULL,
+    trimestre TEXT,
+    entrega TEXT,
+    status TEXT,
+    PRIMARY KEY (versao_id, unidade, id_melhoria)
+);
+"""
+
+# Bancos anteriores à coluna 'unidade': as linhas passam para as tabelas
+# novas com unidade vazia (planilha única)
+_MIGRACAO_UNIDADE = """
+BEGIN;
+ALTER TABLE areas RENAME TO areas_sem_unidade;
+ALTER TABLE squads RENAME TO squads_sem_unidade;
+ALTER TABLE roadmap RENAME TO roadmap_sem_unidade;
+{esquema}
+INSERT INTO areas (versao_id, area, nivel, status)
+    SELECT versao_id, area, nivel, status FROM areas_sem_unidade;
+INSERT INTO squads (versao_id, id_melhoria, squad, status)
+    SELECT versao_id, id_melhoria, squad, status FROM squads_sem_unidade;
+INSERT INTO roadmap (versao_id, id_melhoria, trimestre, entrega, status)
+    SELECT versao_id, id_melhoria, trimestre, entrega, status FROM roadmap_sem_unidade;
+DROP TABLE areas_sem_unidade;
+DROP TABLE squads_sem_unidade;
+DROP TABLE roadmap_sem_unidade;
+COMMIT;
+""".format(esquema=ESQUEMA)
+
+# Comparação de uma tabela entre duas versões: linhas incluídas, removidas
+# ou com status diferente (a união de dois LEFT JOIN faz o papel do FULL JOIN)
+_SQL_DIFERENCAS = """
+SELECT {chaves_a}, a.status AS antes, b.status AS depois
+FROM {tabela} a LEFT JOIN {tabela} b ON b.versao_id = :b AND {juncao}
+WHERE a.versao_id = :a AND (b.versao_id IS NULL OR b.status IS NOT a.status)
+UNION ALL
+SELECT {chaves_b}, NULL AS antes, b.status AS depois
+FROM {tabela} b LEFT JOIN {tabela} a ON a.versao_id = :a AND {juncao}
+WHERE b.versao_id = :b AND a.versao_id IS NULL
+"""
+
+# Chaves das linhas de cada tabela comparada
+_CHAVES = {
+    'areas': ('unidade', 'area'),
+    'squads': ('unidade', 'id_melhoria', 'squad'),
+    'roadmap': ('unidade', 'id_melhoria'),
+}
+
+
+def caminho_historico(file_path):
+    """Banco de histórico de uma planilha (no mesmo diretório do arquivo)"""
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), ARQUIVO_HISTORICO)
+
+
+def _linhas_metricas(relatorio):
+    linhas = [('Geral', metrica, float(valor)) for metrica, valor in asdict(relatorio.score).items()]
+    for nivel in relatorio.niveis:
+        linhas += [
+            (nivel.nome, metrica, float(valor))
+            for metrica, valor in asdict(nivel).items() if metrica != 'nome'
+        ]
+    return linhas
+
+
+def _linhas_squads(df_squads):
+    cols = [col for col in SQUAD_COLS if col in df_squads.columns]
+    if 'ID' not in df_squads.columns or not cols:
+        return []
+
+    if COLUNA_UNIDADE in df_squads.columns:
+        unidades = df_squads[COLUNA_UNIDADE].astype(object).fillna('')
+    else:
+        unidades = pd.Series('', index=df_squads.index)
+
+    longo = df_squads[['ID'] + cols].assign(unidade=unidades)
+    longo = longo.melt(id_vars=['unidade', 'ID'], var_name='squad', value_name='status')
+    longo = longo.dropna(subset=['ID', 'status'])
+    return list(zip(longo['unidade'], longo['ID'].astype(str), longo['squad'], longo['status'].astype(str)))
+
+
+def _sem_repetidas(linhas, tamanho_chave):
+    """
+    Linhas com chave única (as tamanho_chave primeiras colunas)
+
+    Uma chave repetida dentro da mesma unidade fica com a primeira ocorrência,
+    como na planilha, em vez de falhar o registro da versão inteira.
+    """
+    vistas = set()
+    unicas = []
+    for linha in linhas:
+        chave = linha[:tamanho_chave]
+        if chave not in vistas:
+            vistas.add(chave)
+            unicas.append(linha)
+    return unicas
+
+
+class Historico:
+    """Histórico de versões de planilhas, guardado em um arquivo SQLite"""
+
+    def __init__(self, caminho):
+        """
+        Abre (ou cria) o banco de histórico
+
+        Args:
+            caminho: Arquivo SQLite (ex.: caminho_historico(planilha))
+        """
+        self.caminho = caminho
+        with self._conectar() as con:
+            colunas = {linha[1] for linha in con.execute('PRAGMA table_info(areas)')}
+            if colunas and 'unidade' not in colunas:
+                con.executescript(_MIGRACAO_UNIDADE)
+            con.executescript(ESQUEMA)
+
+    @contextmanager
+    def _conectar(self):
+        # Uma conexão por operação: o objeto pode ser usado por várias threads
+        con = sqlite3.connect(self.caminho, timeout=10)
+        try:
+            con.execute('PRAGMA foreign_keys = ON')
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def registrar(self, file_path, digest, data, relatorio=None):
+        """
+        Registra uma versão da planilha, se ainda não estiver no histórico
+
+        Args:
+            file_path: Caminho da planilha (ou diretório/padrão glob de uma versão consolidada)
+            digest: Hash do conteúdo (identifica a versão)
+            data: Dicionário com os dataframes carregados (formato do loader)
+            relatorio: Relatorio já montado a partir de data (opcional)
+
+        Returns:
+            int | None: Id da versão registrada, ou None se ela já existia
+        """
+        relatorio = relatorio or montar_relatorio(data)
+        planilha = os.path.basename(file_path)
+        modificado_em = max(os.path.getmtime(arquivo) for arquivo in listar_planilhas(file_path))
+        data_referencia = datetime.fromtimestamp(modificado_em).isoformat(timespec='seconds')
+
+        with self._conectar() as con:
+            cursor = con.execute(
+                'INSERT OR IGNORE INTO versoes (planilha, digest, data_referencia, registrado_em) '
+                'VALUES (?, ?, ?, ?)',
+                (planilha, digest, data_referencia, datetime.now().isoformat(timespec='seconds'))
+            )
+            if cursor.rowcount == 0:
+                return None
+
+            versao_id = cursor.lastrowid
+            con.executemany(
+                'INSERT INTO metricas VALUES (?, ?, ?, ?)',
+                [(versao_id, *linha) for linha in _linhas_metricas(relatorio)]
+            )
+            con.executemany(
+                'INSERT INTO areas (versao_id, unidade, area, nivel, status) VALUES (?, ?, ?, ?, ?)',
+                _sem_repetidas(
+                    [(versao_id, area.unidade or '', area.nome, area.nivel, area.status) for area in relatorio.areas],
+                    3
+                )
+            )
+            con.executemany(
+                'INSERT INTO squads (versao_id, unidade, id_melhoria, squad, status) VALUES (?, ?, ?, ?, ?)',
+                _sem_repetidas(
+                    [(versao_id, *linha) for linha in _linhas_squads(data.get('squads', pd.DataFrame()))],
+                    4
+                )
+            )
+            con.executemany(
+                'INSERT INTO roadmap (versao_id, unidade, id_melhoria, trimestre, entrega, status) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                _sem_repetidas(
+                    [
+                        (versao_id, item.unidade or '', item.id, item.trimestre, item.entrega, item.status)
+                        for item in relatorio.roadmap if item.id is not None
+                    ],
+                    3
+                )
+            )
+
+        return versao_id
+
+    def versoes(self, planilha=None):
+        """
+        Versões registradas, da mais antiga para a mais recente
+
+        Args:
+            planilha: Nome do arquivo (ex.: 'Framework_-_TMMi-TAG.xlsx'); None = todas
+
+        Returns:
+            pd.DataFrame: id, planilha, digest, data_referencia e registrado_em
+        """
+        sql = 'SELECT id, planilha, digest, data_referencia, registrado_em FROM versoes'
+        parametros = ()
+        if planilha is not None:
+            sql += ' WHERE planilha = ?'
+            parametros = (planilha,)
+
+        with self._conectar() as con:
+            return pd.read_sql_query(sql + ' ORDER BY data_referencia, id', con, params=parametros)
+
+    def versao_em(self, data, planilha=None):
+        """
+        Versão vigente em uma data (a última com data de referência até ela)
+
+        Args:
+            data: datetime ou texto ISO (ex.: '2026-01-31')
+            planilha: Nome do arquivo; None = qualquer planilha
+
+        Returns:
+            int | None: Id da versão, ou None se não houver versão até a data
+        """
+        limite = data.isoformat() if isinstance(data, datetime) else f'{data}T23:59:59'[:19]
+
+        sql = 'SELECT id FROM versoes WHERE data_referencia <= ?'
+        parametros = [limite]
+        if planilha is not None:
+            sql += ' AND planilha = ?'
+            parametros.append(planilha)
+
+        with self._conectar() as con:
+            linha = con.execute(sql + ' ORDER BY data_referencia DESC, id DESC LIMIT 1', parametros).fetchone()
+        return linha[0] if linha else None
+
+    def evolucao(self, metrica, escopo='Geral', planilha=None):
+        """
+        Série temporal de uma métrica
+
+        Args:
+            metrica: Nome da métrica (ex.: 'score_5', 'adotado', 'percentual')
+            escopo: 'Geral' ou o nível (ex.: 'Nível 3')
+            planilha: Nome do arquivo; None = todas
+
+        Returns:
+            pd.DataFrame: data_referencia, versao_id e valor, em ordem cronológica
+        """
+        sql = (
+            'SELECT v.data_referencia, v.id AS versao_id, m.valor '
+            'FROM metricas m JOIN versoes v ON v.id = m.versao_id '
+            'WHERE m.escopo = ? AND m.metrica = ?'
+        )
+        parametros = [escopo, metrica]
+        if planilha is not None:
+            sql += ' AND v.planilha = ?'
+            parametros.append(planilha)
+
+        with self._conectar() as con:
+            return pd.read_sql_query(sql + ' ORDER BY v.data_referencia, v.id', con, params=parametros)
+
+    def comparar(self, versao_a, versao_b):
+        """
+        Diferenças entre duas versões registradas
+
+        Args:
+            versao_a: Id da versão de referência (período anterior)
+            versao_b: Id da versão comparada (período posterior)
+
+        Returns:
+            dict: 'metricas' (escopo, metrica, antes, depois, variacao) e, para
+                'areas', 'squads' e 'roadmap', as linhas com status alterado,
+                incluídas (antes vazio) ou removidas (depois vazio); a coluna
+                'unidade' é vazia em planilhas únicas
+        """
+        parametros = {'a': versao_a, 'b': versao_b}
+
+        with self._conectar() as con:
+            resultado = {
+                'metricas': pd.read_sql_query(
+                    'SELECT a.escopo, a.metrica, a.valor AS antes, b.valor AS depois, '
+                    'b.valor - a.valor AS variacao '
+                    'FROM metricas a JOIN metricas b '
+                    'ON b.versao_id = :b AND b.escopo = a.escopo AND b.metrica = a.metrica '
+                    'WHERE a.versao_id = :a',
+                    con, params=parametros
+                )
+            }
+
+            for tabela, chaves in _CHAVES.items():
+                sql = _SQL_DIFERENCAS.format(
+                    tabela=tabela,
+                    chaves_a=', '.join(f'a.{chave}' for chave in chaves),
+                    chaves_b=', '.join(f'b.{chave}' for chave in chaves),
+                    juncao=' AND '.join(f'b.{chave} = a.{chave}' for chave in chaves),
+                )
+                resultado[tabela] = pd.read_sql_query(sql, con, params=parametros)
+
+        return resultado
@@ -0,0 +1,143 @@
+"""
+Índice de facetas do roadmap do Framework TMMi
+Pré-calcula um bitmap por valor de trimestre, squad, nível e status para
+que filtros combinados sejam interseções de bitmaps, sem varrer o roadmap
+"""
+
+import re
+
+import numpy as np
+
+from loader import LINHAS_PRODUTO, SQUAD_COLS
+from status import normalizar_status
+
+
+FACETAS = ('trimestre', 'squad', 'nivel', 'status')
+
+_PADRAO_NIVEL = re.compile(r'\bN([1-5])\b')
+_PADRAO_TODAS = re.compile(r'\btod[ao]s?\b')
+
+
+def _linhas_citadas(trecho):
+    """Linhas de produto citadas em um trecho do texto (em minúsculas)"""
+    return [linha for linha in LINHAS_PRODUTO if linha.lower() in trecho]
+
+
+def _squads_citados(trecho):
+    """
+    Squads citados em um trecho do texto (em minúsculas)
+
+    Vale o squad citado pelo nome; uma linha de produto citada sem nenhum dos
+    seus squads (ex.: 'Cartões + Duplicatas') vale por todos os squads dela.
+    """
+    citados = {squad for squad in SQUAD_COLS if squad.lower() in trecho}
+    for linha in _linhas_citadas(trecho):
+        if not citados.intersection(LINHAS_PRODUTO[linha]):
+            citados.update(LINHAS_PRODUTO[linha])
+    return [squad for squad in SQUAD_COLS if squad in citados]
+
+
+def squads_do_item(texto):
+    """
+    Squads atendidos por uma entrega, a partir do texto da coluna 'Squad'
+
+    Linhas de produto valem pelos seus squads (ver LINHAS_PRODUTO). 'Todas'
+    cobre os squads das linhas citadas junto (ou todos, sem linha citada),
+    menos os citados depois de 'exceto'; nos demais casos valem os squads
+    citados. Sem squad reconhecido, o próprio texto vira o valor da faceta.
+
+    Args:
+        texto: Valor da coluna 'Squad' (ex.: 'Cartões (todas as squads) exceto Plataforma')
+
+    Returns:
+        list: Squads atendidos (ou [texto] se nenhum for reconhecido)
+    """
+    if not texto:
+        return []
+
+    minusculo = texto.lower()
+    incluidos, _, excluidos = minusculo.partition('exceto')
+    excluidos = set(_squads_citados(excluidos))
+
+    if _PADRAO_TODAS.search(incluidos):
+        linhas = _linhas_citadas(incluidos)
+        base = [squad for linha in linhas for squad in LINHAS_PRODUTO[linha]] if linhas else SQUAD_COLS
+    else:
+        base = _squads_citados(incluidos)
+
+    citados = [squad for squad in SQUAD_COLS if squad in base and squad not in excluidos]
+    return citados or [texto]
+
+
+def niveis_do_item(texto):
+    """Níveis TMMi citados no texto 'TMMi (Nível – Área)' (ex.: 'N2 – ...' -> 'Nível 2')"""
+    if not texto:
+        return []
+    return sorted({f'Nível {numero}' for numero in _PADRAO_NIVEL.findall(texto)})
+
+
+def _valores_item(item):
+    status = normalizar_status(item.status)
+    return {
+        'trimestre': [item.trimestre] if item.trimestre else [],
+        'squad': squads_do_item(item.squad),
+        'nivel': niveis_do_item(item.tmmi_area),
+        'status': [status.rotulo if status is not None else item.status] if item.status else [],
+    }
+
+
+class IndiceRoadmap:
+    """Bitmaps por faceta das entregas do roadmap (apenas entregas com ID)"""
+
+    def __init__(self, roadmap):
+        """
+        Constrói o índice
+
+        Args:
+            roadmap: Sequência de ItemRoadmap (ex.: relatorio.roadmap)
+        """
+        self.tamanho = len(roadmap)
+        self._validos = np.array([item.id is not None for item in roadmap], dtype=bool)
+        self._bitmaps = {faceta: {} for faceta in FACETAS}
+
+        for posicao, item in enumerate(roadmap):
+            if item.id is None:
+                continue
+            for faceta, valores in _valores_item(item).items():
+                for valor in valores:
+                    bitmap = self._bitmaps[faceta].get(valor)
+                    if bitmap is None:
+                        bitmap = self._bitmaps[faceta][valor] = np.zeros(self.tamanho, dtype=bool)
+                    bitmap[posicao] = True
+
+    def valores(self, faceta):
+        """Valores disponíveis de uma faceta, ordenados"""
+        return sorted(self._bitmaps[faceta])
+
+    def filtrar(self, **selecoes):
+        """
+        Posições das entregas que atendem aos filtros
+
+        Valores da mesma faceta são combinados com OU; facetas diferentes, com E.
+        Faceta ausente ou vazia não restringe o resultado.
+
+        Args:
+            **selecoes: faceta -> lista de valores (ex.: trimestre=['TRI 1'])
+
+        Returns:
+            np.ndarray: Posições (em relatorio.roadmap) na ordem da planilha
+        """
+        resultado = self._validos.copy()
+
+        for faceta, valores in selecoes.items():
+            if not valores:
+                continue
+
+            bitmaps = self._bitmaps[faceta]
+            selecao = np.zeros(self.tamanho, dtype=bool)
+            for valor in valores:
+                if valor in bitmaps:
+                    selecao |= bitmaps[valor]
+            resultado &= selecao
+
+        return np.flatnonzero(resultado)
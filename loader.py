@@ -0,0 +1,364 @@
+"""
+Carregamento da planilha do Framework TMMi
+Abre o arquivo .xlsx uma única vez e extrai todas as abas usadas
+pelo dashboard e pelo exportador
+"""
+
+import glob
+import hashlib
+import multiprocessing
+import os
+import posixpath
+import warnings
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from xml.etree import ElementTree
+
+import pandas as pd
+
+import snapshot
+from status import CATEGORIAS, status_categorico
+
+
+ARQUIVO_PADRAO = 'Framework_-_TMMi-TAG__1_.xlsx'
+
+# Coluna que identifica a planilha de origem nos dados consolidados
+COLUNA_UNIDADE = 'Unidade'
+
+SQUAD_COLS = ['Ativos', 'Demonstrações', 'Operações', 'Plataforma', 'Interop', 'Negotiation', 'Consent']
+
+# Linhas de produto citadas no roadmap -> squads de cada linha
+LINHAS_PRODUTO = {
+    'Cartões': ['Ativos', 'Demonstrações', 'Operações', 'Plataforma'],
+    'Duplicatas': ['Interop', 'Negotiation', 'Consent'],
+}
+
+# Colunas descritivas da Visão Squads (antes das colunas de cada squad)
+SQUAD_INFO_COLS = ['ID', 'Trimestre', 'Fase', 'Nível e Área', 'Envolvidos']
+
+# Abas conhecidas: chave do dicionário -> alternativas (nome da aba, linha do cabeçalho)
+# A primeira alternativa encontrada no arquivo é usada
+ABAS = {
+    'institucional': [('TMMi - Visão Institucional', 2)],
+    'squads': [('TMMi - Visão Squads', 3)],
+    'roadmap': [('ANUAL - Roadmap por Squads', 0), ('Roadmap Trimestral', 1)],
+    'score': [('Score TMMi', 2)],
+    'mapa': [('Mapa do TMMi', 2)],
+    'criterios': [('Critérios TMMi', 0)],
+}
+
+
+def _normalizar_institucional(df):
+    """Ajusta colunas da Visão Institucional e propaga o nível para as linhas"""
+    df.columns = ['Col0', 'Nível TMMi', 'Área de Processo', 'Status Institucional', 'Observação']
+    df['Nível TMMi'] = df['Nível TMMi'].ffill()
+    df = df[df['Área de Processo'].notna()].drop('Col0', axis=1)
+
+    df['Nível TMMi'] = df['Nível TMMi'].astype('category')
+    df['Status Institucional'] = status_categorico(df['Status Institucional'])
+    return df
+
+
+def _normalizar_squads(df):
+    """Remove colunas vazias e nomeia as colunas descritivas da Visão Squads"""
+    df = df.dropna(axis=1, how='all')
+
+    rename_map = {}
+    for i, col in enumerate(df.columns):
+        if i < len(SQUAD_INFO_COLS) and col not in SQUAD_COLS:
+            rename_map[col] = SQUAD_INFO_COLS[i]
+
+    df = df.rename(columns=rename_map)
+    df = df.dropna(how='all')
+
+    if 'Trimestre' in df.columns:
+        df['Trimestre'] = df['Trimestre'].astype('category')
+    for col in SQUAD_COLS:
+        if col in df.columns:
+            df[col] = status_categorico(df[col])
+    return df
+
+
+def _normalizar_roadmap(df):
+    """Converte trimestre e status do roadmap em categorias"""
+    if 'Trimestre' in df.columns:
+        df['Trimestre'] = df['Trimestre'].astype('category')
+    for col in ['Status Geral', 'Status']:
+        if col in df.columns:
+            df[col] = status_categorico(df[col])
+    return df
+
+
+def _normalizar_tipos_mistos(df):
+    """Converte para texto colunas que misturam números e textos (ex.: SCORE)"""
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+NORMALIZADORES = {
+    'institucional': _normalizar_institucional,
+    'squads': _normalizar_squads,
+    'roadmap': _normalizar_roadmap,
+}
+
+
+def _localizar_aba(sheet_names, chave):
+    """Retorna (nome da aba, cabeçalho) da primeira alternativa presente no arquivo"""
+    for nome, header in ABAS[chave]:
+        if nome in sheet_names:
+            return nome, header
+    return None, None
+
+
+_NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PKG = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# Partes do pacote compartilhadas por todas as abas (textos e formatos de número)
+_PARTES_COMPARTILHADAS = ['xl/sharedStrings.xml', 'xl/styles.xml']
+
+
+def assinaturas_abas(file_path):
+    """
+    Calcula uma assinatura por aba a partir do diretório do zip do .xlsx
+
+    Usa o CRC32 já gravado no pacote para o XML de cada aba, sem descompactar
+    nada além do workbook.xml. Mudanças em partes compartilhadas (textos e
+    estilos) alteram a assinatura de todas as abas.
+
+    Args:
+        file_path: Caminho da planilha .xlsx
+
+    Returns:
+        dict: Chave da aba -> assinatura (None se a aba não existir)
+    """
+    with zipfile.ZipFile(file_path) as pacote:
+        infos = {info.filename: info for info in pacote.infolist()}
+
+        workbook = ElementTree.fromstring(pacote.read('xl/workbook.xml'))
+        rels = ElementTree.fromstring(pacote.read('xl/_rels/workbook.xml.rels'))
+
+    alvos = {}
+    for rel in rels.iter(f'{_NS_PKG}Relationship'):
+        alvo = rel.get('Target')
+        alvos[rel.get('Id')] = alvo.lstrip('/') if alvo.startswith('/') else posixpath.join('xl', alvo)
+
+    partes_abas = {
+        aba.get('name'): alvos.get(aba.get(f'{_NS_REL}id'))
+        for aba in workbook.iter(f'{_NS_MAIN}sheet')
+    }
+
+    compartilhadas = tuple(
+        (infos[parte].CRC, infos[parte].file_size) if parte in infos else None
+        for parte in _PARTES_COMPARTILHADAS
+    )
+
+    assinaturas = {}
+    for chave in ABAS:
+        nome, header = _localizar_aba(partes_abas, chave)
+        info = infos.get(partes_abas.get(nome))
+        if info is None:
+            assinaturas[chave] = None
+        else:
+            assinaturas[chave] = (nome, header, info.CRC, info.file_size, compartilhadas)
+
+    return assinaturas
+
+
+def _ler_planilha(file_path, chaves):
+    """Lê do .xlsx as abas pedidas, abrindo o arquivo uma única vez"""
+    data = {chave: pd.DataFrame() for chave in ABAS}
+
+    with warnings.catch_warnings():
+        # openpyxl avisa sobre extensões do Excel que não interpreta (validações, etc.)
+        warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
+
+        with pd.ExcelFile(file_path, engine='openpyxl') as xls:
+            for chave in ABAS:
+                if chave not in chaves:
+                    continue
+
+                nome, header = _localizar_aba(xls.sheet_names, chave)
+                if nome is None:
+                    continue
+
+                df = xls.parse(nome, header=header)
+                normalizar = NORMALIZADORES.get(chave)
+                df = normalizar(df) if normalizar else df
+                data[chave] = _normalizar_tipos_mistos(df)
+
+    return data
+
+
+def load_workbook_data(file_path=ARQUIVO_PADRAO, chaves=None, usar_snapshot=True):
+    """
+    Carrega todas as abas do framework abrindo o arquivo uma única vez
+
+    O arquivo é aberto em modo somente leitura (streaming) e cada aba é
+    percorrida uma vez. Abas ausentes viram DataFrames vazios, mantendo o
+    formato esperado pelo TMMiExporter.
+
+    Com snapshot habilitado, a primeira leitura grava todas as abas em formato
+    colunar (Arrow IPC) identificado pelo hash do arquivo; as leituras seguintes
+    mapeiam esse snapshot em memória e só voltam ao .xlsx quando o hash muda.
+
+    Args:
+        file_path: Caminho da planilha .xlsx
+        chaves: Lista de chaves a carregar (padrão: todas as abas conhecidas).
+            As demais chaves são devolvidas como DataFrames vazios.
+        usar_snapshot: Se True, usa/gera o snapshot colunar da planilha
+
+    Returns:
+        dict: Dicionário chave -> DataFrame
+    """
+    chaves = set(ABAS) if chaves is None else set(chaves)
+
+    if not usar_snapshot:
+        return _ler_planilha(file_path, chaves)
+
+    digest = snapshot.hash_arquivo(file_path)
+    carregado = snapshot.ler_snapshot(file_path, digest, chaves)
+
+    if carregado is None:
+        # Primeira leitura desta versão: converte a planilha inteira
+        carregado = _ler_planilha(file_path, set(ABAS))
+        snapshot.salvar_snapshot(file_path, digest, carregado)
+
+    return {chave: carregado[chave] if chave in chaves else pd.DataFrame() for chave in ABAS}
+
+
+def eh_consolidado(origem):
+    """True se a origem for um diretório ou padrão glob (uma planilha por unidade)"""
+    return os.path.isdir(origem) or glob.has_magic(str(origem))
+
+
+def listar_planilhas(origem):
+    """
+    Planilhas de uma origem, em ordem alfabética
+
+    Args:
+        origem: Arquivo .xlsx, diretório com planilhas ou padrão glob
+            (ex.: 'unidades/*.xlsx')
+
+    Returns:
+        list: Caminhos das planilhas (arquivos temporários '~$' do Excel são ignorados)
+    """
+    if not eh_consolidado(origem):
+        return [origem]
+
+    padrao = os.path.join(origem, '*.xlsx') if os.path.isdir(origem) else origem
+    return sorted(
+        caminho for caminho in glob.glob(padrao)
+        if not os.path.basename(caminho).startswith('~$')
+    )
+
+
+def nome_unidade(file_path):
+    """Nome da unidade de uma planilha (nome do arquivo sem extensão)"""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def hash_consolidado(arquivos):
+    """Hash do conjunto de planilhas (unidade e hash do conteúdo de cada arquivo)"""
+    digest = hashlib.sha256()
+    for arquivo in arquivos:
+        digest.update(f'{nome_unidade(arquivo)}:{snapshot.hash_arquivo(arquivo)}\n'.encode())
+    return digest.hexdigest()
+
+
+def _concatenar(partes):
+    """Concatena as abas das unidades, recriando as colunas categóricas"""
+    if not partes:
+        return pd.DataFrame()
+
+    categoricas = {}
+    for parte in partes:
+        for col in parte.columns:
+            if isinstance(parte[col].dtype, pd.CategoricalDtype) and col not in categoricas:
+                categoricas[col] = list(parte[col].cat.categories[:len(CATEGORIAS)]) == CATEGORIAS
+
+    df = pd.concat(partes, ignore_index=True)
+    for col, eh_status in categoricas.items():
+        df[col] = status_categorico(df[col].astype(object)) if eh_status else df[col].astype('category')
+
+    return _normalizar_tipos_mistos(df)
+
+
+def consolidar(por_arquivo):
+    """
+    Junta os dados de várias planilhas em um único dicionário
+
+    Args:
+        por_arquivo: Caminho da planilha -> dicionário de DataFrames (formato do loader)
+
+    Returns:
+        dict: Chave da aba -> DataFrame com a coluna 'Unidade' na primeira posição
+    """
+    unidades = [nome_unidade(arquivo) for arquivo in por_arquivo]
+
+    consolidado = {}
+    for chave in ABAS:
+        partes = []
+        for arquivo, data in por_arquivo.items():
+            df = data.get(chave, pd.DataFrame())
+            if df.empty:
+                continue
+            df = df.copy(deep=False)
+            df.insert(0, COLUNA_UNIDADE, nome_unidade(arquivo))
+            partes.append(df)
+
+        df = _concatenar(partes)
+        if not df.empty:
+            df[COLUNA_UNIDADE] = pd.Categorical(df[COLUNA_UNIDADE], categories=unidades)
+        consolidado[chave] = df
+    return consolidado
+
+
+def load_workbooks_data(origem, chaves=None, max_workers=None):
+    """
+    Carrega e consolida as planilhas de várias unidades
+
+    Cada planilha tem seu próprio snapshot colunar: as que já foram lidas são
+    mapeadas do disco e só as novas ou alteradas passam pelo openpyxl, em
+    processos paralelos (a leitura do .xlsx é limitada pela CPU e pelo GIL).
+
+    Args:
+        origem: Diretório com as planilhas ou padrão glob (ex.: 'unidades/*.xlsx')
+        chaves: Lista de chaves a carregar (padrão: todas as abas conhecidas)
+        max_workers: Limite de processos (padrão: um por planilha, até o número de CPUs)
+
+    Returns:
+        dict: Dicionário chave -> DataFrame, com a coluna 'Unidade'
+
+    Raises:
+        FileNotFoundError: Se a origem não tiver nenhuma planilha
+    """
+    arquivos = listar_planilhas(origem)
+    if not arquivos:
+        raise FileNotFoundError(f'Nenhuma planilha .xlsx encontrada em {origem}')
+
+    chaves = set(ABAS) if chaves is None else set(chaves)
+
+    por_arquivo = {}
+    pendentes = []
+    for arquivo in arquivos:
+        data = snapshot.ler_snapshot(arquivo, snapshot.hash_arquivo(arquivo), chaves)
+        if data is None:
+            pendentes.append(arquivo)
+        else:
+            por_arquivo[arquivo] = data
+
+    if len(pendentes) == 1:
+        por_arquivo[pendentes[0]] = load_workbook_data(pendentes[0], chaves)
+    elif pendentes:
+        processos = min(len(pendentes), max_workers or os.cpu_count() or 1)
+        # spawn: o fork de um processo com threads (servidor do Streamlit) pode travar
+        with ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context('spawn')) as pool:
+            lidos = pool.map(load_workbook_data, pendentes, repeat(chaves))
+            por_arquivo.update(zip(pendentes, lidos))
+
+    consolidado = consolidar({arquivo: por_arquivo[arquivo] for arquivo in arquivos})
+    return {chave: consolidado[chave] if chave in chaves else pd.DataFrame() for chave in ABAS}
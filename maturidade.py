@@ -0,0 +1,128 @@
+"""
+Motor de maturidade do Framework TMMi
+Calcula contagens por nível e status, percentuais e scores em uma única
+passada sobre a Visão Institucional
+"""
+
+import numpy as np
+import pandas as pd
+
+from status import Status, status_categorico
+
+
+NIVEIS = ['Nível 2', 'Nível 3', 'Nível 4', 'Nível 5']
+
+# Status institucional -> chave usada nas métricas
+STATUS_CHAVES = {
+    Status.ADOTADO: 'adotado',
+    Status.EM_ADOCAO: 'em_adocao',
+    Status.DESENVOLVENDO: 'desenvolvendo',
+    Status.NAO_INICIADO: 'nao_iniciado',
+}
+
+CONTAGENS = list(STATUS_CHAVES.values()) + ['total']
+
+# Pesos do score de 3 pontos
+PESOS = {
+    'adotado': 3,
+    'em_adocao': 2,
+    'desenvolvendo': 1.5,
+    'nao_iniciado': 0,
+}
+
+
+class Maturidade:
+    """Resultado do motor: matriz nível x status e métricas gerais"""
+
+    def __init__(self, matriz, geral):
+        self.matriz = matriz
+        self.geral = geral
+
+    def nivel(self, nivel):
+        """
+        Métricas de um nível
+
+        Args:
+            nivel: Rótulo do nível (ex.: 'Nível 2')
+
+        Returns:
+            dict: Contagens por status, total, percentual adotado e scores
+        """
+        if nivel not in self.matriz.index:
+            return dict.fromkeys(self.matriz.columns, 0)
+
+        linha = self.matriz.loc[nivel]
+        return {
+            coluna: int(valor) if coluna in CONTAGENS else float(valor)
+            for coluna, valor in linha.items()
+        }
+
+
+def _pontos(contagens):
+    """Soma ponderada dos status (aceita dict de contagens ou a matriz inteira)"""
+    return sum(contagens[chave] * peso for chave, peso in PESOS.items())
+
+
+def metricas_gerais(contagens, total):
+    """
+    Métricas gerais a partir das contagens por status
+
+    Args:
+        contagens: Chave do status -> quantidade de áreas (somada entre os níveis)
+        total: Quantidade de áreas da Visão Institucional
+
+    Returns:
+        dict: Contagens por status, total e scores de 3 e 5 pontos
+    """
+    geral = {chave: int(contagens[chave]) for chave in STATUS_CHAVES.values()}
+    geral['total'] = total
+    geral['score_3'] = _pontos(geral) / total if total > 0 else 0
+    geral['score_5'] = geral['score_3'] / 3 * 5
+    return geral
+
+
+def calcular_maturidade(df_inst):
+    """
+    Calcula a maturidade completa da Visão Institucional
+
+    Os códigos inteiros das categorias de nível e status são combinados em
+    uma única contagem (bincount) que alimenta todos os níveis, percentuais e
+    scores; os totais gerais saem da soma da matriz, sem novos filtros.
+
+    Args:
+        df_inst: DataFrame da Visão Institucional
+
+    Returns:
+        Maturidade: Matriz por nível e métricas gerais
+    """
+    niveis = df_inst['Nível TMMi'].astype('category')
+    status = status_categorico(df_inst['Status Institucional'])
+
+    # Coluna 0 da contagem recebe status vazio (código -1): conta no total do nível
+    largura = len(status.cat.categories) + 1
+    codigos_nivel = niveis.cat.codes.to_numpy()
+    validos = codigos_nivel >= 0
+    combinados = codigos_nivel[validos] * largura + status.cat.codes.to_numpy()[validos] + 1
+
+    contagens = np.bincount(combinados, minlength=len(niveis.cat.categories) * largura)
+    contagens = contagens.reshape(-1, largura)
+
+    tabela = pd.DataFrame(contagens, index=niveis.cat.categories.astype(str))
+    ordem = NIVEIS + [nivel for nivel in tabela.index if nivel not in NIVEIS]
+    tabela = tabela.reindex(index=ordem, fill_value=0)
+
+    matriz = pd.DataFrame(
+        {chave: tabela[int(codigo) + 1] for codigo, chave in STATUS_CHAVES.items()},
+        index=tabela.index,
+    )
+    matriz['total'] = tabela.sum(axis=1)
+    matriz['percentual'] = (matriz['adotado'] / matriz['total'] * 100).where(matriz['total'] > 0, 0)
+    matriz['score_3'] = (_pontos(matriz) / matriz['total']).where(matriz['total'] > 0, 0)
+    matriz['score_5'] = matriz['score_3'] / 3 * 5
+
+    geral = metricas_gerais(
+        {chave: matriz[chave].sum() for chave in STATUS_CHAVES.values()},
+        len(df_inst)
+    )
+
+    return Maturidade(matriz, geral)
@@ -0,0 +1,374 @@
+"""
+Modelo tipado do relatório do Framework TMMi
+Os dados da planilha são percorridos uma única vez para montar um modelo
+imutável, usado tanto pelo dashboard quanto pelos exportadores PDF e PPT
+"""
+
+from dataclasses import dataclass, replace
+
+import pandas as pd
+
+from diferencas import CHAVES_ABAS, chaves_linhas
+from indice import squads_do_item
+from loader import COLUNA_UNIDADE, SQUAD_COLS
+from maturidade import NIVEIS, STATUS_CHAVES, calcular_maturidade, metricas_gerais
+
+
+@dataclass(frozen=True, slots=True)
+class Score:
+    """Métricas gerais da Visão Institucional"""
+    total: int
+    adotado: int
+    em_adocao: int
+    desenvolvendo: int
+    nao_iniciado: int
+    score_3: float
+    score_5: float
+
+
+@dataclass(frozen=True, slots=True)
+class Nivel:
+    """Contagens e score de um nível TMMi"""
+    nome: str
+    total: int
+    adotado: int
+    em_adocao: int
+    desenvolvendo: int
+    nao_iniciado: int
+    percentual: float
+    score_3: float
+    score_5: float
+
+
+def com_unidade(texto, unidade):
+    """Texto prefixado pela unidade em dados consolidados ('Unidade · texto')"""
+    return f'{unidade} · {texto}' if unidade and texto else texto
+
+
+@dataclass(frozen=True, slots=True)
+class Area:
+    """Área de processo da Visão Institucional (unidade só em dados consolidados)"""
+    nivel: str
+    nome: str
+    status: str
+    observacao: str | None
+    unidade: str | None = None
+
+    @property
+    def rotulo(self):
+        """Nome da área, prefixado pela unidade quando houver"""
+        return com_unidade(self.nome, self.unidade)
+
+
+@dataclass(frozen=True, slots=True)
+class Squad:
+    """Quantidade de melhorias por status em um squad"""
+    nome: str
+    status: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class ItemRoadmap:
+    """Entrega do roadmap (unidade só em dados consolidados)"""
+    id: str | None
+    trimestre: str | None
+    fase: str | None
+    squad: str | None
+    entrega: str | None
+    tmmi_area: str | None
+    status: str | None
+    responsavel: str | None
+    unidade: str | None = None
+
+    @property
+    def rotulo(self):
+        """ID da entrega, prefixado pela unidade quando houver"""
+        return com_unidade(self.id, self.unidade)
+
+
+@dataclass(frozen=True, slots=True)
+class AreaMapa:
+    """Descrição de uma área no Mapa do TMMi"""
+    nivel: str
+    area: str
+    descricao: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class Relatorio:
+    """Modelo completo consumido pelas páginas e pelos exportadores"""
+    score: Score
+    niveis: tuple
+    areas: tuple
+    squads: tuple
+    roadmap: tuple
+    mapa: tuple
+
+    def nivel(self, nome):
+        """Retorna o Nivel pelo nome (ex.: 'Nível 2') ou None"""
+        for nivel in self.niveis:
+            if nivel.nome == nome:
+                return nivel
+        return None
+
+    def areas_do_nivel(self, nome):
+        """Áreas de processo de um nível, na ordem da planilha"""
+        return tuple(area for area in self.areas if area.nivel == nome)
+
+
+def _texto(valor):
+    """Converte o valor da célula para texto (None quando vazio)"""
+    return None if pd.isna(valor) else str(valor)
+
+
+def _coluna(df, *nomes):
+    """Valores da primeira coluna existente entre os nomes (ou None por linha)"""
+    for nome in nomes:
+        if nome in df.columns:
+            return [_texto(valor) for valor in df[nome].to_numpy()]
+    return [None] * len(df)
+
+
+def _montar_niveis(maturidade):
+    return tuple(Nivel(nome, **maturidade.nivel(nome)) for nome in maturidade.matriz.index)
+
+
+def _montar_areas(df_inst):
+    if df_inst.empty:
+        return ()
+    colunas = [
+        _coluna(df_inst, nome)
+        for nome in ['Nível TMMi', 'Área de Processo', 'Status Institucional', 'Observação', COLUNA_UNIDADE]
+    ]
+    return tuple(Area(*valores) for valores in zip(*colunas) if valores[1] is not None)
+
+
+def _montar_squads(df_squads):
+    cols = [col for col in SQUAD_COLS if col in df_squads.columns]
+    if not cols:
+        return ()
+
+    contagens = (
+        df_squads[cols]
+        .melt(var_name='squad', value_name='status')
+        .dropna()
+        .groupby(['squad', 'status'], sort=True, observed=True)
+        .size()
+    )
+
+    por_squad = {nome: [] for nome in cols}
+    for (nome, status), qtd in contagens.items():
+        por_squad[nome].append((str(status), int(qtd)))
+
+    return tuple(Squad(nome, tuple(status)) for nome, status in por_squad.items())
+
+
+def _montar_roadmap(df_roadmap):
+    colunas = [
+        _coluna(df_roadmap, 'ID Melhoria'),
+        _coluna(df_roadmap, 'Trimestre'),
+        _coluna(df_roadmap, 'Fase'),
+        _coluna(df_roadmap, 'Squad'),
+        _coluna(df_roadmap, 'Entrega'),
+        _coluna(df_roadmap, 'TMMi (Nível – Área)'),
+        _coluna(df_roadmap, 'Status Geral', 'Status'),
+        _coluna(df_roadmap, 'Responsável'),
+        _coluna(df_roadmap, COLUNA_UNIDADE),
+    ]
+    return tuple(ItemRoadmap(*valores) for valores in zip(*colunas))
+
+
+def _montar_mapa(df_mapa):
+    if 'Nível' not in df_mapa.columns:
+        return ()
+    colunas = [_coluna(df_mapa, nome) for nome in ['Nível', 'Área de Processo', 'Descrição']]
+    return tuple(
+        AreaMapa(*valores) for valores in zip(*colunas)
+        if valores[0] is not None and valores[1] is not None
+    )
+
+
+def _montar_institucional(df_inst):
+    """Score, níveis e áreas da Visão Institucional (níveis zerados se a aba estiver vazia)"""
+    if df_inst.empty:
+        return Score(0, 0, 0, 0, 0, 0, 0), tuple(Nivel(nome, 0, 0, 0, 0, 0, 0, 0, 0) for nome in NIVEIS), ()
+
+    maturidade = calcular_maturidade(df_inst)
+    return Score(**maturidade.geral), _montar_niveis(maturidade), _montar_areas(df_inst)
+
+
+def montar_relatorio(data):
+    """
+    Monta o modelo do relatório a partir do dicionário de DataFrames
+
+    Args:
+        data: Dicionário com os dataframes carregados (formato do loader)
+
+    Returns:
+        Relatorio: Modelo imutável com níveis, áreas, squads, roadmap e score
+    """
+    score, niveis, areas = _montar_institucional(data.get('institucional', pd.DataFrame()))
+
+    return Relatorio(
+        score=score,
+        niveis=niveis,
+        areas=areas,
+        squads=_montar_squads(data.get('squads', pd.DataFrame())),
+        roadmap=_montar_roadmap(data.get('roadmap', pd.DataFrame())),
+        mapa=_montar_mapa(data.get('mapa', pd.DataFrame())),
+    )
+
+
+def _areas_por_nivel(areas):
+    """Nível -> áreas do nível, na ordem da planilha"""
+    por_nivel = {}
+    for area in areas:
+        por_nivel.setdefault(area.nivel, []).append(area)
+    return por_nivel
+
+
+def _atualizar_institucional(anterior, df_inst):
+    """Recalcula só os níveis cujas áreas foram incluídas, removidas ou alteradas"""
+    areas = _montar_areas(df_inst)
+
+    # Linhas sem área contam no score, mas não aparecem no modelo: recalcula tudo
+    if len(areas) != len(df_inst) or len(anterior.areas) != anterior.score.total:
+        return _montar_institucional(df_inst)
+
+    antes, depois = _areas_por_nivel(anterior.areas), _areas_por_nivel(areas)
+    afetados = {nivel for nivel in antes.keys() | depois.keys() if antes.get(nivel) != depois.get(nivel)}
+
+    subconjunto = df_inst[df_inst['Nível TMMi'].astype(object).isin(afetados).to_numpy()]
+    recalculados = {
+        nivel.nome: nivel
+        for nivel in _montar_niveis(calcular_maturidade(subconjunto))
+        if nivel.nome in afetados
+    }
+
+    niveis = []
+    for nivel in anterior.niveis:
+        if nivel.nome not in afetados:
+            niveis.append(nivel)
+        elif nivel.nome in recalculados:
+            niveis.append(recalculados.pop(nivel.nome))
+    niveis = tuple(niveis) + tuple(recalculados.values())
+
+    contagens = {chave: sum(getattr(nivel, chave) for nivel in niveis) for chave in STATUS_CHAVES.values()}
+    score = Score(**metricas_gerais(contagens, len(df_inst)))
+
+    return score, niveis, areas
+
+
+def _atualizar_squads(anterior, df_squads, mudancas):
+    """Recalcula só as colunas de squad alteradas (todas, se houve linhas incluídas ou removidas)"""
+    cols = [col for col in SQUAD_COLS if col in df_squads.columns]
+    anteriores = {squad.nome: squad for squad in anterior.squads}
+
+    if mudancas.incluidas or mudancas.removidas:
+        afetadas = set(cols)
+    else:
+        afetadas = (mudancas.colunas() | set(cols) - set(anteriores)) & set(cols)
+
+    recalculados = {
+        squad.nome: squad
+        for squad in _montar_squads(df_squads[[col for col in cols if col in afetadas]])
+    }
+    return tuple(recalculados.get(nome) or anteriores[nome] for nome in cols)
+
+
+def _atualizar_roadmap(anterior, df_roadmap, mudancas):
+    """Monta só as entregas incluídas ou alteradas; as demais são reaproveitadas do relatório anterior"""
+    coluna = CHAVES_ABAS['roadmap']
+    antes = pd.DataFrame({coluna: [item.id for item in anterior.roadmap]}, dtype=object)
+    if any(item.unidade is not None for item in anterior.roadmap):
+        antes[COLUNA_UNIDADE] = [item.unidade for item in anterior.roadmap]
+    anteriores = dict(zip(chaves_linhas(antes, coluna), anterior.roadmap))
+
+    chaves = chaves_linhas(df_roadmap, coluna).tolist()
+    afetadas = set(mudancas.incluidas) | {chave for chave, _ in mudancas.alteradas}
+    posicoes = [posicao for posicao, chave in enumerate(chaves) if chave in afetadas or chave not in anteriores]
+    montados = dict(zip(posicoes, _montar_roadmap(df_roadmap.iloc[posicoes])))
+
+    return tuple(montados.get(posicao) or anteriores[chave] for posicao, chave in enumerate(chaves))
+
+
+def atualizar_relatorio(anterior, data, mudancas):
+    """
+    Monta o relatório de uma nova carga reaproveitando o relatório anterior
+
+    Só são recalculados os níveis, as colunas de squad e as entregas do
+    roadmap afetados pelas mudanças; o restante é reaproveitado do relatório
+    anterior. Abas sem comparação possível (mudança None) são montadas por
+    completo.
+
+    Args:
+        anterior: Relatorio da carga anterior
+        data: Dicionário com os dataframes da carga atual (formato do loader)
+        mudancas: Aba -> MudancasAba entre as duas cargas (ver diferencas.comparar_dados)
+
+    Returns:
+        Relatorio: Modelo equivalente a montar_relatorio(data)
+    """
+    df_inst = data.get('institucional', pd.DataFrame())
+    df_squads = data.get('squads', pd.DataFrame())
+    df_roadmap = data.get('roadmap', pd.DataFrame())
+
+    # Em dados consolidados as áreas se repetem entre unidades: recalcula tudo
+    institucional = mudancas.get('institucional')
+    if institucional is None or df_inst.empty or not anterior.niveis or COLUNA_UNIDADE in df_inst.columns:
+        score, niveis, areas = _montar_institucional(df_inst)
+    elif institucional.vazia:
+        score, niveis, areas = anterior.score, anterior.niveis, anterior.areas
+    else:
+        score, niveis, areas = _atualizar_institucional(anterior, df_inst)
+
+    squads = mudancas.get('squads')
+    if squads is None:
+        squads = _montar_squads(df_squads)
+    elif squads.vazia:
+        squads = anterior.squads
+    else:
+        squads = _atualizar_squads(anterior, df_squads, squads)
+
+    roadmap = mudancas.get('roadmap')
+    if roadmap is None:
+        roadmap = _montar_roadmap(df_roadmap)
+    elif roadmap.vazia:
+        roadmap = anterior.roadmap
+    else:
+        roadmap = _atualizar_roadmap(anterior, df_roadmap, roadmap)
+
+    return Relatorio(
+        score=score,
+        niveis=niveis,
+        areas=areas,
+        squads=squads,
+        roadmap=roadmap,
+        mapa=_montar_mapa(data.get('mapa', pd.DataFrame())),
+    )
+
+
+def relatorio_do_squad(relatorio, squad):
+    """
+    Recorte do relatório para um squad
+
+    Mantém a visão institucional (da organização) e restringe o roadmap às
+    entregas que atendem o squad e a visão de squads ao próprio squad.
+
+    Args:
+        relatorio: Relatorio da organização
+        squad: Nome do squad (ex.: 'Ativos')
+
+    Returns:
+        Relatorio: Relatório do squad
+    """
+    return replace(
+        relatorio,
+        squads=tuple(item for item in relatorio.squads if item.nome == squad),
+        roadmap=tuple(item for item in relatorio.roadmap if squad in squads_do_item(item.squad)),
+    )
+
+
+def relatorio_do_trimestre(relatorio, trimestre):
+    """Recorte do relatório com as entregas do roadmap de um trimestre (ex.: 'TRI 1')"""
+    return replace(relatorio, roadmap=tuple(item for item in relatorio.roadmap if item.trimestre == trimestre))
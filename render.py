@@ -0,0 +1,146 @@
+"""
+Templates HTML do dashboard do Framework TMMi
+Gera de uma vez o bloco de cards de cada nível e de cada trimestre, para
+que cada bloco seja enviado ao navegador em um único elemento
+"""
+
+from functools import lru_cache
+from html import escape
+from string import Template
+
+from status import Status, normalizar_status
+
+
+CLASSES_STATUS = {
+    Status.ADOTADO: 'status-adotado',
+    Status.DESENVOLVENDO: 'status-desenvolvendo',
+    Status.EM_ADOCAO: 'status-em-adocao',
+}
+
+EMOJIS_STATUS = {
+    Status.ADOTADO: '✅',
+    Status.DESENVOLVENDO: '🔄',
+    Status.EM_ADOCAO: '📊',
+}
+
+# Sem indentação: o Markdown trataria linhas recuadas como bloco de código
+TEMPLATE_NIVEL = Template(
+    '<div class="nivel-header">$nivel - $adotado/$total adotadas ($percentual%)</div>'
+)
+
+TEMPLATE_AREA = Template(
+    '<div class="area-box">'
+    '<strong>$emoji $area</strong>'
+    '<span class="$classe" style="float: right;">$status</span>'
+    '<br/>'
+    '<small style="color: #666; margin-top: 0.5rem; display: block;">$observacao</small>'
+    '</div>'
+)
+
+TEMPLATE_ITEM_ROADMAP = Template(
+    '<div class="area-box">'
+    '<strong>$id</strong>: $entrega'
+    '<span class="$classe" style="float: right;">$status</span>'
+    '<br/>'
+    '<small style="color: #666;"><strong>TMMi:</strong> $tmmi_area</small><br/>'
+    '<small style="color: #666;"><strong>Responsável:</strong> $responsavel</small>'
+    '</div>'
+)
+
+
+def _classe(status):
+    return CLASSES_STATUS.get(normalizar_status(status), 'status-nao-iniciado')
+
+
+def _emoji(status):
+    return EMOJIS_STATUS.get(normalizar_status(status), '⏸️')
+
+
+# Área e entrega são imutáveis: entre versões da planilha, só os cards das
+# linhas alteradas são gerados de novo
+@lru_cache(maxsize=1024)
+def html_area(area):
+    """Card de uma área de processo"""
+    return TEMPLATE_AREA.substitute(
+        emoji=_emoji(area.status),
+        area=escape(area.rotulo),
+        classe=_classe(area.status),
+        status=escape(area.status or ''),
+        observacao=escape(area.observacao or 'N/A'),
+    )
+
+
+@lru_cache(maxsize=1024)
+def html_item_roadmap(item):
+    """Card de uma entrega do roadmap"""
+    status = item.status or 'Planejado'
+    return TEMPLATE_ITEM_ROADMAP.substitute(
+        id=escape(item.rotulo or 'N/A'),
+        entrega=escape(item.entrega or 'N/A'),
+        classe=_classe(status),
+        status=escape(status),
+        tmmi_area=escape(item.tmmi_area or 'N/A'),
+        responsavel=escape(item.responsavel or 'N/A'),
+    )
+
+
+def blocos_niveis(relatorio, niveis):
+    """
+    Bloco HTML (cabeçalho + cards) de cada nível com áreas
+
+    Args:
+        relatorio: Relatorio do framework
+        niveis: Níveis na ordem de exibição
+
+    Returns:
+        dict: Nível -> HTML do bloco
+    """
+    blocos = {}
+    for nome in niveis:
+        nivel = relatorio.nivel(nome)
+        if nivel is None or nivel.total == 0:
+            continue
+
+        cabecalho = TEMPLATE_NIVEL.substitute(
+            nivel=escape(nome),
+            adotado=nivel.adotado,
+            total=nivel.total,
+            percentual=f'{nivel.percentual:.0f}',
+        )
+        cards = ''.join(html_area(area) for area in relatorio.areas_do_nivel(nome))
+        blocos[nome] = cabecalho + cards
+
+    return blocos
+
+
+def cards_roadmap(relatorio):
+    """
+    Card HTML de cada entrega do roadmap, alinhado a relatorio.roadmap
+
+    Entregas sem ID recebem texto vazio (não são exibidas).
+    """
+    return tuple(
+        html_item_roadmap(item) if item.id is not None else ''
+        for item in relatorio.roadmap
+    )
+
+
+def blocos_roadmap(relatorio, cards=None):
+    """
+    Bloco HTML de cada trimestre do roadmap
+
+    Args:
+        relatorio: Relatorio do framework
+        cards: Cards já gerados por cards_roadmap (opcional)
+
+    Returns:
+        dict: Trimestre -> HTML com todos os cards do trimestre, na ordem da planilha
+    """
+    cards = cards_roadmap(relatorio) if cards is None else cards
+
+    blocos = {}
+    for item, card in zip(relatorio.roadmap, cards):
+        if card:
+            blocos.setdefault(item.trimestre or '', []).append(card)
+
+    return {trimestre: ''.join(partes) for trimestre, partes in blocos.items()}
@@ -0,0 +1,126 @@
+"""
+Snapshot colunar da planilha do Framework TMMi
+Guarda cada aba já normalizada em arquivos Arrow IPC, identificados pelo
+hash do conteúdo da planilha, para evitar reprocessar o .xlsx a cada carga
+"""
+
+import hashlib
+import os
+import shutil
+
+import numpy as np
+import pyarrow as pa
+
+
+DIRETORIO_CACHE = '.tmmi_cache'
+
+# Incrementar quando a normalização das abas mudar, invalidando snapshots antigos
+VERSAO_FORMATO = 2
+
+# Quantidade de versões da mesma planilha mantidas em disco
+MAX_SNAPSHOTS = 3
+
+
+def hash_arquivo(file_path, tamanho_bloco=1 << 20):
+    """
+    Calcula o hash SHA-256 do conteúdo do arquivo
+
+    Args:
+        file_path: Caminho do arquivo
+        tamanho_bloco: Tamanho de cada leitura em bytes
+
+    Returns:
+        str: Hash em hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+def _diretorio_planilha(file_path):
+    """Diretório dos snapshots de uma planilha (ao lado do próprio arquivo)"""
+    base = os.path.dirname(os.path.abspath(file_path))
+    nome = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(base, DIRETORIO_CACHE, nome)
+
+
+def ler_snapshot(file_path, digest, chaves):
+    """
+    Lê as abas de um snapshot existente usando memory-map
+
+    Args:
+        file_path: Caminho da planilha de origem
+        digest: Hash do conteúdo da planilha
+        chaves: Chaves das abas a ler
+
+    Returns:
+        dict | None: Dicionário chave -> DataFrame, ou None se o snapshot não existir
+    """
+    pasta = os.path.join(_diretorio_planilha(file_path), f'{digest}.v{VERSAO_FORMATO}')
+    if not os.path.isdir(pasta):
+        return None
+
+    data = {}
+    try:
+        for chave in chaves:
+            with pa.memory_map(os.path.join(pasta, f'{chave}.arrow'), 'r') as source:
+                data[chave] = _restaurar_nulos(pa.ipc.open_file(source).read_all().to_pandas())
+    except (OSError, pa.ArrowInvalid):
+        # Snapshot incompleto ou corrompido: volta para o .xlsx
+        return None
+
+    return data
+
+
+def _restaurar_nulos(df):
+    """Arrow devolve None em colunas de texto; o .xlsx original usa NaN"""
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+def salvar_snapshot(file_path, digest, data):
+    """
+    Grava todas as abas em um novo snapshot
+
+    A gravação é feita em uma pasta temporária renomeada ao final, para que
+    leitores concorrentes nunca vejam um snapshot pela metade. Falhas de
+    escrita (ex.: disco somente leitura) são ignoradas.
+
+    Args:
+        file_path: Caminho da planilha de origem
+        digest: Hash do conteúdo da planilha
+        data: Dicionário chave -> DataFrame
+    """
+    raiz = _diretorio_planilha(file_path)
+    destino = os.path.join(raiz, f'{digest}.v{VERSAO_FORMATO}')
+    temporario = f'{destino}.tmp-{os.getpid()}'
+
+    try:
+        os.makedirs(temporario, exist_ok=True)
+        for chave, df in data.items():
+            table = pa.Table.from_pandas(df)
+            with pa.OSFile(os.path.join(temporario, f'{chave}.arrow'), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        os.replace(temporario, destino)
+    except (OSError, pa.ArrowException):
+        shutil.rmtree(temporario, ignore_errors=True)
+        return
+
+    _remover_antigos(raiz)
+
+
+def _remover_antigos(raiz):
+    """Mantém apenas os MAX_SNAPSHOTS snapshots mais recentes da planilha"""
+    pastas = [
+        os.path.join(raiz, nome) for nome in os.listdir(raiz)
+        if '.tmp-' not in nome
+    ]
+    pastas.sort(key=os.path.getmtime, reverse=True)
+
+    for pasta in pastas[MAX_SNAPSHOTS:]:
+        shutil.rmtree(pasta, ignore_errors=True)
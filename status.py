@@ -0,0 +1,131 @@
+"""
+Status canônicos do Framework TMMi
+Normaliza as variações de escrita da planilha (caixa, acentos, gênero)
+e converte as colunas de status em categorias do pandas
+"""
+
+import unicodedata
+from enum import IntEnum
+
+import numpy as np
+import pandas as pd
+
+
+class Status(IntEnum):
+    """Status canônico; o valor é o código da categoria no pandas"""
+    NAO_INICIADO = 0
+    PLANEJADO = 1
+    DESENVOLVENDO = 2
+    EM_ADOCAO = 3
+    ADOTADO = 4
+
+    @property
+    def rotulo(self):
+        """Texto exibido no dashboard e nos relatórios"""
+        return ROTULOS[self]
+
+
+ROTULOS = {
+    Status.NAO_INICIADO: 'Não Iniciado',
+    Status.PLANEJADO: 'Planejado',
+    Status.DESENVOLVENDO: 'Desenvolvendo',
+    Status.EM_ADOCAO: 'Em Adoção',
+    Status.ADOTADO: 'Adotado',
+}
+
+# Categorias na ordem do enum: o código da categoria é o próprio Status
+CATEGORIAS = [ROTULOS[status] for status in Status]
+
+# Trechos procurados no texto sem acento e em maiúsculas (ordem importa:
+# 'ADOTADO' é testado antes de 'ADOCAO')
+_PADROES = [
+    ('ADOTAD', Status.ADOTADO),
+    ('PLANEJAD', Status.PLANEJADO),
+    ('DESENVOLVENDO', Status.DESENVOLVENDO),
+    ('ADOCAO', Status.EM_ADOCAO),
+    ('NAO INICIAD', Status.NAO_INICIADO),
+]
+
+
+def _sem_acento(texto):
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def normalizar_status(valor):
+    """
+    Identifica o status canônico de um valor da planilha
+
+    Args:
+        valor: Texto da célula (ex.: 'ADOTADA', 'em adoção', 'Nao iniciado')
+
+    Returns:
+        Status | None: Status reconhecido, ou None se o texto não for um status
+    """
+    if pd.isna(valor):
+        return None
+
+    texto = ' '.join(_sem_acento(str(valor)).upper().split())
+    for trecho, status in _PADROES:
+        if trecho in texto:
+            return status
+    return None
+
+
+def status_categorico(serie):
+    """
+    Converte uma coluna de status em categoria com rótulos canônicos
+
+    Só os valores distintos passam pela normalização. Textos que não são
+    status conhecidos são mantidos como categorias extras, depois das
+    canônicas, para não perder informação da planilha.
+
+    Args:
+        serie: Série com os status da planilha
+
+    Returns:
+        pd.Series: Série categórica cujos códigos 0..4 coincidem com Status
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype) and \
+            list(serie.cat.categories[:len(CATEGORIAS)]) == CATEGORIAS:
+        return serie
+
+    mapa = {}
+    extras = []
+    for valor in serie.dropna().unique():
+        status = normalizar_status(valor)
+        if status is None:
+            mapa[valor] = str(valor).strip()
+            extras.append(mapa[valor])
+        else:
+            mapa[valor] = status.rotulo
+
+    categorias = CATEGORIAS + sorted(set(extras) - set(CATEGORIAS))
+    return pd.Series(
+        pd.Categorical(serie.map(mapa), categories=categorias),
+        index=serie.index,
+        name=serie.name,
+    )
+
+
+def codigos(serie):
+    """Códigos inteiros dos status (-1 para vazio), prontos para comparação com Status"""
+    return status_categorico(serie).cat.codes.to_numpy()
+
+
+def matriz_status(df, colunas):
+    """
+    Matriz de códigos de status (linhas x colunas)
+
+    Textos fora dos status canônicos recebem -1, como as células vazias.
+
+    Args:
+        df: DataFrame com as colunas de status
+        colunas: Colunas a classificar
+
+    Returns:
+        np.ndarray: Matriz int8 com os códigos de Status (-1 = sem status)
+    """
+    matriz = np.column_stack([codigos(df[col]) for col in colunas]) if colunas else \
+        np.empty((len(df), 0))
+    return np.where(matriz >= len(Status), -1, matriz).astype(np.int8)
@@ -0,0 +1,33 @@
+"""
+Configuração dos testes do Framework TMMi
+Os módulos ficam na raiz do repositório e os testes usam a planilha padrão
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from loader import ARQUIVO_PADRAO, load_workbook_data  # noqa: E402
+
+
+PLANILHA = os.path.join(RAIZ, ARQUIVO_PADRAO)
+
+# Mesmo modo do dashboard (app.py)
+pd.set_option('mode.copy_on_write', True)
+
+
+@pytest.fixture(scope='session')
+def dados_planilha():
+    """Dados da planilha padrão, lidos uma vez (sem snapshot em disco)"""
+    return load_workbook_data(PLANILHA, usar_snapshot=False)
+
+
+@pytest.fixture
+def dados(dados_planilha):
+    """Cópia rasa dos dados, para os testes alterarem as abas livremente"""
+    return dict(dados_planilha)
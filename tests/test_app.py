@@ -0,0 +1,84 @@
+"""Testes do dashboard com o AppTest do Streamlit"""
+
+import importlib
+import os
+import shutil
+import sys
+import time
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from conftest import PLANILHA, RAIZ
+from relatorio import montar_relatorio
+
+
+PAINEIS_LATERAIS = {'📤 Exportar relatórios', '🆕 O que mudou'}
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Dashboard sobre uma cópia da planilha (cache e histórico no diretório temporário)"""
+    monkeypatch.chdir(tmp_path)
+    caminho = tmp_path / 'planilha.xlsx'
+    shutil.copy(PLANILHA, caminho)
+    monkeypatch.setenv('TMMI_PLANILHAS', str(caminho))
+    return AppTest.from_file(os.path.join(RAIZ, 'app.py'), default_timeout=60).run()
+
+
+@pytest.fixture
+def modulo_app(tmp_path, monkeypatch):
+    """Módulo app importado fora do servidor, com os caches de figuras vazios"""
+    monkeypatch.chdir(tmp_path)
+    caminho = tmp_path / 'planilha.xlsx'
+    shutil.copy(PLANILHA, caminho)
+    monkeypatch.setenv('TMMI_PLANILHAS', str(caminho))
+    monkeypatch.delitem(sys.modules, 'app', raising=False)
+    modulo = importlib.import_module('app')
+    for funcao in (modulo.obter_figura_niveis, modulo.obter_figura_status, modulo.obter_mapa_calor):
+        funcao.clear()
+    return modulo
+
+
+def test_figuras_em_cache_por_versao_e_tema(modulo_app, dados):
+    relatorio = montar_relatorio(dados)
+    colunas, codigos = modulo_app.obter_codigos_squads('v1', dados['squads'])
+    obter = {
+        'niveis': lambda versao, tema: modulo_app.obter_figura_niveis(versao, tema, relatorio),
+        'status': lambda versao, tema: modulo_app.obter_figura_status(versao, tema, relatorio),
+        'mapa': lambda versao, tema: modulo_app.obter_mapa_calor(versao, tema, dados['squads'], colunas, codigos),
+    }
+
+    for nome, figura in obter.items():
+        primeira = figura('v1', '')
+        assert figura('v1', '') is primeira, nome
+        assert figura('v2', '') is not primeira, nome
+
+        escura = figura('v1', 'dark')
+        assert escura is not primeira, nome
+        assert escura.layout.template.layout.paper_bgcolor != primeira.layout.template.layout.paper_bgcolor, nome
+
+
+def test_todas_as_paginas_com_paineis_laterais(app):
+    for pagina in app.sidebar.radio[0].options:
+        app.sidebar.radio[0].set_value(pagina).run()
+
+        assert not app.exception, pagina
+        assert not app.error, pagina
+        assert PAINEIS_LATERAIS <= {expander.label for expander in app.sidebar.expander}, pagina
+
+
+def test_exportacao_oferece_o_download(app):
+    app.sidebar.button(key='botao_pdf').click().run()
+
+    inicio = time.monotonic()
+    while not app.get('download_button'):
+        assert not app.exception
+        assert time.monotonic() - inicio < 60
+        time.sleep(0.2)
+        app.run()
+
+    assert not app.exception
+    assert not app.error
+    [download] = app.get('download_button')
+    assert download.proto.label.startswith('⬇️ Baixar PDF')
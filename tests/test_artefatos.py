@@ -0,0 +1,96 @@
+"""Testes do cache de artefatos exportados"""
+
+import dataclasses
+import os
+import pickle
+from datetime import date
+
+import pytest
+
+from artefatos import CacheArtefatos, chave_artefato, hash_relatorio
+from estilos import TEMA_PADRAO
+from exporter import TMMiExporter
+from relatorio import montar_relatorio
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheArtefatos(str(tmp_path / 'artefatos'), max_bytes=30)
+
+
+def _envelhecer(cache, chave, instante):
+    os.utime(os.path.join(cache.diretorio, chave), (instante, instante))
+
+
+def test_chave_artefato(dados):
+    relatorio = montar_relatorio(dados)
+    dia = date(2026, 3, 10)
+    chave = chave_artefato(relatorio, 'pdf', 4, dia=dia)
+
+    assert chave == chave_artefato(montar_relatorio(dados), 'pdf', 4, dia=dia, tema=TEMA_PADRAO)
+    assert chave != chave_artefato(relatorio, 'ppt', 4, dia=dia)
+    assert chave != chave_artefato(relatorio, 'pdf', 5, dia=dia)
+    assert chave != chave_artefato(relatorio, 'pdf', 4, 'Squad Ativos', dia=dia)
+    assert chave != chave_artefato(relatorio, 'pdf', 4, dia=date(2026, 3, 11))
+
+    outro = dataclasses.replace(relatorio, roadmap=relatorio.roadmap[1:])
+    assert hash_relatorio(outro) != hash_relatorio(relatorio)
+
+
+def test_guardar_e_obter(cache):
+    assert cache.obter('a') is None
+
+    cache.guardar('a', b'conteudo')
+
+    assert cache.obter('a') == b'conteudo'
+    estatisticas = cache.estatisticas()
+    assert (estatisticas['acertos'], estatisticas['falhas'], estatisticas['gravacoes']) == (1, 1, 1)
+    assert estatisticas['taxa_acerto'] == 0.5
+    assert (estatisticas['artefatos'], estatisticas['bytes']) == (1, len(b'conteudo'))
+
+
+def test_descarta_os_menos_usados(cache):
+    for instante, chave in enumerate('abc', start=1):
+        cache.guardar(chave, b'x' * 10)
+        _envelhecer(cache, chave, instante * 1000)
+
+    # O uso de 'a' o torna o mais recente: 'b' passa a ser o menos usado
+    cache.obter('a')
+    cache.guardar('d', b'x' * 10)
+
+    assert cache.obter('b') is None
+    assert all(cache.obter(chave) is not None for chave in 'acd')
+    assert cache.estatisticas()['descartes'] == 1
+    assert cache.estatisticas()['bytes'] <= cache.max_bytes
+
+
+def test_artefato_maior_que_o_limite_nao_e_guardado(cache):
+    cache.guardar('grande', b'x' * 31)
+    assert cache.obter('grande') is None
+    assert cache.estatisticas()['gravacoes'] == 0
+
+
+def test_limpar(cache):
+    cache.guardar('a', b'1')
+    cache.guardar('b', b'2')
+    cache.limpar()
+    assert cache.estatisticas()['artefatos'] == 0
+
+
+def test_copia_para_processos_usa_o_mesmo_diretorio(cache):
+    cache.guardar('a', b'1')
+    copia = pickle.loads(pickle.dumps(cache))
+    assert (copia.diretorio, copia.max_bytes) == (cache.diretorio, cache.max_bytes)
+    assert copia.obter('a') == b'1'
+    assert copia.estatisticas()['acertos'] == 1
+
+
+def test_cache_devolve_o_mesmo_artefato(dados, tmp_path):
+    cache = CacheArtefatos(str(tmp_path / 'artefatos'))
+    relatorio = montar_relatorio(dados)
+
+    primeiro = TMMiExporter({}, relatorio=relatorio, cache=cache).export_to_pdf_bytes()
+    segundo = TMMiExporter({}, relatorio=relatorio, cache=cache).export_to_pdf_bytes()
+
+    assert segundo == primeiro
+    assert cache.estatisticas()['acertos'] == 1
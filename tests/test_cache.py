@@ -0,0 +1,91 @@
+"""Testes do cache de versões da planilha"""
+
+import gc
+import os
+import shutil
+import warnings
+import weakref
+
+import openpyxl
+import pytest
+
+import cache
+from cache import CachePlanilha
+from relatorio import montar_relatorio
+
+from conftest import PLANILHA
+
+
+ABA_INSTITUCIONAL = 'TMMi - Visão Institucional'
+
+
+def _remover_area(caminho, linha=5):
+    """Apaga uma linha de área da Visão Institucional (linha do Excel)"""
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
+        livro = openpyxl.load_workbook(caminho)
+    livro[ABA_INSTITUCIONAL].delete_rows(linha)
+    livro.save(caminho)
+
+
+@pytest.fixture
+def planilha(tmp_path, monkeypatch):
+    """Cópia da planilha padrão em um diretório temporário (com o cache de snapshots)"""
+    monkeypatch.chdir(tmp_path)
+    caminho = tmp_path / 'planilha.xlsx'
+    shutil.copy(PLANILHA, caminho)
+    return str(caminho)
+
+
+def _nova_versao(caminho):
+    """Edita a planilha garantindo um mtime diferente da leitura anterior"""
+    _remover_area(caminho)
+    stat = os.stat(caminho)
+    os.utime(caminho, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_versao_alterada_monta_relatorio_incremental(planilha):
+    planilhas = CachePlanilha()
+    primeira = planilhas.carregar(planilha)
+
+    _nova_versao(planilha)
+    segunda = planilhas.carregar(planilha)
+
+    assert segunda is not primeira
+    assert len(segunda.relatorio.areas) == len(primeira.relatorio.areas) - 1
+    assert segunda.relatorio == montar_relatorio(segunda.dados)
+
+
+def test_falha_incremental_monta_relatorio_completo(planilha, monkeypatch, caplog):
+    def falhar(*args):
+        raise ValueError('falha no caminho incremental')
+
+    monkeypatch.setattr(cache, 'atualizar_relatorio', falhar)
+    planilhas = CachePlanilha()
+    planilhas.carregar(planilha)
+
+    _nova_versao(planilha)
+    versao = planilhas.carregar(planilha)
+
+    assert versao.relatorio == montar_relatorio(versao.dados)
+    [registro] = [registro for registro in caplog.records if registro.name == 'cache']
+    assert registro.exc_info[1].args == ('falha no caminho incremental',)
+
+
+def test_versao_descartada_nao_fica_presa_a_seguinte(planilha):
+    planilhas = CachePlanilha(max_versoes=1)
+    primeira = weakref.ref(planilhas.carregar(planilha))
+
+    _nova_versao(planilha)
+    segunda = planilhas.carregar(planilha)
+    gc.collect()
+
+    assert primeira() is None
+    assert planilhas.estatisticas()['versoes'] == 1
+    assert segunda.mudancas['institucional'].removidas
+
+
+def test_mesma_versao_e_reaproveitada(planilha):
+    planilhas = CachePlanilha()
+    assert planilhas.carregar(planilha) is planilhas.carregar(planilha)
+    assert planilhas.estatisticas()['hits'] == 1
@@ -0,0 +1,69 @@
+"""Testes da comparação de abas entre duas cargas"""
+
+import pandas as pd
+
+from diferencas import SEM_MUDANCAS, comparar_aba, comparar_dados
+from loader import COLUNA_UNIDADE
+
+
+def _aba(*linhas):
+    return pd.DataFrame(linhas, columns=['ID', 'Status', 'Obs'])
+
+
+def test_inclusao_remocao_e_alteracao():
+    antes = _aba(('A', 'Adotado', None), ('B', 'Planejado', 'x'), ('C', 'Adotado', None))
+    depois = _aba(('A', 'Adotado', None), ('B', 'Em Adoção', 'x'), ('D', 'Planejado', None))
+
+    mudancas = comparar_aba(antes, depois, 'ID')
+
+    assert mudancas.incluidas == ('D',)
+    assert mudancas.removidas == ('C',)
+    assert mudancas.alteradas == (('B', ('Status',)),)
+    assert mudancas.colunas() == {'Status'}
+    assert set(mudancas.chaves()) == {'B', 'C', 'D'}
+
+
+def test_vazios_sao_iguais():
+    antes = _aba(('A', 'Adotado', None), ('B', None, float('nan')))
+    depois = _aba(('A', 'Adotado', float('nan')), ('B', None, None))
+    assert comparar_aba(antes, depois, 'ID').vazia
+
+
+def test_espacos_na_chave_identificam_a_mesma_linha():
+    mudancas = comparar_aba(_aba((' B ', 'Adotado', None)), _aba(('B', 'Adotado', None)), 'ID')
+    assert (mudancas.incluidas, mudancas.removidas) == ((), ())
+    assert mudancas.alteradas == (('B', ('ID',)),)
+
+
+def test_chave_repetida_e_linha_sem_chave():
+    antes = _aba(('A', 'Adotado', None), (None, 'Planejado', None))
+    depois = _aba(('A', 'Adotado', None), (None, 'Adotado', None), ('A', 'Adotado', None))
+
+    mudancas = comparar_aba(antes, depois, 'ID')
+
+    assert mudancas.incluidas == ('A #2',)
+    assert mudancas.alteradas == (('#1', ('Status',)),)
+
+
+def test_chave_prefixada_pela_unidade():
+    antes = _aba(('A', 'Adotado', None), ('A', 'Adotado', None))
+    antes.insert(0, COLUNA_UNIDADE, ['Norte', 'Sul'])
+    depois = antes.copy()
+    depois.loc[1, 'Status'] = 'Planejado'
+
+    assert comparar_aba(antes, depois, 'ID').alteradas == (('Sul · A', ('Status',)),)
+
+
+def test_aba_sem_chave_nao_e_comparavel():
+    assert comparar_aba(_aba(('A', None, None)), pd.DataFrame({'Outra': [1]}), 'ID') is None
+
+
+def test_comparar_dados(dados):
+    assert all(mudancas is SEM_MUDANCAS for mudancas in comparar_dados(dados, dados).values())
+
+    roadmap = dados['roadmap'].copy()
+    roadmap.loc[roadmap.index[0], 'Status Geral'] = 'Adotado'
+    mudancas = comparar_dados(dados, {**dados, 'roadmap': roadmap})
+
+    assert mudancas['institucional'].vazia
+    assert mudancas['roadmap'].alteradas == ((roadmap['ID Melhoria'].iloc[0], ('Status Geral',)),)
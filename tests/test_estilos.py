@@ -0,0 +1,30 @@
+"""Testes dos estilos compartilhados dos relatórios"""
+
+import inspect
+
+import artefatos
+import estilos
+from exporter import TMMiExporter
+
+
+def test_tema_padrao_existe_e_e_o_padrao_das_chaves():
+    assert estilos.TEMA_PADRAO in estilos.TEMAS
+    padrao = inspect.signature(artefatos.chave_artefato).parameters['tema'].default
+    assert padrao == inspect.signature(TMMiExporter).parameters['tema'].default == estilos.TEMA_PADRAO
+
+
+def test_estilos_compartilhados_por_tema():
+    paragrafo = estilos.estilos_paragrafo(estilos.TEMA_PADRAO)
+    assert paragrafo is estilos.estilos_paragrafo(estilos.TEMA_PADRAO)
+    assert {'CustomTitle', 'CustomHeading', 'CustomBody'} <= set(paragrafo)
+
+    tabelas = estilos.estilos_tabela(estilos.TEMA_PADRAO)
+    assert tabelas is estilos.estilos_tabela(estilos.TEMA_PADRAO)
+    assert set(tabelas) == {'institucional', 'roadmap'}
+
+
+def test_exportadores_usam_os_mesmos_estilos(dados):
+    primeiro = TMMiExporter(dados)
+    segundo = TMMiExporter(dados)
+    assert primeiro.styles is segundo.styles
+    assert primeiro.estilos_tabela is segundo.estilos_tabela
@@ -0,0 +1,32 @@
+"""Testes da exportação em lote"""
+
+import os
+
+from conftest import PLANILHA
+from exportar_lote import exportar_lote, recortes
+from loader import SQUAD_COLS, consolidar
+from relatorio import montar_relatorio
+
+
+def test_recortes_do_lote(dados):
+    consolidado = consolidar({'Norte.xlsx': dados, 'Sul.xlsx': dados})
+
+    lista = recortes(consolidado, ('geral', 'squad', 'unidade', 'trimestre'))
+    por_dimensao = {}
+    for dimensao, valor, escopo, relatorio in lista:
+        por_dimensao.setdefault(dimensao, {})[valor] = relatorio
+
+    assert list(por_dimensao['squad']) == SQUAD_COLS
+    assert list(por_dimensao['unidade']) == ['Norte', 'Sul']
+    assert por_dimensao['unidade']['Sul'] == montar_relatorio(dados)
+    assert len(por_dimensao['geral']['organizacao'].areas) == 2 * len(por_dimensao['unidade']['Sul'].areas)
+    assert set(por_dimensao['trimestre']) == {item.trimestre for item in montar_relatorio(dados).roadmap} - {None}
+
+
+def test_exporta_um_arquivo_por_recorte_e_formato(tmp_path):
+    saida = tmp_path / 'relatorios'
+
+    resultado = exportar_lote(PLANILHA, str(saida), dimensoes=('geral',), processos=2, sufixo='teste')
+
+    assert resultado['erros'] == {}
+    assert sorted(os.listdir(saida)) == ['TMMi_geral_organizacao_teste.pdf', 'TMMi_geral_organizacao_teste.pptx']
@@ -0,0 +1,56 @@
+"""Testes dos exportadores PDF e PowerPoint"""
+
+import dataclasses
+import io
+
+import pandas as pd
+from pptx import Presentation
+
+from exporter import LINHAS_POR_SLIDE, TMMiExporter, export_framework
+from relatorio import montar_relatorio
+
+
+def _slides_de_status(titulos):
+    return sum(1 for titulo in titulos if titulo and titulo.startswith('Status por Nível TMMi'))
+
+
+def _titulos(conteudo):
+    slides = Presentation(io.BytesIO(conteudo)).slides
+    return [slide.shapes.title.text if slide.shapes.title is not None else None for slide in slides]
+
+
+def test_pdf_e_powerpoint(dados):
+    exporter = TMMiExporter(dados)
+
+    assert exporter.export_to_pdf_bytes().startswith(b'%PDF')
+
+    titulos = _titulos(exporter.export_to_powerpoint_bytes())
+    assert titulos[-1] == 'Próximos Passos'
+    assert _slides_de_status(titulos) == -(-len(exporter.relatorio.areas) // LINHAS_POR_SLIDE)
+
+
+def test_tabelas_longas_em_varios_slides(dados):
+    relatorio = montar_relatorio(dados)
+    ampliado = dataclasses.replace(relatorio, areas=relatorio.areas * 3)
+
+    titulos = _titulos(TMMiExporter({}, relatorio=ampliado).export_to_powerpoint_bytes())
+
+    assert _slides_de_status(titulos) == -(-len(ampliado.areas) // LINHAS_POR_SLIDE)
+    assert TMMiExporter({}, relatorio=ampliado).export_to_pdf_bytes().startswith(b'%PDF')
+
+
+def test_institucional_vazio(dados):
+    exporter = TMMiExporter({**dados, 'institucional': pd.DataFrame()})
+    assert exporter.export_to_pdf_bytes().startswith(b'%PDF')
+    assert _titulos(exporter.export_to_powerpoint_bytes())[-1] == 'Próximos Passos'
+
+
+def test_export_framework_em_paralelo(dados, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    resultado = export_framework(dados)
+
+    assert set(resultado['tempos']) == {'pdf', 'ppt', 'total'}
+    with open(resultado['pdf'], 'rb') as pdf, open(resultado['ppt'], 'rb') as ppt:
+        assert pdf.read().startswith(b'%PDF')
+        assert _titulos(ppt.read())[-1] == 'Próximos Passos'
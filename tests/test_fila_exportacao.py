@@ -0,0 +1,103 @@
+"""Testes da fila de exportações em segundo plano"""
+
+import io
+import time
+from datetime import date, timedelta
+
+import pytest
+from pptx import Presentation
+
+from artefatos import CacheArtefatos, chave_artefato
+from exporter import VERSAO_MODELO
+from fila_exportacao import CONCLUIDO, FilaExportacao
+from relatorio import montar_relatorio
+
+
+HOJE = date(2026, 3, 10)
+AMANHA = HOJE + timedelta(days=1)
+
+
+@pytest.fixture
+def relatorio(dados):
+    return montar_relatorio(dados)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheArtefatos(str(tmp_path / 'artefatos'))
+
+
+@pytest.fixture
+def fila(cache):
+    fila = FilaExportacao(max_workers=1, cache=cache)
+    yield fila
+    fila._pool.shutdown(cancel_futures=True)
+
+
+def _aguardar(fila, id_trabalho, limite=60):
+    inicio = time.monotonic()
+    while fila.estado(id_trabalho)['estado'] not in ('concluido', 'erro'):
+        assert time.monotonic() - inicio < limite
+        time.sleep(0.05)
+    return fila.estado(id_trabalho)
+
+
+def test_gera_em_processo_e_junta_pedidos_iguais(fila, relatorio, cache):
+    primeiro = fila.solicitar('v1', 'pdf', relatorio)
+    assert fila.solicitar('v1', 'pdf', relatorio) == primeiro
+
+    situacao = _aguardar(fila, primeiro)
+    assert situacao['estado'] == CONCLUIDO, situacao['erro']
+    assert fila.resultado(primeiro).startswith(b'%PDF')
+    assert fila.solicitar('v1', 'pdf', relatorio) == primeiro
+    assert cache.obter(chave_artefato(relatorio, 'pdf', VERSAO_MODELO)) == fila.resultado(primeiro)
+
+
+def test_gera_com_a_data_do_pedido(fila, relatorio, cache):
+    id_trabalho = fila.solicitar('v1', 'ppt', relatorio, dia=HOJE)
+
+    situacao = _aguardar(fila, id_trabalho)
+    assert situacao['estado'] == CONCLUIDO, situacao['erro']
+    conteudo = fila.resultado(id_trabalho)
+    capa = Presentation(io.BytesIO(conteudo)).slides[0]
+    assert any(forma.has_text_frame and forma.text_frame.text.endswith(HOJE.strftime('%B %Y')) for forma in capa.shapes)
+    assert cache.obter(chave_artefato(relatorio, 'ppt', VERSAO_MODELO, dia=HOJE)) == conteudo
+    assert cache.obter(chave_artefato(relatorio, 'ppt', VERSAO_MODELO)) is None
+    assert fila.solicitar('v1', 'ppt', relatorio, dia=HOJE) == id_trabalho
+
+
+def test_pedido_de_outro_dia_nao_reaproveita_o_trabalho(fila, relatorio, cache):
+    for dia in (HOJE, AMANHA):
+        cache.guardar(chave_artefato(relatorio, 'ppt', VERSAO_MODELO, dia=dia), dia.isoformat().encode())
+
+    hoje = fila.solicitar('v1', 'ppt', relatorio, dia=HOJE)
+    amanha = fila.solicitar('v1', 'ppt', relatorio, dia=AMANHA)
+
+    assert hoje != amanha
+    assert fila.solicitar('v1', 'ppt', relatorio, dia=HOJE) == hoje
+    assert fila.resultado(hoje) == HOJE.isoformat().encode()
+    assert fila.resultado(amanha) == AMANHA.isoformat().encode()
+
+
+def test_artefato_guardado_nao_gera_de_novo(fila, relatorio, cache):
+    cache.guardar(chave_artefato(relatorio, 'pdf', VERSAO_MODELO, 'Squad Ativos', HOJE), b'%PDF guardado')
+
+    id_trabalho = fila.solicitar('v1', 'pdf', relatorio, 'Squad Ativos', dia=HOJE)
+
+    situacao = fila.estado(id_trabalho)
+    assert situacao['estado'] == CONCLUIDO
+    assert situacao['segundos'] == 0.0
+    assert fila.resultado(id_trabalho) == b'%PDF guardado'
+
+
+def test_descarta_trabalhos_antigos(cache, relatorio):
+    fila = FilaExportacao(max_workers=1, max_trabalhos=2, cache=cache)
+    dias = [HOJE + timedelta(days=n) for n in range(4)]
+    for dia in dias:
+        cache.guardar(chave_artefato(relatorio, 'pdf', VERSAO_MODELO, dia=dia), b'%PDF')
+
+    ids = [fila.solicitar('v1', 'pdf', relatorio, dia=dia) for dia in dias]
+
+    assert [fila.estado(id_trabalho) is None for id_trabalho in ids] == [True, True, False, False]
+    assert fila.estatisticas()[CONCLUIDO] == 2
+    assert fila.solicitar('v1', 'pdf', relatorio, dia=dias[0]) not in ids
@@ -0,0 +1,163 @@
+"""Testes do histórico de versões em SQLite"""
+
+import os
+import shutil
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from historico import Historico
+from loader import consolidar
+from relatorio import montar_relatorio
+
+from conftest import PLANILHA
+
+
+@pytest.fixture
+def historico(tmp_path):
+    return Historico(str(tmp_path / 'historico.sqlite'))
+
+
+def _registrar_em(historico, caminho, digest, dados, quando):
+    """Registra uma versão com a data de modificação da planilha em 'quando'"""
+    instante = datetime.fromisoformat(quando).timestamp()
+    os.utime(caminho, (instante, instante))
+    return historico.registrar(caminho, digest, dados)
+
+
+@pytest.fixture
+def duas_versoes(historico, dados, tmp_path):
+    """
+    Versões de janeiro e fevereiro da planilha
+
+    De uma para a outra: a primeira área (sem status em janeiro) é removida,
+    uma área é incluída, o status da última área muda e a primeira entrega
+    (sem status em janeiro) sai do roadmap.
+    """
+    caminho = str(tmp_path / 'planilha.xlsx')
+    shutil.copy(PLANILHA, caminho)
+
+    inst = dados['institucional'].copy()
+    inst.loc[inst.index[0], 'Status Institucional'] = None
+    roadmap = dados['roadmap'].copy()
+    roadmap.loc[roadmap.index[0], 'Status Geral'] = None
+    janeiro = {**dados, 'institucional': inst, 'roadmap': roadmap}
+
+    nova = inst.iloc[[1]].copy()
+    nova['Área de Processo'] = 'Área nova'
+    inst_fev = pd.concat([inst.iloc[1:], nova], ignore_index=True)
+    inst_fev.loc[inst_fev.index[-2], 'Status Institucional'] = 'Adotado'
+    fevereiro = {**dados, 'institucional': inst_fev, 'roadmap': roadmap.iloc[1:].reset_index(drop=True)}
+
+    id_a = _registrar_em(historico, caminho, 'janeiro', janeiro, '2026-01-15T10:00:00')
+    id_b = _registrar_em(historico, caminho, 'fevereiro', fevereiro, '2026-02-15T10:00:00')
+    return caminho, id_a, id_b, inst, inst_fev
+
+
+def _contar(historico, tabela, versao_id):
+    with sqlite3.connect(historico.caminho) as con:
+        return con.execute(f'SELECT COUNT(*) FROM {tabela} WHERE versao_id = ?', (versao_id,)).fetchone()[0]
+
+
+def test_duas_unidades_guardam_as_linhas_de_cada_unidade(historico, dados, tmp_path):
+    for unidade in ('Norte', 'Sul'):
+        shutil.copy(PLANILHA, tmp_path / f'{unidade}.xlsx')
+    consolidado = consolidar({tmp_path / 'Norte.xlsx': dados, tmp_path / 'Sul.xlsx': dados})
+    relatorio = montar_relatorio(consolidado)
+
+    versao_id = historico.registrar(str(tmp_path / '*.xlsx'), 'consolidado', consolidado, relatorio)
+
+    unico = montar_relatorio(dados)
+    entregas = sum(item.id is not None for item in unico.roadmap)
+    assert _contar(historico, 'areas', versao_id) == 2 * len(unico.areas)
+    assert _contar(historico, 'roadmap', versao_id) == 2 * entregas
+    assert {area.unidade for area in relatorio.areas} == {'Norte', 'Sul'}
+    assert {area.rotulo for area in relatorio.areas if area.unidade == 'Sul'} == {
+        f'Sul · {area.nome}' for area in unico.areas
+    }
+
+
+def test_banco_sem_unidade_e_migrado(tmp_path, dados):
+    caminho = str(tmp_path / 'historico.sqlite')
+    with sqlite3.connect(caminho) as con:
+        con.executescript("""
+            CREATE TABLE versoes (
+                id INTEGER PRIMARY KEY, planilha TEXT NOT NULL, digest TEXT NOT NULL,
+                data_referencia TEXT NOT NULL, registrado_em TEXT NOT NULL, UNIQUE (planilha, digest)
+            );
+            CREATE TABLE areas (versao_id INTEGER NOT NULL, area TEXT NOT NULL, nivel TEXT, status TEXT,
+                                PRIMARY KEY (versao_id, area));
+            CREATE TABLE squads (versao_id INTEGER NOT NULL, id_melhoria TEXT NOT NULL, squad TEXT NOT NULL,
+                                 status TEXT, PRIMARY KEY (versao_id, id_melhoria, squad));
+            CREATE TABLE roadmap (versao_id INTEGER NOT NULL, id_melhoria TEXT NOT NULL, trimestre TEXT,
+                                  entrega TEXT, status TEXT, PRIMARY KEY (versao_id, id_melhoria));
+            INSERT INTO versoes VALUES (1, 'planilha.xlsx', 'antigo', '2026-01-01T00:00:00', '2026-01-01T00:00:00');
+            INSERT INTO areas VALUES (1, 'Test Policy and Strategy', 'Nível 2', 'Adotado');
+        """)
+    con.close()
+
+    historico = Historico(caminho)
+    versao_id = historico.registrar(PLANILHA, 'novo', dados)
+
+    with sqlite3.connect(caminho) as con:
+        antiga = con.execute('SELECT unidade, area, status FROM areas WHERE versao_id = 1').fetchall()
+    con.close()
+    assert antiga == [('', 'Test Policy and Strategy', 'Adotado')]
+    assert _contar(historico, 'areas', versao_id) == len(montar_relatorio(dados).areas)
+
+
+def test_comparar_inclusao_remocao_e_alteracao(historico, duas_versoes, dados):
+    _, id_a, id_b, inst, inst_fev = duas_versoes
+    diferencas = historico.comparar(id_a, id_b)
+
+    areas = {linha.area: (linha.antes, linha.depois) for linha in diferencas['areas'].itertuples()}
+    removida = inst['Área de Processo'].iloc[0]
+    alterada = inst_fev['Área de Processo'].iloc[-2]
+    antes_alterada = str(inst.loc[inst['Área de Processo'] == alterada, 'Status Institucional'].iloc[0])
+
+    assert areas == {
+        removida: (None, None),
+        'Área nova': (None, str(inst_fev['Status Institucional'].iloc[-1])),
+        alterada: (antes_alterada, 'Adotado'),
+    }
+
+    roadmap = diferencas['roadmap']
+    assert roadmap['id_melhoria'].tolist() == [dados['roadmap']['ID Melhoria'].iloc[0]]
+    assert diferencas['squads'].empty
+
+    metricas = diferencas['metricas'].set_index(['escopo', 'metrica'])
+    assert metricas.loc[('Geral', 'total'), 'variacao'] == 0
+    assert metricas.loc[('Geral', 'adotado'), 'depois'] > metricas.loc[('Geral', 'adotado'), 'antes']
+
+
+def test_mesma_versao_nao_tem_diferencas(historico, duas_versoes):
+    _, id_a, _, _, _ = duas_versoes
+    diferencas = historico.comparar(id_a, id_a)
+    assert all(diferencas[tabela].empty for tabela in ('areas', 'squads', 'roadmap'))
+    assert (diferencas['metricas']['variacao'] == 0).all()
+
+
+def test_evolucao_e_versao_em(historico, duas_versoes):
+    caminho, id_a, id_b, _, _ = duas_versoes
+    planilha = os.path.basename(caminho)
+
+    serie = historico.evolucao('adotado', planilha=planilha)
+    assert serie['versao_id'].tolist() == [id_a, id_b]
+    assert serie['data_referencia'].str[:10].tolist() == ['2026-01-15', '2026-02-15']
+    assert historico.evolucao('total', escopo='Nível 2')['versao_id'].tolist() == [id_a, id_b]
+
+    assert historico.versao_em('2026-01-01') is None
+    assert historico.versao_em('2026-01-15', planilha) == id_a
+    assert historico.versao_em('2026-02-01') == id_a
+    assert historico.versao_em(datetime(2026, 3, 1)) == id_b
+    assert historico.versao_em('2026-03-01', 'outra.xlsx') is None
+
+
+def test_registrar_a_mesma_versao_duas_vezes(historico, duas_versoes, dados):
+    caminho, id_a, id_b, _, _ = duas_versoes
+
+    assert historico.registrar(caminho, 'janeiro', dados) is None
+    assert historico.versoes()['id'].tolist() == [id_a, id_b]
+    assert _contar(historico, 'areas', id_a) == len(dados['institucional'])
@@ -0,0 +1,64 @@
+"""Testes do índice de facetas do roadmap"""
+
+import pytest
+
+from indice import IndiceRoadmap, niveis_do_item, squads_do_item
+from loader import SQUAD_COLS
+from relatorio import montar_relatorio
+
+
+CARTOES = ['Ativos', 'Demonstrações', 'Operações', 'Plataforma']
+DUPLICATAS = ['Interop', 'Negotiation', 'Consent']
+
+
+# Valores da coluna 'Squad' do roadmap da planilha padrão
+@pytest.mark.parametrize('texto, esperados', [
+    ('Todas (TAG)', SQUAD_COLS),
+    ('Produtos: Cartões + Duplicatas', SQUAD_COLS),
+    ('Cartões + Duplicatas', SQUAD_COLS),
+    ('Cartões + Duplicatas (onde aplicável)', SQUAD_COLS),
+    ('Duplicatas (Interop + Negotiation)', ['Interop', 'Negotiation']),
+    ('Todas exceto: Plataforma (Cartões) e Consent+Interop (Duplicatas)',
+     ['Ativos', 'Demonstrações', 'Operações', 'Negotiation']),
+    ('Plataforma (Cartões) + Consent e Interop (Duplicatas)', ['Plataforma', 'Interop', 'Consent']),
+    ('Cartões (todas as squads) exceto Plataforma', ['Ativos', 'Demonstrações', 'Operações']),
+    ('Piloto (Cartões: Operações)', ['Operações']),
+    ('Piloto (Duplicatas: Consent)', ['Consent']),
+])
+def test_squads_do_item(texto, esperados):
+    assert squads_do_item(texto) == esperados
+
+
+def test_linha_de_produto_isolada():
+    assert squads_do_item('Cartões') == CARTOES
+    assert squads_do_item('Duplicatas (todas)') == DUPLICATAS
+
+
+def test_texto_sem_squad_vira_o_proprio_valor():
+    assert squads_do_item('Governança') == ['Governança']
+    assert squads_do_item(None) == []
+
+
+def test_niveis_do_item():
+    assert niveis_do_item('N3 – Test Organization; N2 – Test Planning') == ['Nível 2', 'Nível 3']
+    assert niveis_do_item(None) == []
+
+
+def test_faceta_squad_so_tem_squads(dados):
+    indice = IndiceRoadmap(montar_relatorio(dados).roadmap)
+    assert indice.valores('squad') == sorted(SQUAD_COLS)
+
+
+def test_filtrar_combina_facetas(dados):
+    roadmap = montar_relatorio(dados).roadmap
+    indice = IndiceRoadmap(roadmap)
+
+    posicoes = indice.filtrar(squad=['Plataforma'], trimestre=['TRI 1'])
+    esperadas = [
+        posicao for posicao, item in enumerate(roadmap)
+        if item.id is not None and item.trimestre == 'TRI 1' and 'Plataforma' in squads_do_item(item.squad)
+    ]
+    assert list(posicoes) == esperadas
+
+    assert len(indice.filtrar()) == sum(item.id is not None for item in roadmap)
+    assert len(indice.filtrar(squad=['Inexistente'])) == 0
@@ -0,0 +1,52 @@
+"""Testes do carregamento e da consolidação das planilhas"""
+
+import shutil
+
+import pandas as pd
+import pytest
+
+from loader import COLUNA_UNIDADE, listar_planilhas, load_workbooks_data, nome_unidade
+
+from conftest import PLANILHA
+
+
+@pytest.fixture
+def unidades(tmp_path, monkeypatch):
+    """Diretório com a planilha padrão copiada para duas unidades"""
+    monkeypatch.chdir(tmp_path)
+    diretorio = tmp_path / 'unidades'
+    diretorio.mkdir()
+    for unidade in ('Sul', 'Norte'):
+        shutil.copy(PLANILHA, diretorio / f'{unidade}.xlsx')
+    (diretorio / '~$Norte.xlsx').write_bytes(b'')
+    return diretorio
+
+
+def test_listar_planilhas_ignora_temporarios(unidades):
+    assert [nome_unidade(caminho) for caminho in listar_planilhas(str(unidades))] == ['Norte', 'Sul']
+
+
+def test_consolidacao_em_processos(unidades, dados_planilha):
+    # Duas planilhas sem snapshot: lidas em paralelo pelos processos de trabalho
+    consolidado = load_workbooks_data(str(unidades), max_workers=2)
+
+    for chave in ('institucional', 'squads', 'roadmap'):
+        df = consolidado[chave]
+        assert df.columns[0] == COLUNA_UNIDADE
+        assert list(df[COLUNA_UNIDADE].cat.categories) == ['Norte', 'Sul']
+        assert len(df) == 2 * len(dados_planilha[chave])
+
+        sul = df[df[COLUNA_UNIDADE] == 'Sul'].drop(columns=COLUNA_UNIDADE).reset_index(drop=True)
+        pd.testing.assert_frame_equal(sul, dados_planilha[chave], check_dtype=False, check_categorical=False)
+
+
+def test_consolidacao_reaproveita_snapshots(unidades):
+    primeira = load_workbooks_data(str(unidades))
+    segunda = load_workbooks_data(str(unidades / '*.xlsx'))
+    for chave, df in primeira.items():
+        pd.testing.assert_frame_equal(segunda[chave], df)
+
+
+def test_origem_sem_planilhas(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_workbooks_data(str(tmp_path))
@@ -0,0 +1,39 @@
+"""Testes do motor de maturidade"""
+
+import pandas as pd
+import pytest
+
+from maturidade import NIVEIS, calcular_maturidade
+
+
+def test_contagens_scores_e_niveis_sem_areas():
+    df = pd.DataFrame({
+        'Nível TMMi': ['Nível 2', 'Nível 2', 'Nível 2', 'Nível 3', None],
+        'Status Institucional': ['Adotado', 'Em Adoção', None, 'Desenvolvendo', 'Adotado'],
+    })
+
+    maturidade = calcular_maturidade(df)
+
+    assert list(maturidade.matriz.index) == NIVEIS
+    nivel2 = maturidade.nivel('Nível 2')
+    assert (nivel2['total'], nivel2['adotado'], nivel2['em_adocao']) == (3, 1, 1)
+    assert nivel2['percentual'] == pytest.approx(100 / 3)
+    assert nivel2['score_3'] == pytest.approx((3 + 2) / 3)
+    assert maturidade.nivel('Nível 4')['total'] == 0
+    assert maturidade.nivel('Nível 9') == dict.fromkeys(maturidade.matriz.columns, 0)
+
+    # Linha sem nível entra no total geral, mas não nas contagens
+    geral = maturidade.geral
+    assert (geral['total'], geral['adotado'], geral['desenvolvendo']) == (5, 1, 1)
+    assert geral['score_3'] == pytest.approx((3 + 2 + 1.5) / 5)
+    assert geral['score_5'] == pytest.approx(geral['score_3'] / 3 * 5)
+
+
+def test_planilha_padrao(dados):
+    df = dados['institucional']
+    maturidade = calcular_maturidade(df)
+
+    assert maturidade.geral['total'] == len(df)
+    assert maturidade.matriz['total'].sum() == df['Nível TMMi'].notna().sum()
+    for nivel in NIVEIS:
+        assert maturidade.nivel(nivel)['total'] == (df['Nível TMMi'] == nivel).sum()
@@ -0,0 +1,152 @@
+"""Testes do modelo do relatório e da montagem incremental"""
+
+import pandas as pd
+import pytest
+
+from diferencas import comparar_dados
+from loader import consolidar
+from relatorio import atualizar_relatorio, montar_relatorio, relatorio_do_squad, relatorio_do_trimestre
+
+
+def _incremental(antes, depois):
+    """Relatório de depois montado a partir do relatório de antes"""
+    return atualizar_relatorio(montar_relatorio(antes), depois, comparar_dados(antes, depois))
+
+
+def _com_institucional(dados, df):
+    return {**dados, 'institucional': df.reset_index(drop=True)}
+
+
+def test_sem_mudancas_reaproveita_o_anterior(dados):
+    anterior = montar_relatorio(dados)
+    assert atualizar_relatorio(anterior, dados, comparar_dados(dados, dados)) == anterior
+
+
+def test_area_removida(dados):
+    df = dados['institucional']
+    depois = _com_institucional(dados, df.drop(index=df.index[3]))
+    assert _incremental(dados, depois) == montar_relatorio(depois)
+
+
+def test_area_incluida(dados):
+    df = dados['institucional']
+    nova = df.iloc[[0]].copy()
+    nova['Área de Processo'] = 'Área nova'
+    depois = _com_institucional(dados, pd.concat([df, nova]))
+    assert _incremental(dados, depois) == montar_relatorio(depois)
+
+
+def test_area_duplicada(dados):
+    df = dados['institucional']
+    depois = _com_institucional(dados, pd.concat([df, df.iloc[[5]]]))
+    assert _incremental(dados, depois) == montar_relatorio(depois)
+    assert montar_relatorio(depois).score.total == len(df) + 1
+
+
+def test_area_removida_e_depois_restaurada(dados):
+    df = dados['institucional']
+    sem_area = _com_institucional(dados, df.drop(index=df.index[0]))
+    assert _incremental(sem_area, dados) == montar_relatorio(dados)
+
+
+def test_status_alterado(dados):
+    df = dados['institucional'].copy()
+    df.loc[df.index[0], 'Status Institucional'] = 'Adotado'
+    df.loc[df.index[-1], 'Status Institucional'] = 'Não Iniciado'
+    depois = _com_institucional(dados, df)
+    assert _incremental(dados, depois) == montar_relatorio(depois)
+
+
+def test_area_sem_nome(dados):
+    df = dados['institucional'].copy()
+    df.loc[df.index[2], 'Área de Processo'] = None
+    depois = _com_institucional(dados, df)
+    assert _incremental(dados, depois) == montar_relatorio(depois)
+    assert _incremental(depois, dados) == montar_relatorio(dados)
+
+
+def test_roadmap_e_squads_alterados(dados):
+    roadmap = dados['roadmap'].copy()
+    roadmap.loc[roadmap.index[0], 'Entrega'] = 'Entrega revisada'
+    squads = dados['squads'].drop(index=dados['squads'].index[0]).reset_index(drop=True)
+    depois = {**dados, 'roadmap': roadmap, 'squads': squads}
+    assert _incremental(dados, depois) == montar_relatorio(depois)
+
+
+def test_roadmap_reaproveita_entregas_nao_alteradas(dados):
+    roadmap = dados['roadmap'].copy()
+    roadmap.loc[roadmap.index[1], 'Entrega'] = 'Entrega revisada'
+    depois = {**dados, 'roadmap': roadmap}
+    anterior = montar_relatorio(dados)
+
+    atualizado = atualizar_relatorio(anterior, depois, comparar_dados(dados, depois))
+
+    assert atualizado == montar_relatorio(depois)
+    assert atualizado.roadmap[1].entrega == 'Entrega revisada'
+    assert all(novo is antigo for novo, antigo in zip(atualizado.roadmap, anterior.roadmap) if novo == antigo)
+    assert sum(novo is antigo for novo, antigo in zip(atualizado.roadmap, anterior.roadmap)) == len(roadmap) - 1
+
+
+@pytest.mark.parametrize('mudar', [
+    lambda df: df.drop(index=df.index[2]),
+    lambda df: pd.concat([df.iloc[:3], df.iloc[[0]].assign(**{'ID Melhoria': 'NOVA'}), df.iloc[3:]]),
+    lambda df: pd.concat([df, df.iloc[[4]]]),
+    lambda df: df.assign(**{'ID Melhoria': df['ID Melhoria'].where(df.index != df.index[3])}),
+    lambda df: df.iloc[:0],
+], ids=['removida', 'incluida', 'duplicada', 'sem_id', 'vazia'])
+def test_roadmap_incremental(dados, mudar):
+    depois = {**dados, 'roadmap': mudar(dados['roadmap']).reset_index(drop=True)}
+    assert _incremental(dados, depois) == montar_relatorio(depois)
+    assert _incremental(depois, dados) == montar_relatorio(dados)
+
+
+def test_roadmap_incremental_consolidado(dados):
+    antes = consolidar({'Norte.xlsx': dados, 'Sul.xlsx': dados})
+    roadmap = antes['roadmap'].copy()
+    roadmap.loc[roadmap.index[-1], 'Entrega'] = 'Entrega revisada'
+    depois = {**antes, 'roadmap': roadmap}
+
+    anterior = montar_relatorio(antes)
+
+    atualizado = atualizar_relatorio(anterior, depois, comparar_dados(antes, depois))
+
+    assert atualizado == montar_relatorio(depois)
+    assert atualizado.roadmap[-1].unidade == 'Sul'
+    assert [novo is antigo for novo, antigo in zip(atualizado.roadmap, anterior.roadmap)].count(False) == 1
+
+
+# Entregas do roadmap da planilha padrão que atendem a cada squad
+# (17 para todos os squads, o restante por linha de produto ou piloto)
+@pytest.mark.parametrize('squad, entregas', [
+    ('Ativos', 19),
+    ('Demonstrações', 19),
+    ('Operações', 20),
+    ('Plataforma', 18),
+    ('Interop', 20),
+    ('Negotiation', 20),
+    ('Consent', 19),
+])
+def test_relatorio_do_squad(dados, squad, entregas):
+    relatorio = montar_relatorio(dados)
+    recorte = relatorio_do_squad(relatorio, squad)
+
+    assert len(recorte.roadmap) == entregas
+    assert [item.nome for item in recorte.squads] == [squad]
+    assert recorte.areas == relatorio.areas
+
+
+def test_relatorio_do_trimestre(dados):
+    relatorio = montar_relatorio(dados)
+    recorte = relatorio_do_trimestre(relatorio, 'TRI 1')
+    assert len(recorte.roadmap) == (dados['roadmap']['Trimestre'] == 'TRI 1').sum()
+
+
+def test_institucional_vazio_tem_niveis_zerados(dados):
+    vazio = {**dados, 'institucional': pd.DataFrame()}
+    relatorio = montar_relatorio(vazio)
+
+    assert relatorio.score.total == 0
+    assert relatorio.nivel('Nível 2').percentual == 0
+    assert relatorio.nivel('Nível 3').total == 0
+    assert _incremental(vazio, dados) == montar_relatorio(dados)
+    assert _incremental(dados, vazio) == relatorio
@@ -0,0 +1,37 @@
+"""Testes dos templates HTML do dashboard"""
+
+from maturidade import NIVEIS
+from relatorio import Area, ItemRoadmap, montar_relatorio
+from render import blocos_niveis, blocos_roadmap, cards_roadmap, html_area, html_item_roadmap
+
+
+def test_html_area_escapa_e_marca_status():
+    html = html_area(Area('Nível 2', 'Test <Planning>', 'Adotado', None))
+    assert 'Test &lt;Planning&gt;' in html
+    assert 'status-adotado' in html and '✅' in html and 'N/A' in html
+
+
+def test_html_area_com_unidade():
+    assert 'Sul · Test Planning' in html_area(Area('Nível 2', 'Test Planning', 'Planejado', None, 'Sul'))
+
+
+def test_html_item_roadmap():
+    item = ItemRoadmap('M-1', 'TRI 1', 'Fase', 'Todas', 'Entrega', 'N2', None, None, 'Norte')
+    html = html_item_roadmap(item)
+    assert '<strong>Norte · M-1</strong>: Entrega' in html
+    assert 'Planejado' in html and 'status-nao-iniciado' in html
+
+
+def test_blocos_da_planilha(dados):
+    relatorio = montar_relatorio(dados)
+
+    blocos = blocos_niveis(relatorio, NIVEIS)
+    assert list(blocos) == [nivel.nome for nivel in relatorio.niveis if nivel.total]
+    for nome, bloco in blocos.items():
+        assert bloco.count('class="area-box"') == len(relatorio.areas_do_nivel(nome))
+
+    cards = cards_roadmap(relatorio)
+    assert len(cards) == len(relatorio.roadmap)
+    trimestres = blocos_roadmap(relatorio, cards)
+    assert sum(bloco.count('class="area-box"') for bloco in trimestres.values()) == \
+        sum(item.id is not None for item in relatorio.roadmap)
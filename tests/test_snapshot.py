@@ -0,0 +1,53 @@
+"""Testes do snapshot colunar da planilha"""
+
+import os
+
+import pandas as pd
+
+import snapshot
+
+
+def test_salvar_e_ler(tmp_path, dados):
+    planilha = str(tmp_path / 'planilha.xlsx')
+
+    assert snapshot.ler_snapshot(planilha, 'abc', dados) is None
+    snapshot.salvar_snapshot(planilha, 'abc', dados)
+
+    lidos = snapshot.ler_snapshot(planilha, 'abc', ['institucional', 'roadmap'])
+    assert set(lidos) == {'institucional', 'roadmap'}
+    for chave, df in lidos.items():
+        pd.testing.assert_frame_equal(df, dados[chave])
+
+
+def test_snapshot_corrompido_volta_para_a_planilha(tmp_path, dados):
+    planilha = str(tmp_path / 'planilha.xlsx')
+    snapshot.salvar_snapshot(planilha, 'abc', dados)
+
+    pasta = os.path.join(snapshot._diretorio_planilha(planilha), f'abc.v{snapshot.VERSAO_FORMATO}')
+    with open(os.path.join(pasta, 'roadmap.arrow'), 'wb') as f:
+        f.write(b'corrompido')
+
+    assert snapshot.ler_snapshot(planilha, 'abc', ['roadmap']) is None
+
+
+def test_mantem_so_os_snapshots_recentes(tmp_path, dados):
+    planilha = str(tmp_path / 'planilha.xlsx')
+    parcial = {'mapa': dados['mapa']}
+    for indice in range(snapshot.MAX_SNAPSHOTS + 2):
+        snapshot.salvar_snapshot(planilha, f'v{indice}', parcial)
+        pasta = os.path.join(snapshot._diretorio_planilha(planilha), f'v{indice}.v{snapshot.VERSAO_FORMATO}')
+        os.utime(pasta, (indice, indice))
+
+    restantes = sorted(os.listdir(snapshot._diretorio_planilha(planilha)))
+    assert len(restantes) == snapshot.MAX_SNAPSHOTS
+    assert snapshot.ler_snapshot(planilha, 'v0', ['mapa']) is None
+
+
+def test_hash_arquivo(tmp_path):
+    arquivo = tmp_path / 'a.bin'
+    arquivo.write_bytes(b'x' * 10)
+    original = snapshot.hash_arquivo(arquivo)
+    assert snapshot.hash_arquivo(arquivo, tamanho_bloco=3) == original
+
+    arquivo.write_bytes(b'x' * 9 + b'y')
+    assert snapshot.hash_arquivo(arquivo) != original
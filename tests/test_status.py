@@ -0,0 +1,52 @@
+"""Testes da normalização dos status"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from status import CATEGORIAS, Status, codigos, matriz_status, normalizar_status, status_categorico
+
+
+@pytest.mark.parametrize('valor, esperado', [
+    ('Adotado', Status.ADOTADO),
+    ('ADOTADA', Status.ADOTADO),
+    ('em adoção', Status.EM_ADOCAO),
+    ('Em Adocao', Status.EM_ADOCAO),
+    ('Nao  iniciado', Status.NAO_INICIADO),
+    ('Não Iniciada', Status.NAO_INICIADO),
+    (' planejado ', Status.PLANEJADO),
+    ('Desenvolvendo', Status.DESENVOLVENDO),
+    ('N/A', None),
+    (None, None),
+    (float('nan'), None),
+])
+def test_normalizar_status(valor, esperado):
+    assert normalizar_status(valor) is esperado
+
+
+def test_rotulo():
+    assert Status.EM_ADOCAO.rotulo == 'Em Adoção'
+    assert CATEGORIAS == [status.rotulo for status in sorted(Status)]
+
+
+def test_status_categorico_mantem_extras_depois_dos_canonicos():
+    serie = pd.Series(['ADOTADA', 'em adoção', None, 'Pausado', 'Adotado'], name='Status')
+
+    categorica = status_categorico(serie)
+
+    assert list(categorica.cat.categories) == CATEGORIAS + ['Pausado']
+    assert categorica.tolist()[:2] == ['Adotado', 'Em Adoção']
+    assert categorica.cat.codes.tolist() == [Status.ADOTADO, Status.EM_ADOCAO, -1, len(CATEGORIAS), Status.ADOTADO]
+    assert categorica.name == 'Status'
+    assert status_categorico(categorica) is categorica
+
+
+def test_codigos_e_matriz_status():
+    df = pd.DataFrame({'a': ['Adotado', None], 'b': ['Pausado', 'Planejado']})
+
+    assert codigos(df['a']).tolist() == [Status.ADOTADO, -1]
+
+    matriz = matriz_status(df, ['a', 'b'])
+    assert matriz.dtype == np.int8
+    assert matriz.tolist() == [[Status.ADOTADO, -1], [-1, Status.PLANEJADO]]
+    assert matriz_status(df, []).shape == (2, 0)